@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Disclosure Amount Parser
+Turns reported STOCK Act amounts into low/mid/high dollar bounds. Handles
+formatting variants ("$1,001 - $15,000", en-dashes, "Over $50,000,000",
+"$50,000,001+", "$15K-$50K") and plain numeric amounts such as CapitolTrades
+reports. Parsing runs with pandas string ops over the distinct values only,
+and each distinct value is parsed once per process.
+"""
+
+import threading
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Named groups of one normalized amount: lowercase, no "$", "," or spaces, dashes unified.
+# A leading label such as "Spouse/DC" is skipped.
+AMOUNT_PATTERN = (
+    r"^[a-z/]*?(?P<over>over|above|morethan|>)?"
+    r"(?P<low>\d+(?:\.\d+)?)(?P<low_unit>[km])?"
+    r"(?:-(?P<high>\d+(?:\.\d+)?)(?P<high_unit>[km])?)?"
+    r"(?P<plus>\+)?$"
+)
+
+UNIT_MULTIPLIERS = {"k": 1e3, "m": 1e6}
+
+# Parsed (low, high) per distinct raw value; bounded so numeric amounts cannot grow it forever
+MAX_CACHED_AMOUNTS = 100000
+_parsed_amounts = {}
+_parsed_amounts_lock = threading.Lock()
+
+
+def _scaled(values: pd.Series, units: pd.Series) -> pd.Series:
+    return pd.to_numeric(values, errors="coerce") * units.map(UNIT_MULTIPLIERS).fillna(1.0)
+
+
+def _parse_unique(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized parse of distinct raw amounts into (low, high) arrays"""
+    text = (values.astype(str).str.strip().str.lower()
+            .str.replace(r"[‐-―−]|\bto\b", "-", regex=True)
+            .str.replace(r"[$,\s]", "", regex=True))
+    parts = text.str.extract(AMOUNT_PATTERN)
+
+    low = _scaled(parts["low"], parts["low_unit"])
+    high = _scaled(parts["high"], parts["high_unit"])
+    over = parts["over"].notna()
+    open_ended = (over | parts["plus"].notna()) & high.isna()
+
+    # "Over X" starts at X + 1; an open-ended bracket is assumed to reach twice its
+    # threshold, which keeps "$50,000,001+" at the methodology's $75M midpoint
+    low = low.where(~over, low + 1)
+    high = high.where(~open_ended, 2 * (low - 1))
+    # A single number (e.g. a CapitolTrades amount) is its own range
+    high = high.fillna(low)
+    return low.to_numpy(dtype="float64"), high.to_numpy(dtype="float64")
+
+
+def parse_amount_ranges(amounts: pd.Series) -> pd.DataFrame:
+    """
+    Return dollar_low, dollar_amount (midpoint) and dollar_high columns aligned
+    with amounts. Unparseable values give NaN in all three.
+    """
+    codes, uniques = pd.factorize(amounts, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype=object)
+
+    with _parsed_amounts_lock:
+        cached = [_parsed_amounts.get(value) for value in uniques]
+    missing = [position for position, bounds in enumerate(cached) if bounds is None]
+    if missing:
+        low, high = _parse_unique(uniques.iloc[missing])
+        with _parsed_amounts_lock:
+            if len(_parsed_amounts) + len(missing) > MAX_CACHED_AMOUNTS:
+                _parsed_amounts.clear()
+            for position, bounds in zip(missing, zip(low, high)):
+                _parsed_amounts[uniques.iloc[position]] = bounds
+                cached[position] = bounds
+
+    # One extra slot for missing values (code -1)
+    bounds = np.array(cached + [(np.nan, np.nan)], dtype="float64").reshape(-1, 2)
+    low, high = bounds[codes, 0], bounds[codes, 1]
+    return pd.DataFrame({
+        "dollar_low": low,
+        "dollar_amount": (low + high) / 2,
+        "dollar_high": high,
+    }, index=amounts.index)
+
+
+def amount_midpoints(amounts: pd.Series) -> pd.Series:
+    """Midpoint dollar value of each reported amount"""
+    return parse_amount_ranges(amounts)["dollar_amount"]
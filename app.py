@@ -4,58 +4,358 @@ Congress Indexes Web Application
 Deployable to Vercel with both Congress Buys and Congress Equity Exposure indexes
 """
 
-from flask import Flask, render_template, jsonify, request
-import pandas as pd
-import json
+import time
+
+_import_started = time.perf_counter()
+
+from flask import Flask, Response, g, render_template, jsonify, request, send_from_directory, stream_with_context
 from datetime import datetime, timedelta
+import logging
 import os
+import threading
+
+# The index classes, trade store and sliding windows (and through them pandas,
+# requests and yfinance) are imported inside the functions that run a
+# pipeline, so a cold start only pays for them on the first computed response
+# and never in snapshot-only mode
+from exports import EXPORT_FORMATS, MIMETYPES, iter_csv, iter_parquet
+from http_cache import compress_response, conditional_response, content_digest, payload_etag
+from result_cache import ResultCache
+from serialization import DEFAULT_FORMAT, FORMATS, dumps, frame_table
+from index_refresher import IndexRefresher
+import metrics
+from request_profiler import RequestProfile, load_report, profiling_requested, server_timing
+from snapshots import (CURRENT_FILE, current_manifest, find_snapshot, read_snapshot, serve_snapshots,
+                       snapshot_dir, snapshot_only)
+from startup_report import loaded_heavy_modules
+import config
 
-# Import our index classes
-from congress_buys_index import CongressBuysIndex
-from congress_equity_exposure_index import CongressEquityExposureIndex
+# Stage and upstream HTTP events are one JSON object per log line
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', config.LOG_LEVEL),
+                    format='%(asctime)s %(levelname)s %(name)s %(message)s')
 
 app = Flask(__name__)
 
+# Shared across requests so repeated parameter combinations skip the pipeline
+result_cache = ResultCache.from_config()
+
+# ?format= values: row objects (default) or one array per column
+FORMAT_ERROR = f"format must be one of: {', '.join(FORMATS)}"
+
+# Running Congress Buys totals per days_back window (incremental aggregation)
+sliding_windows = {}
+sliding_windows_lock = threading.Lock()
+
+@app.before_request
+def start_request_profile():
+    """Profile requests that opt in (only honored with config.PROFILING_ENABLED)"""
+    if request.endpoint != 'profile_report_api' and profiling_requested(request.headers, request.args):
+        profile = RequestProfile(request.method, request.path, request.query_string.decode())
+        if profile.start():
+            g.request_profile = profile
+
+@app.after_request
+def finish_request_profile(response):
+    """Save the request's profile and point to it from the response headers"""
+    profile = g.pop('request_profile', None)
+    if profile is not None:
+        report = profile.stop(response.status_code)
+        response.headers['X-Profile-Id'] = report['id']
+        response.headers['Server-Timing'] = server_timing(report)
+    return response
+
+@app.after_request
+def compress(response):
+    """gzip/brotli-compress JSON and page bodies the client accepts encoded"""
+    return compress_response(response, request.accept_encodings)
+
+@app.teardown_request
+def abort_request_profile(error=None):
+    """Stop a profile whose request failed before after_request ran"""
+    profile = g.pop('request_profile', None)
+    if profile is not None:
+        profile.stop(500)
+
 @app.route('/')
 def index():
     """Main page with both indexes"""
-    return render_template('index.html')
+    return render_template('index.html', top_n=config.TOP_N_CONSTITUENTS)
+
+def build_congress_buys_result(days_back: int, end_date: str = None, as_of: str = None,
+                               fmt: str = DEFAULT_FORMAT) -> dict:
+    """Run the Congress Buys pipeline and shape it into the API payload"""
+    from congress_buys_index import CongressBuysIndex
+    from sliding_window import SlidingWindowAggregator
+    from trade_store import TradeStore
+    
+    index = CongressBuysIndex()
+    
+    # Set API key from environment variable if available
+    api_key = os.environ.get('QUIVERQUANT_API_KEY')
+    if api_key:
+        index.set_api_key(api_key)
+    
+    # Reuse trades synced on previous requests and fetch only the delta
+    if config.USE_TRADE_STORE:
+        index.set_trade_store(TradeStore(os.environ.get('TRADE_STORE_DIR', config.TRADE_STORE_DIR)))
+    
+    if end_date is None and as_of is None and config.USE_TRADE_STORE and config.INCREMENTAL_AGGREGATION:
+        # Slide a long-lived per-window aggregator instead of regrouping every trade
+        with sliding_windows_lock:
+            aggregator = sliding_windows.setdefault(days_back, SlidingWindowAggregator(days_back))
+        result_df = index.generate_index_incremental(aggregator)
+    else:
+        result_df = index.generate_index(days_back=days_back,
+                                         end_date=datetime.strptime(end_date, '%Y-%m-%d') if end_date else None,
+                                         as_of=datetime.strptime(as_of, '%Y-%m-%d') if as_of else None)
+    
+    summary = {
+        'total_weight': float(result_df['weight'].sum()),
+        'total_value': float(result_df['dollar_amount'].sum()),
+        'constituent_count': len(result_df)
+    }
+    if 'dollar_low' in result_df.columns:
+        # Bounds implied by the reported ranges, next to the midpoint total
+        summary['total_value_low'] = float(result_df['dollar_low'].sum())
+        summary['total_value_high'] = float(result_df['dollar_high'].sum())
+    
+    return {
+        'index_name': 'Congress Buys Index',
+        'methodology': f'Top {config.TOP_N_CONSTITUENTS} stocks by total dollars purchased by Congress in last {days_back} days',
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'parameters': {
+            'days_back': days_back,
+            'end_date': end_date,
+            'as_of': as_of
+        },
+        'constituents': frame_table(result_df, fmt),
+        'summary': summary
+    }
+
+def build_congress_buys_windows_result(windows: list, fmt: str = DEFAULT_FORMAT) -> dict:
+    """Run the Congress Buys pipeline once for several windows and shape the API payload"""
+    from congress_buys_index import CongressBuysIndex
+    from trade_store import TradeStore
+    
+    index = CongressBuysIndex()
+    
+    # Set API key from environment variable if available
+    api_key = os.environ.get('QUIVERQUANT_API_KEY')
+    if api_key:
+        index.set_api_key(api_key)
+    
+    if config.USE_TRADE_STORE:
+        index.set_trade_store(TradeStore(os.environ.get('TRADE_STORE_DIR', config.TRADE_STORE_DIR)))
+    
+    results = index.generate_multi_window_index(windows)
+    
+    return {
+        'index_name': 'Congress Buys Index',
+        'methodology': f'Top {config.TOP_N_CONSTITUENTS} stocks by total dollars purchased by Congress in each trailing window',
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'parameters': {
+            'windows': windows
+        },
+        'windows': {
+            str(days): {
+                'constituents': frame_table(result_df, fmt),
+                'summary': {
+                    'total_weight': float(result_df['weight'].sum()),
+                    'total_value': float(result_df['dollar_amount'].sum()),
+                    'constituent_count': len(result_df)
+                }
+            }
+            for days, result_df in results.items()
+        }
+    }
+
+def build_equity_exposure_result(quarter_end: str, fmt: str = DEFAULT_FORMAT) -> dict:
+    """Run the Congress Equity Exposure pipeline and shape it into the API payload"""
+    from congress_equity_exposure_index import CongressEquityExposureIndex
+    from trade_store import HoldingsStore
+    
+    index = CongressEquityExposureIndex()
+    
+    # Set API key from environment variable if available
+    api_key = os.environ.get('QUIVERQUANT_API_KEY')
+    if api_key:
+        index.set_api_key(api_key)
+    
+    # Serve completed quarters from locally stored snapshots
+    if config.USE_HOLDINGS_STORE:
+        index.set_holdings_store(HoldingsStore(os.environ.get('HOLDINGS_STORE_DIR', config.HOLDINGS_STORE_DIR)))
+    
+    result_df = index.generate_index(quarter_end_date=quarter_end)
+    
+    return {
+        'index_name': 'Congress Equity Exposure Index',
+        'methodology': 'Top 10 stocks by largest total congressional net holding value at quarter end',
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'parameters': {
+            'quarter_end': quarter_end or 'Latest'
+        },
+        'constituents': frame_table(result_df, fmt),
+        'summary': {
+            'total_weight': float(result_df['weight'].sum()),
+            'total_value': float(result_df['dollar_value'].sum()),
+            'constituent_count': len(result_df)
+        }
+    }
+
+def serve_index(endpoint: str, params: dict, build):
+    """
+    Serve the published snapshot file when snapshots are enabled, then the
+    background refresher's last good snapshot when there is one, otherwise
+    fall back to the result cache (computing on a miss). In snapshot-only
+    mode, never run a pipeline.
+    """
+    if snapshot_only() or (serve_snapshots() and 'request_profile' not in g):
+        entry = find_snapshot(endpoint, params)
+        if entry is not None:
+            return conditional_response(request, lambda: read_snapshot(entry), entry['etag'],
+                                        last_modified=datetime.fromisoformat(entry['published_at']),
+                                        cache_control=entry['api_cache_control'],
+                                        headers={'X-Snapshot-Version': entry['version']})
+        if snapshot_only():
+            return jsonify({'error': 'no published snapshot for these parameters'}), 404
+    
+    if 'request_profile' in g:
+        # A profiled request always runs the pipeline it is meant to measure
+        return index_response(endpoint, build())
+    
+    snapshot = refresher.get(endpoint, params) if refresher is not None else None
+    if snapshot is not None:
+        return index_response(endpoint, snapshot.to_payload(), snapshot.digest)
+    
+    # Cache the content digest with the payload so hits never re-serialize it for the ETag
+    entry = result_cache.get_or_compute(endpoint, params, lambda: cache_entry(build()))
+    return index_response(endpoint, entry['payload'], entry['digest'])
+
+def cache_entry(payload: dict) -> dict:
+    """A result cache value: the payload plus its content digest"""
+    return {'payload': payload, 'digest': content_digest(payload)}
+
+def index_response(endpoint: str, payload: dict, digest: str = None) -> Response:
+    """
+    The payload as JSON with a stable ETag (304 when the client's copy is
+    current). No Last-Modified: last_updated moves on every recompute, so it
+    would not say when the data changed; the ETag does.
+    """
+    return conditional_response(request, lambda: dumps(payload),
+                                payload_etag(payload, data_watermark(endpoint), digest))
+
+def data_watermark(endpoint: str):
+    """
+    The version of the trade store data behind a Congress Buys endpoint (None
+    otherwise): each month partition with its modification time and size.
+    merge only rewrites a partition when its trades change (new trades, late
+    filings, amendments), so ETags change exactly when the data does, while
+    syncs that find nothing new leave them alone. Read with os.stat to keep
+    pandas out of cache hits.
+    """
+    if not endpoint.startswith('congress-buys') or not config.USE_TRADE_STORE:
+        return None
+    store_dir = os.environ.get('TRADE_STORE_DIR', config.TRADE_STORE_DIR)
+    if not os.path.isdir(store_dir):
+        return None
+    watermark = []
+    for name in sorted(os.listdir(store_dir)):
+        if name.startswith('month='):
+            try:
+                stat = os.stat(os.path.join(store_dir, name, 'part-0.parquet'))
+            except FileNotFoundError:
+                continue
+            watermark.append([name, stat.st_mtime_ns, stat.st_size])
+    return watermark or None
+
+def precomputed_jobs() -> list:
+    """(endpoint, params, build) for every parameter combination the dashboards request"""
+    jobs = [('congress-buys', {'days_back': days_back},
+             lambda days_back=days_back: build_congress_buys_result(days_back))
+            for days_back in config.REFRESH_DAYS_BACK]
+    jobs.append(('congress-buys-windows', {'windows': sorted(config.REFRESH_DAYS_BACK)},
+                 lambda: build_congress_buys_windows_result(sorted(config.REFRESH_DAYS_BACK))))
+    jobs.append(('congress-equity-exposure', {'quarter_end': 'latest'},
+                 lambda: build_equity_exposure_result(None)))
+    jobs.extend(('congress-equity-exposure', {'quarter_end': quarter_end},
+                 lambda quarter_end=quarter_end: build_equity_exposure_result(quarter_end))
+                for quarter_end in config.REFRESH_QUARTER_ENDS)
+    return jobs
+
+def start_background_refresher() -> IndexRefresher:
+    """Keep the commonly requested index payloads fresh from a background thread"""
+    change_token = None
+    if config.USE_TRADE_STORE:
+        from trade_store import TradeStore
+        trade_store = TradeStore(os.environ.get('TRADE_STORE_DIR', config.TRADE_STORE_DIR))
+        change_token = lambda: trade_store.get_watermark()['latest_transaction_ids']
+    
+    background_refresher = IndexRefresher(change_token=change_token)
+    for endpoint, params, build in precomputed_jobs():
+        background_refresher.register(endpoint, params, build)
+    background_refresher.start()
+    return background_refresher
 
 @app.route('/api/congress-buys')
 def congress_buys_api():
     """API endpoint for Congress Buys Index"""
     try:
-        # Get parameters
+        # Get parameters: a trailing days_back window ending on end_date (default: today),
+        # or an explicit start_date..end_date range (YYYY-MM-DD), optionally as known on as_of
         days_back = request.args.get('days_back', 100, type=int)
+        end_date = request.args.get('end_date', None) or None
+        start_date = request.args.get('start_date', None) or None
+        as_of = request.args.get('as_of', None) or None
+        if as_of is not None:
+            as_of = datetime.strptime(as_of, '%Y-%m-%d').strftime('%Y-%m-%d')
+        if end_date is not None:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').strftime('%Y-%m-%d')
+        if start_date is not None:
+            range_end = datetime.strptime(end_date, '%Y-%m-%d') if end_date else datetime.now()
+            days_back = (range_end - datetime.strptime(start_date, '%Y-%m-%d')).days
+            end_date = range_end.strftime('%Y-%m-%d')
+        if days_back <= 0:
+            return jsonify({'error': 'the date range must span at least one day'}), 400
+        fmt = request.args.get('format', DEFAULT_FORMAT)
+        if fmt not in FORMATS:
+            return jsonify({'error': FORMAT_ERROR}), 400
         
-        # Generate index
-        index = CongressBuysIndex()
-        
-        # Set API key from environment variable if available
-        api_key = os.environ.get('QUIVERQUANT_API_KEY')
-        if api_key:
-            index.set_api_key(api_key)
-        
-        result_df = index.generate_index(days_back=days_back)
-        
-        # Convert to JSON
-        result = {
-            'index_name': 'Congress Buys Index',
-            'methodology': 'Top 10 stocks by total dollars purchased by Congress in last 100 days',
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'parameters': {
-                'days_back': days_back
-            },
-            'constituents': result_df.to_dict('records'),
-            'summary': {
-                'total_weight': float(result_df['weight'].sum()),
-                'total_value': float(result_df['dollar_amount'].sum()),
-                'constituent_count': len(result_df)
-            }
-        }
+        params = {'days_back': days_back}
+        if end_date is not None:
+            params['end_date'] = end_date
+        if as_of is not None:
+            params['as_of'] = as_of
+        if fmt != DEFAULT_FORMAT:
+            params['format'] = fmt
+        return serve_index('congress-buys', params,
+                           lambda: build_congress_buys_result(days_back, end_date, as_of, fmt))
+    
+    except ValueError:
+        return jsonify({'error': 'start_date, end_date and as_of must be YYYY-MM-DD dates'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/congress-buys/windows')
+def congress_buys_windows_api():
+    """API endpoint for the Congress Buys Index over several windows in one response"""
+    try:
+        # Get parameters, e.g. ?windows=30,60,100,180
+        windows_arg = request.args.get('windows', '30,60,100,180')
+        windows = sorted({int(days) for days in windows_arg.split(',') if days.strip()})
+        if not windows or min(windows) <= 0:
+            return jsonify({'error': 'windows must be a comma-separated list of positive day counts'}), 400
+        fmt = request.args.get('format', DEFAULT_FORMAT)
+        if fmt not in FORMATS:
+            return jsonify({'error': FORMAT_ERROR}), 400
         
-        return jsonify(result)
+        params = {'windows': windows}
+        if fmt != DEFAULT_FORMAT:
+            params['format'] = fmt
+        return serve_index('congress-buys-windows', params,
+                           lambda: build_congress_buys_windows_result(windows, fmt))
     
+    except ValueError:
+        return jsonify({'error': 'windows must be a comma-separated list of positive day counts'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -63,37 +363,78 @@ def congress_buys_api():
 def congress_equity_exposure_api():
     """API endpoint for Congress Equity Exposure Index"""
     try:
-        # Get parameters
-        quarter_end = request.args.get('quarter_end', None)
-        
-        # Generate index
-        index = CongressEquityExposureIndex()
+        # Get parameters (blank and missing both mean the latest quarter)
+        quarter_end = request.args.get('quarter_end', None) or None
+        fmt = request.args.get('format', DEFAULT_FORMAT)
+        if fmt not in FORMATS:
+            return jsonify({'error': FORMAT_ERROR}), 400
         
-        # Set API key from environment variable if available
-        api_key = os.environ.get('QUIVERQUANT_API_KEY')
-        if api_key:
-            index.set_api_key(api_key)
-        
-        result_df = index.generate_index(quarter_end_date=quarter_end)
+        params = {'quarter_end': quarter_end or 'latest'}
+        if fmt != DEFAULT_FORMAT:
+            params['format'] = fmt
+        return serve_index('congress-equity-exposure', params,
+                           lambda: build_equity_exposure_result(quarter_end, fmt))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def export_filters():
+    """start_date, end_date and as_of (YYYY-MM-DD or None) and the ?ticker= list of an export request"""
+    dates = []
+    for name in ['start_date', 'end_date', 'as_of']:
+        value = request.args.get(name, None) or None
+        dates.append(datetime.strptime(value, '%Y-%m-%d') if value is not None else None)
+    tickers = sorted({ticker.strip().upper() for ticker in request.args.get('ticker', '').split(',') if ticker.strip()})
+    return dates[0], dates[1], dates[2], tickers or None
+
+def export_response(frames, fmt: str, name: str) -> Response:
+    """Stream frames (one stored partition at a time) as a CSV or Parquet download"""
+    body = iter_csv(frames) if fmt == 'csv' else iter_parquet(frames)
+    return Response(stream_with_context(body), mimetype=MIMETYPES[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{name}.{fmt}"',
+                             'Cache-Control': 'no-store'})
+
+@app.route('/api/congress-buys/trades')
+def congress_buys_trades_export():
+    """Stream the stored trades behind the Congress Buys Index as CSV or Parquet"""
+    try:
+        # Get parameters: trade date range, ?ticker=AAPL,MSFT, as_of (as disclosed by then), ?format=csv|parquet
+        start_date, end_date, as_of, tickers = export_filters()
+        fmt = request.args.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
         
-        # Convert to JSON
-        result = {
-            'index_name': 'Congress Equity Exposure Index',
-            'methodology': 'Top 10 stocks by largest total congressional net holding value at quarter end',
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'parameters': {
-                'quarter_end': quarter_end or 'Latest'
-            },
-            'constituents': result_df.to_dict('records'),
-            'summary': {
-                'total_weight': float(result_df['weight'].sum()),
-                'total_value': float(result_df['dollar_value'].sum()),
-                'constituent_count': len(result_df)
-            }
-        }
+        from trade_store import TradeStore
+        store = TradeStore(os.environ.get('TRADE_STORE_DIR', config.TRADE_STORE_DIR))
+        if not store.partitions():
+            return jsonify({'error': 'the local trade store is empty; sync it with backfill_history.py'}), 404
+        return export_response(store.iter_trades(start_date, end_date, as_of=as_of, tickers=tickers), fmt,
+                               'congress_buys_trades')
+    
+    except ValueError:
+        return jsonify({'error': 'start_date, end_date and as_of must be YYYY-MM-DD dates'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/congress-equity-exposure/holdings')
+def congress_equity_exposure_holdings_export():
+    """Stream the stored quarterly holdings behind the Equity Exposure Index as CSV or Parquet"""
+    try:
+        # Get parameters: quarter end date range, ?ticker=AAPL,MSFT, ?format=csv|parquet
+        start_date, end_date, _, tickers = export_filters()
+        fmt = request.args.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
         
-        return jsonify(result)
+        from trade_store import HoldingsStore
+        store = HoldingsStore(os.environ.get('HOLDINGS_STORE_DIR', config.HOLDINGS_STORE_DIR))
+        if not store.quarters():
+            return jsonify({'error': 'no quarterly holdings snapshots are stored yet'}), 404
+        return export_response(store.iter_holdings(start_date, end_date, tickers=tickers), fmt,
+                               'congress_equity_exposure_holdings')
     
+    except ValueError:
+        return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD dates'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -101,23 +442,64 @@ def congress_equity_exposure_api():
 def health_check():
     """Health check endpoint for Vercel"""
     api_key_configured = bool(os.environ.get('QUIVERQUANT_API_KEY'))
+    manifest = current_manifest()
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'indexes': ['congress-buys', 'congress-equity-exposure'],
         'api_key_configured': api_key_configured,
-        'data_source': 'real_data' if api_key_configured else 'sample_data'
+        'data_source': 'real_data' if api_key_configured else 'sample_data',
+        'cache': result_cache.stats(),
+        'refresher': refresher.status() if refresher is not None else None,
+        'startup': {
+            'mode': 'snapshot' if snapshot_only() else 'live',
+            'import_seconds': round(startup_seconds, 4),
+            'heavy_modules_loaded': loaded_heavy_modules()
+        },
+        'snapshot_version': manifest['version'] if manifest else None
     })
 
+@app.route('/api/metrics')
+def metrics_api():
+    """Pipeline stage, upstream HTTP and cache metrics in Prometheus text format"""
+    return Response(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/profiles/<profile_id>')
+def profile_report_api(profile_id):
+    """A saved request profile: per-stage breakdown, upstream calls and hottest functions"""
+    report = load_report(profile_id) if profiling_requested(request.headers, request.args) else None
+    if report is None:
+        return jsonify({'error': 'profile not found'}), 404
+    return jsonify(report)
+
+@app.route('/snapshots/<path:filename>')
+def snapshot_file(filename):
+    """Published snapshot files; everything but current.json is content-addressed and immutable"""
+    response = send_from_directory(os.path.abspath(snapshot_dir()), filename)
+    response.headers['Cache-Control'] = (config.SNAPSHOT_API_CACHE_CONTROL if filename == CURRENT_FILE
+                                         else config.SNAPSHOT_FILE_CACHE_CONTROL)
+    return response
+
 @app.route('/congress-buys')
 def congress_buys_page():
     """Congress Buys Index page"""
-    return render_template('congress_buys.html')
+    return render_template('congress_buys.html', top_n=config.TOP_N_CONSTITUENTS)
 
 @app.route('/congress-equity-exposure')
 def congress_equity_exposure_page():
     """Congress Equity Exposure Index page"""
     return render_template('congress_equity_exposure.html')
 
+# Long-running servers (gunicorn) only; serverless instances do not keep threads alive
+refresher = (start_background_refresher()
+             if config.BACKGROUND_REFRESH_ENABLED and not snapshot_only() else None)
+
+# Time spent importing this module (Flask and our light modules), reported by /api/health
+startup_seconds = time.perf_counter() - _import_started
+
 if __name__ == '__main__':
+    # Process-wide, so set once before serving (importing app leaves pandas unloaded)
+    if config.COPY_FREE_PIPELINE:
+        from trade_store import enable_copy_on_write
+        enable_copy_on_write()
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000))) 
\ No newline at end of file
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Historical Backfill of the Congress Buys Index
+Computes the index as it would have been published on every trading day from
+the local trade store in one vectorized sweep over the prefix-sum index, and
+writes the daily constituents to month-partitioned Parquet files. Months
+already written are skipped, so an interrupted backfill resumes where it
+stopped. With --as-disclosed each day only sees trades disclosed by then.
+
+Usage: python backfill_history.py [years] [days_back] [--as-disclosed]
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+import config
+from congress_buys_index import CongressBuysIndex
+from prefix_index import AsDisclosedWindowIndex, index_for_store
+from trade_store import TradeStore
+
+# Trading days ranked per block; bounds the tickers x days working set
+SWEEP_BLOCK_DAYS = 64
+
+
+def history_path(days_back: int, path: str = None, as_disclosed: bool = False) -> str:
+    """Directory holding the daily history for one window length"""
+    name = f"days_back={days_back}" + ("_as_disclosed" if as_disclosed else "")
+    return os.path.join(path or config.HISTORY_DIR, name)
+
+
+def trading_days(start_date, end_date) -> pd.DatetimeIndex:
+    """Weekdays between start_date and end_date (exchange holidays are not excluded)"""
+    return pd.bdate_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize())
+
+
+def rounded_weights(top_totals: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_weights over rows of descending top-N totals: round to
+    1 decimal and push the rounding residue onto each row's largest weight
+    """
+    row_totals = top_totals.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weights = np.round(top_totals / row_totals * 100, 1)
+    residue = 100.0 - weights.sum(axis=1)
+    rows = np.flatnonzero((np.abs(residue) > 0.01) & (row_totals[:, 0] > 0))
+    weights[rows, weights[rows].argmax(axis=1)] += residue[rows]
+    return weights
+
+
+def sweep(window_index, days: pd.DatetimeIndex, days_back: int, top_n: int = 10) -> pd.DataFrame:
+    """
+    Top-N constituents and weights for the days_back window ending on each day.
+    window_index is a CumulativeDollarIndex (or an AsDisclosedWindowIndex for
+    point-in-time history); it yields a block of days' window totals at once
+    and ranking uses argpartition along the ticker axis.
+    """
+    if len(window_index.tickers) == 0 or len(days) == 0:
+        return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "rank": pd.Series(dtype="int8"),
+                             "ticker": pd.Series(dtype="category"), "company": pd.Series(dtype="category"),
+                             "dollar_amount": pd.Series(dtype="float64"), "weight": pd.Series(dtype="float64")})
+
+    n = min(top_n, len(window_index.tickers))
+    frames = []
+    for block in range(0, len(days), SWEEP_BLOCK_DAYS):
+        block_slice = slice(block, block + SWEEP_BLOCK_DAYS)
+        totals = window_index.window_totals(days[block_slice], days_back).T
+
+        top = np.argpartition(-totals, n - 1, axis=1)[:, :n]
+        top_totals = np.take_along_axis(totals, top, axis=1)
+        order = np.argsort(-top_totals, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_totals = np.take_along_axis(top_totals, order, axis=1)
+        top_totals[top_totals < 1e-6] = 0.0  # Float residue of tickers that left the window
+        weights = rounded_weights(top_totals)
+
+        keep = top_totals > 0
+        day_index, rank = np.nonzero(keep)
+        frames.append(pd.DataFrame({
+            "date": days[block_slice][day_index],
+            "rank": (rank + 1).astype("int8"),
+            "ticker": window_index.tickers[top[keep]],
+            "company": window_index.companies[top[keep]],
+            "dollar_amount": top_totals[keep],
+            "weight": weights[keep],
+        }))
+
+    history = pd.concat(frames, ignore_index=True)
+    return history.astype({"ticker": "category", "company": "category"})
+
+
+def backfill(window_index, start_date, end_date, days_back: int = 100,
+             path: str = None, top_n: int = 10) -> List[str]:
+    """
+    Write the daily history between start_date and end_date, one Parquet file
+    per month. Completed months already on disk are skipped; the month holding
+    end_date is always recomputed since it may have been written part-way.
+    Returns the months written.
+    """
+    as_disclosed = isinstance(window_index, AsDisclosedWindowIndex)
+    directory = history_path(days_back, path, as_disclosed)
+    os.makedirs(directory, exist_ok=True)
+    days = trading_days(start_date, end_date)
+    if len(days) == 0:
+        return []
+
+    months = days.strftime("%Y-%m")
+    last_month = months[-1]
+    pending = [month for month in months.unique()
+               if month == last_month or not os.path.exists(os.path.join(directory, f"month={month}.parquet"))]
+
+    # One sweep over every pending day, then one atomic write per month
+    pending_days = days[months.isin(pending)]
+    history = sweep(window_index, pending_days, days_back, top_n)
+    history_months = history["date"].dt.strftime("%Y-%m")
+    for month in pending:
+        target = os.path.join(directory, f"month={month}.parquet")
+        tmp_file = f"{target}.tmp"
+        history[history_months == month].reset_index(drop=True).to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, target)
+        print(f"   Wrote {month}")
+    return pending
+
+
+def load_history(days_back: int = 100, path: str = None, start_date=None, end_date=None,
+                 as_disclosed: bool = False) -> pd.DataFrame:
+    """Read the backfilled daily history, optionally limited to a date range"""
+    directory = history_path(days_back, path, as_disclosed)
+    if not os.path.isdir(directory):
+        return pd.DataFrame()
+    filters = []
+    if start_date is not None:
+        filters.append(("date", ">=", pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(("date", "<=", pd.Timestamp(end_date)))
+
+    files = sorted(name for name in os.listdir(directory) if name.endswith(".parquet"))
+    frames = [pd.read_parquet(os.path.join(directory, name), filters=filters or None) for name in files]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    """Backfill the daily Congress Buys history from the local trade store"""
+    as_disclosed = "--as-disclosed" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--as-disclosed"]
+    years = int(args[0]) if len(args) > 0 else 5
+    days_back = int(args[1]) if len(args) > 1 else 100
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365 * years)
+
+    print(f"BACKFILLING CONGRESS BUYS INDEX HISTORY ({years} years, {days_back}-day window)")
+    print("=" * 60)
+
+    index = CongressBuysIndex()
+    index.set_trade_store(TradeStore(os.environ.get('TRADE_STORE_DIR', config.TRADE_STORE_DIR)))
+    api_key = os.environ.get('QUIVERQUANT_API_KEY')
+    if api_key:
+        index.set_api_key(api_key)
+        # Windows at the start of the history reach days_back further back
+        index._sync_trade_store(start_date - timedelta(days=days_back), end_date)
+
+    if as_disclosed:
+        # Every stored version, so each day only sees what had been disclosed by then
+        trades = index.trade_store.load(all_versions=True)
+        window_index = None
+        if not trades.empty:
+            buys = index.convert_dollar_ranges_to_midpoints(index.filter_buys_only(trades))
+            window_index = AsDisclosedWindowIndex.from_trades(buys, days_back)
+    else:
+        window_index = index_for_store(index.trade_store, index.prepare_buy_trades)
+    if window_index is None:
+        print("No trades in local trade store; set QUIVERQUANT_API_KEY to sync them first.")
+        return
+
+    written = backfill(window_index, start_date, end_date, days_back)
+    print(f"\n✓ {len(written)} months written to {history_path(days_back, as_disclosed=as_disclosed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks
+Times every stage of the Congress Buys and Congress Equity Exposure pipelines
+(the steps of their generate_index) on synthetic datasets of several sizes,
+and records each stage's peak memory. Also times encoding the member-level
+trades as a JSON response body: the old to_dict('records') + stdlib path
+against the serialization module's records and columnar formats. Runs fully offline: trades and holdings
+are read from synthetic local stores and prices come from a static provider.
+Results are saved as JSON; compared against a baseline run, any stage slower
+or hungrier than the threshold allows fails the run.
+
+Usage: python benchmark.py [sizes] [--output FILE] [--baseline FILE] [--threshold FRACTION]
+       sizes are comma-separated trade counts, e.g. 10000,100000,1000000
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from congress_buys_index import CongressBuysIndex
+from congress_equity_exposure_index import CongressEquityExposureIndex
+from price_providers import StaticPriceProvider
+from serialization import dumps, frame_columns, frame_records
+from synthetic_data import DEFAULT_TICKERS, synthetic_prices, write_holdings_store, write_trade_store
+from trade_store import enable_copy_on_write
+
+END_DATE = pd.Timestamp("2024-12-31")
+QUARTER_END_DATE = "2024-12-31"
+
+# Differences below these are timer and allocator noise, never regressions
+MIN_REGRESSION_SECONDS = 0.005
+MIN_REGRESSION_MB = 1.0
+
+# Stages of CongressBuysIndex.generate_index, in order; each takes the previous stage's output
+BUYS_STAGES: List[Tuple[str, Callable]] = [
+    ("fetch_trades", lambda index, store: store.get_trades(END_DATE - pd.Timedelta(days=config.DEFAULT_DAYS_BACK),
+                                                           END_DATE)),
+    ("filter_buys_only", lambda index, df: index.filter_buys_only(df)),
+    ("deduplicate_trades", lambda index, df: index.deduplicate_trades(df)),
+    ("convert_dollar_ranges", lambda index, df: index.convert_dollar_ranges_to_midpoints(df)),
+    ("aggregate_top_n", lambda index, df: index.aggregate_top_n(df)),
+    ("calculate_weights", lambda index, df: index.calculate_weights(df)),
+]
+
+# Stages of CongressEquityExposureIndex.generate_index
+EXPOSURE_STAGES: List[Tuple[str, Callable]] = [
+    ("fetch_holdings", lambda index, store: store.get_holdings(QUARTER_END_DATE)),
+    ("calculate_net_holdings", lambda index, df: index.calculate_net_holdings(df, valuation_date=QUARTER_END_DATE)),
+    ("aggregate_by_ticker", lambda index, df: index.aggregate_by_ticker(df)),
+    ("select_top_10", lambda index, df: index.select_top_10(df)),
+    ("calculate_weights", lambda index, df: index.calculate_weights(df)),
+    ("sort_by_weight", lambda index, df: df.sort_values('weight', ascending=False).reset_index(drop=True)),
+]
+
+
+# Ways to encode a member-level table (the raw trades) as a response body; each takes the same DataFrame
+SERIALIZATION_STAGES: List[Tuple[str, Callable]] = [
+    # What jsonify did with to_dict('records')
+    ("records_stdlib", lambda index, df: json.dumps(df.to_dict("records"), default=str, sort_keys=True).encode()),
+    ("records_orjson", lambda index, df: dumps(frame_records(df))),
+    ("columnar_orjson", lambda index, df: dumps(frame_columns(df))),
+]
+
+
+def time_stages(pipeline: str, rows: int, index, source, stages: List[Tuple[str, Callable]],
+                repeats: int = 3) -> List[Dict]:
+    """
+    Run the stages in order. Each stage is timed over repeats runs on the same
+    input (best run kept), then run once more under tracemalloc for its peak
+    memory above what was allocated before it started.
+    """
+    results = []
+    data = source
+    for stage, run in stages:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            output = run(index, data)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        run(index, data)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - baseline_bytes
+        tracemalloc.stop()
+
+        results.append({
+            "pipeline": pipeline,
+            "rows": rows,
+            "stage": stage,
+            "seconds": min(timings),
+            "peak_mb": peak_bytes / 1e6,
+            "output_rows": len(output),
+        })
+        data = output
+    return results
+
+
+def run_benchmarks(sizes: List[int], repeats: int = 3, seed: int = 0) -> List[Dict]:
+    """Benchmark both pipelines on synthetic data of each size (holdings: a tenth of the trades)"""
+    results = []
+    prices = StaticPriceProvider(synthetic_prices(DEFAULT_TICKERS, seed))
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Every trade falls inside the index window, so rows is the pipeline's input size
+            trade_store = write_trade_store(os.path.join(tmp_dir, "trades"), rows, seed,
+                                            start_date=END_DATE - pd.Timedelta(days=config.DEFAULT_DAYS_BACK),
+                                            end_date=END_DATE)
+            holdings_store = write_holdings_store(os.path.join(tmp_dir, "holdings"), max(rows // 10, 1), seed,
+                                                  quarter_end_date=QUARTER_END_DATE)
+
+            print(f"Benchmarking {rows:,} trades / {max(rows // 10, 1):,} holdings...")
+            buys_index = CongressBuysIndex()
+            results += time_stages("congress_buys", rows, buys_index, trade_store, BUYS_STAGES, repeats)
+
+            trades = BUYS_STAGES[0][1](buys_index, trade_store)
+            for stage in SERIALIZATION_STAGES:
+                result = time_stages("serialization", rows, None, trades, [stage], repeats)[0]
+                results.append(dict(result, output_rows=len(trades), output_bytes=result["output_rows"]))
+
+            exposure_index = CongressEquityExposureIndex()
+            exposure_index.set_price_provider(prices)
+            results += time_stages("congress_equity_exposure", rows, exposure_index, holdings_store,
+                                   EXPOSURE_STAGES, repeats)
+    return results
+
+
+def save_results(results: List[Dict], path: str):
+    """Write results with the environment they were measured in"""
+    report = {
+        "created": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "copy_free_pipeline": config.COPY_FREE_PIPELINE,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_file, path)
+
+
+def load_results(path: str) -> List[Dict]:
+    """Read the results of an earlier run"""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare_results(results: List[Dict], baseline: List[Dict], threshold: float = None) -> List[str]:
+    """
+    Return one message per stage whose time or peak memory grew by more than
+    threshold (a fraction, e.g. 0.25) over the baseline. Stages missing from
+    the baseline are not compared.
+    """
+    threshold = config.BENCHMARK_REGRESSION_THRESHOLD if threshold is None else threshold
+    previous = {(r["pipeline"], r["rows"], r["stage"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["pipeline"], result["rows"], result["stage"]))
+        if before is None:
+            continue
+        for metric, unit, noise in [("seconds", "s", MIN_REGRESSION_SECONDS), ("peak_mb", " MB", MIN_REGRESSION_MB)]:
+            now, then = result[metric], before[metric]
+            if now > then * (1 + threshold) and now - then > noise:
+                change = f" (+{(now / then - 1) * 100:.0f}%)" if then > 0 else ""
+                regressions.append(f"{result['pipeline']} {result['rows']:,} rows {result['stage']}: "
+                                   f"{metric} {then:.3f}{unit} -> {now:.3f}{unit}{change}")
+    return regressions
+
+
+def print_results(results: List[Dict]):
+    """Print a per-stage table"""
+    print(f"\n{'Pipeline':<26} {'Rows':>10} {'Stage':<24} {'Seconds':>9} {'Peak MB':>9} {'Out rows':>10}")
+    print("-" * 93)
+    for r in results:
+        print(f"{r['pipeline']:<26} {r['rows']:>10,} {r['stage']:<24} {r['seconds']:>9.4f} "
+              f"{r['peak_mb']:>9.1f} {r['output_rows']:>10,}")
+
+
+def main():
+    """Run the benchmarks, save them and compare against a baseline when given"""
+    args = sys.argv[1:]
+    options = {}
+    for flag in ["--output", "--baseline", "--threshold"]:
+        if flag in args:
+            position = args.index(flag)
+            options[flag] = args[position + 1]
+            del args[position:position + 2]
+    sizes = [int(float(size)) for size in args[0].split(",")] if args else config.BENCHMARK_SIZES
+    output = options.get("--output", config.BENCHMARK_OUTPUT_FILE)
+    threshold = float(options.get("--threshold", config.BENCHMARK_REGRESSION_THRESHOLD))
+
+    if config.COPY_FREE_PIPELINE:
+        enable_copy_on_write()
+    print("CONGRESS INDEX PIPELINE BENCHMARKS")
+    print("=" * 60)
+    results = run_benchmarks(sizes)
+    print_results(results)
+    save_results(results, output)
+    print(f"\n✓ Results saved to {output}")
+
+    if "--baseline" in options:
+        regressions = compare_results(results, load_results(options["--baseline"]), threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) beyond {threshold:.0%} of {options['--baseline']}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"✓ No regressions beyond {threshold:.0%} of {options['--baseline']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,17 @@ CapitolTrades API Integration
 Free alternative to QuiverQuant for congressional trading data
 """
 
+import logging
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import time
 
+from trade_store import TradeStore
+
+logger = logging.getLogger("congress_indexes.capitoltrades")
+
 class CapitolTradesAPI:
     """
     Free API integration for congressional trading data
@@ -20,6 +25,7 @@ class CapitolTradesAPI:
         self.base_url = "https://api.capitoltrades.com"
         self.api_key = None
         self.session = requests.Session()
+        self.trade_store = None  # Optional local TradeStore for incremental sync
         
     def set_api_key(self, api_key: str):
         """Set the CapitolTrades API key"""
@@ -30,55 +36,76 @@ class CapitolTradesAPI:
                 "Content-Type": "application/json"
             })
     
+    def set_trade_store(self, trade_store: TradeStore):
+        """Sync trades incrementally into a local TradeStore instead of refetching the full window"""
+        self.trade_store = trade_store
+    
     def get_recent_trades(self, days_back: int = 100) -> pd.DataFrame:
         """
         Get recent congressional trades from CapitolTrades
         """
         if not self.api_key:
-            print("No CapitolTrades API key provided. Using sample data.")
+            logger.info("No CapitolTrades API key provided. Using sample data.")
             return self._get_sample_data()
         
         # Calculate date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
         
-        try:
-            # Fetch recent trades
-            url = f"{self.base_url}/trades"
-            params = {
-                "start_date": start_date.strftime("%Y-%m-%d"),
-                "end_date": end_date.strftime("%Y-%m-%d"),
-                "limit": 1000  # Adjust based on API limits
-            }
-            
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data or 'data' not in data:
-                print("No data received from CapitolTrades API. Using sample data.")
+        if self.trade_store is not None:
+            # Only fetch trades disclosed since the last sync, then read the window locally
+            try:
+                new_count = self.trade_store.sync(self.get_trades_range, start_date, end_date)
+            except requests.exceptions.RequestException as e:
+                logger.error("Error syncing CapitolTrades data: %s", e)
+                new_count = 0
+            logger.info("Synced %d new trades into local trade store", new_count)
+            df = self.trade_store.get_trades(start_date, end_date)
+        else:
+            try:
+                df = self.get_trades_range(start_date, end_date)
+            except requests.exceptions.RequestException as e:
+                logger.error("Error fetching CapitolTrades data: %s. Falling back to sample data.", e)
                 return self._get_sample_data()
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(data['data'])
-            
-            # Standardize column names
-            df = self._standardize_columns(df)
-            
-            return df
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching CapitolTrades data: {e}")
-            print("Falling back to sample data.")
+        
+        if df.empty:
+            logger.warning("No data received from CapitolTrades API. Using sample data.")
             return self._get_sample_data()
+        
+        return df
+    
+    def get_trades_range(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """
+        Fetch trades for a date range, returning an empty DataFrame when the
+        API has nothing for it
+        """
+        url = f"{self.base_url}/trades"
+        params = {
+            "start_date": start_date.strftime("%Y-%m-%d"),
+            "end_date": end_date.strftime("%Y-%m-%d"),
+            "limit": 1000  # Adjust based on API limits
+        }
+        
+        response = self.session.get(url, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if not data or 'data' not in data:
+            return pd.DataFrame()
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(data['data'])
+        
+        # Standardize column names
+        return self._standardize_columns(df)
     
     def get_holdings(self, quarter_end_date: str = None) -> pd.DataFrame:
         """
         Get current congressional holdings from CapitolTrades
         """
         if not self.api_key:
-            print("No CapitolTrades API key provided. Using sample holdings data.")
+            logger.info("No CapitolTrades API key provided. Using sample holdings data.")
             return self._get_sample_holdings_data()
         
         if not quarter_end_date:
@@ -98,7 +125,7 @@ class CapitolTradesAPI:
             data = response.json()
             
             if not data or 'data' not in data:
-                print("No holdings data received from CapitolTrades API. Using sample data.")
+                logger.warning("No holdings data received from CapitolTrades API. Using sample data.")
                 return self._get_sample_holdings_data()
             
             # Convert to DataFrame
@@ -110,8 +137,7 @@ class CapitolTradesAPI:
             return df
             
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching CapitolTrades holdings: {e}")
-            print("Falling back to sample holdings data.")
+            logger.error("Error fetching CapitolTrades holdings: %s. Falling back to sample holdings data.", e)
             return self._get_sample_holdings_data()
     
     def _standardize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -121,6 +147,7 @@ class CapitolTradesAPI:
             'company_name': 'company',
             'representative': 'representative',
             'transaction_date': 'transaction_date',
+            'disclosure_date': 'disclosure_date',
             'transaction_type': 'transaction_type',
             'amount': 'dollar_amount',
             'chamber': 'chamber',
@@ -231,6 +258,7 @@ class CapitolTradesAPI:
 
 def main():
     """Test the CapitolTrades integration"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # Show sample-data notices
     print("🧪 Testing CapitolTrades API Integration")
     print("=" * 50)
     
@@ -6,6 +6,78 @@ QUIVERQUANT_API_KEY = ""  # Add your API key here
 # Index Configuration
 DEFAULT_DAYS_BACK = 100  # Number of days to look back for trades
 TOP_N_CONSTITUENTS = 10  # Number of top stocks to include in index
+COPY_FREE_PIPELINE = True  # Skip defensive frame copies once copy-on-write is on (pandas 3, or enable_copy_on_write() at startup)
+
+# Upstream Fetch Configuration
+MAX_FETCH_WORKERS = 4  # Concurrent requests sharing one pooled session
+REQUEST_TIMEOUT_SECONDS = 30  # Per-request timeout for upstream APIs
+FETCH_SLICE_DAYS = 0  # Split trade windows into N-day sub-requests (0 = one request per chamber)
+
+# Local Trade Store Configuration
+USE_TRADE_STORE = False  # Sync trades incrementally into a local store between runs
+TRADE_STORE_DIR = "data/trades"  # Month-partitioned Parquet trades plus the high-water mark
+USE_HOLDINGS_STORE = False  # Keep quarter holdings snapshots locally between runs
+HOLDINGS_STORE_DIR = "data/holdings"  # Quarter-partitioned Parquet holdings snapshots
+HOLDINGS_SETTLE_DAYS = 120  # A stored quarter fetched sooner than this after quarter end is refetched (late filings)
+HOLDINGS_REFRESH_HOURS = 24  # Until then, a stored quarter is reused for this long between refetches
+SYNC_OVERLAP_DAYS = 1  # Each sync re-fetches this many days of trade dates before the high-water mark
+LATE_FILING_SWEEP_DAYS = 60  # The late-filing sweep re-fetches this many: trades are disclosed up to 45 days (late filers: longer) after they are made
+LATE_FILING_SWEEP_HOURS = 24  # A sync runs the late-filing sweep when the last one is older than this
+INCREMENTAL_AGGREGATION = True  # With the trade store, slide running totals instead of regrouping the window
+USE_PREFIX_INDEX = True  # With the trade store, answer arbitrary date ranges from a per-ticker cumulative-dollar index
+HISTORY_DIR = "data/history"  # Daily index history written by backfill_history.py
+
+# API Result Cache Configuration
+CACHE_BACKEND = "memory"  # "memory", or add a shared tier with "file" or "redis"
+CACHE_TTL_SECONDS = 900  # How long a computed index response stays fresh
+CACHE_MAX_ENTRIES = 128  # LRU bound on cached parameter combinations
+CACHE_DIR = "data/cache"  # Directory for the file-based shared tier
+CACHE_REDIS_URL = "redis://localhost:6379/0"  # Connection URL for the Redis shared tier
+
+# Background Refresh Configuration (long-running servers only)
+BACKGROUND_REFRESH_ENABLED = False  # Serve snapshots recomputed by a background thread
+REFRESH_INTERVAL_SECONDS = 3600  # Recompute snapshots at least this often
+REFRESH_POLL_SECONDS = 60  # How often to check for due snapshots or new upstream data
+REFRESH_DAYS_BACK = [30, 60, 100, 180]  # Congress Buys windows kept warm (dashboard options)
+REFRESH_QUARTER_ENDS = ["2024-12-31", "2024-09-30", "2024-06-30", "2024-03-31"]  # Quarters kept warm besides the latest (dashboard options)
+
+# Instrumentation Configuration
+METRICS_ENABLED = True  # Time pipeline stages and upstream calls (structured logs + /api/metrics)
+LOG_LEVEL = "INFO"  # Level for the app's logs; stage and HTTP events are logged at INFO
+PROFILING_ENABLED = False  # Honor per-request profiling (X-Profile header or ?profile= flag)
+PROFILING_TOKEN = ""  # The profiling flag must equal this token; profiling stays off while it is empty
+PROFILE_DIR = "data/profiles"  # Saved request profiles (JSON report plus raw .prof)
+PROFILE_MAX_SAVED = 50  # Saved profiles beyond this many are deleted, oldest first
+
+# HTTP Caching and Compression Configuration
+API_CACHE_CONTROL = "no-cache"  # Computed API responses: clients revalidate with If-None-Match and usually get a 304
+COMPRESSION_MIN_BYTES = 500  # Smaller bodies are sent uncompressed
+GZIP_LEVEL = 6  # gzip compression level (1 fastest - 9 smallest)
+BROTLI_QUALITY = 5  # brotli quality (0 fastest - 11 smallest), used when the brotli package is installed
+
+# Export Configuration (streamed trade and holdings exports)
+EXPORT_CHUNK_ROWS = 50000  # Rows per streamed CSV chunk or Parquet row group
+
+# Published Snapshot Configuration (static JSON for CDN and serverless serving)
+SNAPSHOT_DIR = "snapshots"  # Versions published by snapshots.py (deployed with the app or synced to a CDN)
+SERVE_SNAPSHOTS = False  # Answer API requests from the published snapshot when one matches
+SNAPSHOT_ONLY = False  # Serve published snapshots only; never import the index modules or pandas
+SNAPSHOT_KEEP_VERSIONS = 3  # Published versions kept on disk, so recently handed-out URLs keep working
+SNAPSHOT_FILE_CACHE_CONTROL = "public, max-age=31536000, immutable"  # Content-hashed snapshot files
+SNAPSHOT_API_CACHE_CONTROL = "public, max-age=300, s-maxage=3600, stale-while-revalidate=86400"  # API responses and current.json
+
+# Price Provider Configuration
+PRICE_PROVIDER = "yfinance"  # "yfinance" for live prices, "file" for an offline price file
+PRICE_FILE = "data/prices.csv"  # CSV (ticker,price) or JSON used by the "file" provider
+PRICE_BATCH_SIZE = 200  # Tickers per multi-ticker yfinance download
+PRICE_CACHE_FILE = "data/price_cache.sqlite"  # Persistent (ticker, as_of_date) price cache ("" disables)
+INTRADAY_PRICE_TTL_SECONDS = 300  # Today's quotes are refetched after this; past closes never expire
+MARKET_CLOSE_UTC_HOUR = 21  # Cached prices fetched before this hour (UTC) on their as_of date are intraday quotes, not closes
+
+# Benchmark Configuration (benchmark.py)
+BENCHMARK_SIZES = [10000, 100000, 1000000]  # Synthetic trade counts per run (holdings: a tenth of these)
+BENCHMARK_OUTPUT_FILE = "data/benchmarks/latest.json"  # Where each run's per-stage results are saved
+BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Fail when a stage is this fraction slower or larger than the baseline
 
 # Dollar Range Mappings (midpoints)
 DOLLAR_RANGES = {
@@ -1,10 +1,33 @@
 import pandas as pd
 import requests
-import yfinance as yf
 from datetime import datetime, timedelta
 import json
+import logging
 from typing import Dict, List, Tuple
 import re
+import numpy as np
+
+from quiver_client import QuiverQuantClient
+from trade_store import (TradeStore, copy_on_write_enabled, enable_copy_on_write, get_date_column, known_as_of,
+                         late_filing_sweep_due, normalize_trades)
+from single_flight import SingleFlight
+from price_providers import PriceProvider, default_price_provider
+from sliding_window import SlidingWindowAggregator
+from amount_ranges import parse_amount_ranges
+from prefix_index import index_for_store, most_frequent_names, top_n_positions
+from metrics import stage
+import config
+
+# Columns the index pipeline reads from the local trade store
+PIPELINE_COLUMNS = ["transaction_id", "ticker", "company", "transaction_type", "amount", "dollar_amount"]
+
+# Coalesces concurrent identical price lookups across index instances
+PRICE_FLIGHT = SingleFlight()
+
+# Pipeline label for stage metrics
+PIPELINE = "congress_buys"
+
+logger = logging.getLogger("congress_indexes.congress_buys")
 
 class CongressBuysIndex:
     """
@@ -14,6 +37,11 @@ class CongressBuysIndex:
     def __init__(self):
         self.base_url = "https://api.quiverquant.com/beta"
         self.api_key = None  # Will be set by user
+        self.client = None
+        self.trade_store = None  # Optional local TradeStore for incremental sync
+        self.price_provider = None  # Defaults to config.PRICE_PROVIDER on first use
+        # Skip defensive copies between pipeline steps (only safe once copy-on-write is on)
+        self.copy_free = config.COPY_FREE_PIPELINE and copy_on_write_enabled()
         self.dollar_ranges = {
             "$1,001-$15,000": 8000.5,
             "$15,001-$50,000": 32500.5,
@@ -30,62 +58,65 @@ class CongressBuysIndex:
     def set_api_key(self, api_key: str):
         """Set the QuiverQuant API key"""
         self.api_key = api_key
+        self.client = None
+    
+    def _get_client(self) -> QuiverQuantClient:
+        """Return the shared QuiverQuant client, creating it on first use"""
+        if self.client is None:
+            self.client = QuiverQuantClient(self.api_key, base_url=self.base_url)
+        return self.client
     
-    def get_congressional_trades(self, days_back: int = 100) -> pd.DataFrame:
+    def set_trade_store(self, trade_store: TradeStore):
+        """Sync trades incrementally into a local TradeStore instead of refetching the full window"""
+        self.trade_store = trade_store
+    
+    def get_congressional_trades(self, days_back: int = 100, end_date: datetime = None,
+                                 as_of: datetime = None) -> pd.DataFrame:
         """
-        Fetch congressional stock trades from QuiverQuant API
+        Fetch congressional stock trades from QuiverQuant API for the days_back
+        days ending on end_date (default: as_of, else now). With as_of, only
+        trades disclosed by that date are returned, as they were known then.
         """
         if not self.api_key:
-            print("No API key provided. Using sample data for demonstration.")
+            logger.info("No API key provided. Using sample data for demonstration.")
             return self._get_sample_data()
         
         # Calculate date range
-        end_date = datetime.now()
+        end_date = end_date or as_of or datetime.now()
         start_date = end_date - timedelta(days=days_back)
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Fetch House trades
-        house_url = f"{self.base_url}/congresstrading/house"
-        house_params = {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d")
-        }
+        if self.trade_store is not None:
+            self._sync_trade_store(start_date, end_date)
+            df = self.trade_store.get_trades(start_date, end_date, columns=PIPELINE_COLUMNS, as_of=as_of)
+        else:
+            df = self._fetch_trades_range(start_date, end_date)
+            if as_of is not None and not df.empty:
+                df = known_as_of(df, as_of)
         
-        try:
-            house_response = requests.get(house_url, headers=headers, params=house_params)
-            house_response.raise_for_status()
-            house_data = house_response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching House data: {e}")
-            house_data = []
-        
-        # Fetch Senate trades
-        senate_url = f"{self.base_url}/congresstrading/senate"
-        senate_params = {
-            "start_date": start_date.strftime("%Y-%m-%d"),
-            "end_date": end_date.strftime("%Y-%m-%d")
-        }
+        if df.empty:
+            logger.warning("No data received from API. Using sample data for demonstration.")
+            return self._get_sample_data()
         
+        return df
+    
+    def _sync_trade_store(self, start_date: datetime, end_date: datetime):
+        """
+        Only fetch trades disclosed since the last sync into the local store.
+        A failed sync leaves the high-water mark untouched so the delta is retried.
+        """
         try:
-            senate_response = requests.get(senate_url, headers=headers, params=senate_params)
-            senate_response.raise_for_status()
-            senate_data = senate_response.json()
+            new_count = self.trade_store.sync(self._fetch_trades_range, start_date, end_date)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching Senate data: {e}")
-            senate_data = []
-        
-        # Combine data
-        all_data = house_data + senate_data
-        
-        if not all_data:
-            print("No data received from API. Using sample data for demonstration.")
-            return self._get_sample_data()
-        
-        return pd.DataFrame(all_data)
+            logger.error("Error syncing trades: %s", e)
+            new_count = 0
+        logger.info("Synced %d new trades into local trade store", new_count)
+    
+    def _fetch_trades_range(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """Fetch House and Senate trades for a date range concurrently over one pooled session"""
+        all_data = self._get_client().fetch_chambers({}, start_date=start_date, end_date=end_date,
+                                                     raise_errors=self.trade_store is not None)
+        # Categorical text columns and typed dates/amounts from the start
+        return normalize_trades(pd.DataFrame(all_data))
     
     def _get_sample_data(self) -> pd.DataFrame:
         """Generate sample data for demonstration purposes"""
@@ -174,37 +205,97 @@ class CongressBuysIndex:
         ]
         return pd.DataFrame(sample_data)
     
+    def _own(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Defensive copy between steps, skipped in copy-free mode (steps never mutate their input)"""
+        return df if self.copy_free else df.copy()
+    
     def filter_buys_only(self, df: pd.DataFrame) -> pd.DataFrame:
         """Filter to only include buy transactions"""
-        return df[df['transaction_type'].str.lower() == 'buy'].copy()
+        transaction_types = df['transaction_type']
+        if isinstance(transaction_types.dtype, pd.CategoricalDtype):
+            # Lowercase each distinct category once instead of every row's string
+            buy_codes = np.flatnonzero(transaction_types.cat.categories.str.lower() == 'buy')
+            is_buy = np.isin(transaction_types.cat.codes.to_numpy(), buy_codes)
+        else:
+            is_buy = transaction_types.str.lower() == 'buy'
+        return self._own(df[is_buy])
     
     def deduplicate_trades(self, df: pd.DataFrame) -> pd.DataFrame:
         """Remove duplicate trades based on transaction_id"""
-        return df.drop_duplicates(subset=['transaction_id']).copy()
+        return self._own(df.drop_duplicates(subset=['transaction_id']))
     
     def convert_dollar_ranges_to_midpoints(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Convert dollar ranges to midpoint values"""
-        df = df.copy()
-        df['dollar_amount'] = df['amount'].map(self.dollar_ranges)
+        """
+        Convert reported dollar ranges to low/midpoint/high values
+        (dollar_low, dollar_amount, dollar_high). Formatting variants and
+        numeric amounts (e.g. CapitolTrades) are parsed rather than looked up.
+        """
+        source = 'amount' if 'amount' in df.columns else 'dollar_amount'
+        bounds = parse_amount_ranges(df[source])
+        df = self._own(df).assign(**{column: bounds[column] for column in bounds.columns})
         
         # Handle any unmapped ranges
         unmapped = df[df['dollar_amount'].isna()]
         if not unmapped.empty:
-            print(f"Warning: Found unmapped dollar ranges: {unmapped['amount'].unique()}")
+            logger.warning("Found unmapped dollar ranges: %s", unmapped[source].unique())
         
         return df
     
+    def prepare_buy_trades(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Filter to buys, deduplicate and convert dollar ranges in one call"""
+        return self.convert_dollar_ranges_to_midpoints(self.deduplicate_trades(self.filter_buys_only(df)))
+    
     def aggregate_by_ticker(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Sum all buys by ticker"""
-        return df.groupby(['ticker', 'company'])['dollar_amount'].sum().reset_index()
+        """Sum all buys by ticker (and the low/high bounds when present), named by most_frequent_names"""
+        columns = [column for column in ['dollar_low', 'dollar_amount', 'dollar_high'] if column in df.columns]
+        totals = df.groupby('ticker', observed=True)[columns].sum()
+        names = most_frequent_names(df['ticker'].astype(str).to_numpy(), df['company'].to_numpy())
+        totals.insert(0, 'company', names.reindex(totals.index.astype(str)).astype(str).to_numpy())
+        return totals.reset_index()
+    
+    def aggregate_top_n(self, df: pd.DataFrame, n: int = None) -> pd.DataFrame:
+        """
+        Fused aggregation and top-N selection. Dollars are summed per ticker
+        code with bincount, only the n largest tickers are located (partial
+        selection, no full sort) and company names are resolved afterwards for
+        those tickers alone (most_frequent_names).
+        Returns the top n rows largest first, shaped like aggregate_by_ticker.
+        """
+        n = n or config.TOP_N_CONSTITUENTS
+        value_columns = [column for column in ['dollar_low', 'dollar_amount', 'dollar_high'] if column in df.columns]
+        if isinstance(df['ticker'].dtype, pd.CategoricalDtype):
+            # Categorical tickers already carry integer codes (in groupby's category order)
+            codes, tickers = df['ticker'].cat.codes.to_numpy(), df['ticker'].cat.categories
+        else:
+            codes, tickers = pd.factorize(df['ticker'], sort=True)
+        valid = codes >= 0
+        
+        totals = {column: np.bincount(codes[valid], minlength=len(tickers),
+                                      weights=np.nan_to_num(df[column].to_numpy(dtype='float64')[valid]))
+                  for column in value_columns}
+        top = top_n_positions(totals['dollar_amount'], n)
+        
+        # Name resolution touches only the rows of the selected tickers
+        selected = np.zeros(len(tickers) + 1, dtype=bool)
+        selected[top] = True
+        rows = np.flatnonzero(selected[codes])
+        names = most_frequent_names(codes[rows], df['company'].take(rows).to_numpy())
+        
+        result = pd.DataFrame({'ticker': np.asarray(tickers, dtype=object)[top],
+                               'company': names.reindex(top).astype(str).to_numpy()})
+        for column in value_columns:
+            result[column] = totals[column][top]
+        return result
     
-    def select_top_10(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Select top 10 tickers by total dollars purchased"""
-        return df.nlargest(10, 'dollar_amount').copy()
+    def select_top_n(self, df: pd.DataFrame, n: int = None) -> pd.DataFrame:
+        """Select the top N (config.TOP_N_CONSTITUENTS) tickers by total dollars purchased"""
+        return self._own(df.nlargest(n or config.TOP_N_CONSTITUENTS, 'dollar_amount'))
     
     def calculate_weights(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate pro-rata weights based on dollar amounts"""
-        df = df.copy()
+        if df.empty:
+            return self._own(df).assign(weight=pd.Series(dtype='float64'))
+        
         total_dollars = df['dollar_amount'].sum()
         
         # Calculate raw weights
@@ -221,59 +312,188 @@ class CongressBuysIndex:
             adjustment = 100.0 - total_rounded
             rounded_weights[max_idx] += adjustment
         
-        df['weight'] = rounded_weights
-        return df
+        return self._own(df).assign(weight=rounded_weights)
     
-    def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
-        """Get current stock prices for validation"""
-        prices = {}
-        for ticker in tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                current_price = stock.info.get('regularMarketPrice', 0)
-                prices[ticker] = current_price
-            except Exception as e:
-                print(f"Error getting price for {ticker}: {e}")
-                prices[ticker] = 0
-        return prices
+    def set_price_provider(self, price_provider: PriceProvider):
+        """Use a specific price provider (e.g. an offline FilePriceProvider in tests)"""
+        self.price_provider = price_provider
     
-    def generate_index(self, days_back: int = 100) -> pd.DataFrame:
-        """Generate the complete Congress Buys index"""
-        print("Step 1: Fetching congressional trades...")
-        df = self.get_congressional_trades(days_back)
+    def get_current_prices(self, tickers: List[str], as_of: str = None) -> Dict[str, float]:
+        """Get stock prices for validation (closes on or before as_of when given)"""
+        if self.price_provider is None:
+            self.price_provider = default_price_provider()
         
-        print("Step 2: Filtering buy transactions only...")
-        df = self.filter_buys_only(df)
+        # Identical concurrent lookups (e.g. parallel API requests) share one batch fetch
+        key = tuple(sorted(set(tickers)))
+        prices = PRICE_FLIGHT.do((id(self.price_provider), key, as_of),
+                                 lambda: self.price_provider.get_prices(key, as_of=as_of))
+        return {ticker: prices.get(ticker, 0) for ticker in tickers}
+    
+    def generate_index(self, days_back: int = 100, end_date: datetime = None,
+                       as_of: datetime = None) -> pd.DataFrame:
+        """
+        Generate the complete Congress Buys index for the days_back days ending
+        on end_date. With an as_of knowledge date the index is rebuilt from
+        only what had been disclosed by then (point-in-time).
+        """
+        if as_of is None and self.api_key and self.trade_store is not None and config.USE_PREFIX_INDEX:
+            return self.generate_index_from_prefix(days_back, end_date)
         
-        print("Step 3: Deduplicating trades...")
-        df = self.deduplicate_trades(df)
+        with stage(PIPELINE, "fetch_trades") as step:
+            df = step.output(self.get_congressional_trades(days_back, end_date, as_of))
         
-        print("Step 4: Converting dollar ranges to midpoints...")
-        df = self.convert_dollar_ranges_to_midpoints(df)
+        with stage(PIPELINE, "filter_buys_only", df) as step:
+            df = step.output(self.filter_buys_only(df))
         
-        print("Step 5: Aggregating by ticker...")
-        df = self.aggregate_by_ticker(df)
+        with stage(PIPELINE, "deduplicate_trades", df) as step:
+            df = step.output(self.deduplicate_trades(df))
         
-        print("Step 6: Selecting top 10 tickers...")
-        df = self.select_top_10(df)
+        with stage(PIPELINE, "convert_dollar_ranges", df) as step:
+            df = step.output(self.convert_dollar_ranges_to_midpoints(df))
         
-        print("Step 7: Calculating weights...")
-        df = self.calculate_weights(df)
+        with stage(PIPELINE, "aggregate_top_n", df) as step:
+            df = step.output(self.aggregate_top_n(df))
         
-        # Sort by weight descending
-        df = df.sort_values('weight', ascending=False).reset_index(drop=True)
+        with stage(PIPELINE, "calculate_weights", df) as step:
+            df = step.output(self.calculate_weights(df))
         
+        # Already ranked by dollars purchased, which orders the weights too
         return df
     
+    def generate_index_from_prefix(self, days_back: int = 100, end_date: datetime = None) -> pd.DataFrame:
+        """
+        Generate the index from a prefix-sum index over the local trade store.
+        Per-ticker totals for any date range are two array lookups, so arbitrary
+        (including historical) windows cost the same as the default one.
+        """
+        end_date = end_date or datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        
+        with stage(PIPELINE, "sync_trade_store"):
+            self._sync_trade_store(start_date, end_date)
+        
+        with stage(PIPELINE, "load_prefix_index"):
+            prefix_index = index_for_store(self.trade_store, self.prepare_buy_trades)
+        
+        with stage(PIPELINE, "select_top_n") as step:
+            if prefix_index is None:
+                logger.warning("No trades in local trade store. Using sample data for demonstration.")
+                df = step.output(self.aggregate_top_n(self.prepare_buy_trades(self._get_sample_data())))
+            else:
+                df = step.output(prefix_index.top_n_frame(start_date, end_date, config.TOP_N_CONSTITUENTS))
+        
+        with stage(PIPELINE, "calculate_weights", df) as step:
+            return step.output(self.calculate_weights(df))
+    
+    def generate_multi_window_index(self, windows: List[int], end_date: datetime = None) -> Dict[int, pd.DataFrame]:
+        """
+        Generate the index for several trailing windows (e.g. [30, 60, 100, 180])
+        from one fetch of the longest window. Each window is aggregate_top_n over
+        the trades bucketed into it, so it matches generate_index for that window.
+        """
+        windows = sorted(set(windows))
+        end_date = pd.Timestamp(end_date or datetime.now())
+        
+        with stage(PIPELINE, "fetch_trades") as step:
+            step.annotate(days_back=windows[-1])
+            df = step.output(self.get_congressional_trades(windows[-1], end_date=end_date.to_pydatetime()))
+        
+        with stage(PIPELINE, "prepare_buy_trades", df) as step:
+            df = step.output(self.convert_dollar_ranges_to_midpoints(self.deduplicate_trades(self.filter_buys_only(df))))
+        
+        with stage(PIPELINE, "bucket_windows", df) as step:
+            date_column = get_date_column(df)
+            if self.api_key and date_column is not None:
+                # Bucket each trade into the shortest window containing it; a window
+                # then holds the trades of its bucket and every shorter one
+                starts = np.array([(end_date - timedelta(days=days)).normalize().value for days in windows])
+                trade_dates = pd.to_datetime(df[date_column]).to_numpy(dtype='datetime64[ns]').astype('int64')
+                bucket = len(windows) - np.searchsorted(starts[::-1], trade_dates, side='right')
+                in_range = (bucket < len(windows)) & (trade_dates <= end_date.value)
+                df = df[in_range].assign(bucket=bucket[in_range])
+            else:
+                # Sample data is not dated relative to today, so like generate_index
+                # every sample trade counts towards every window
+                df = df.assign(bucket=0)
+            step.output(df)
+        
+        with stage(PIPELINE, "aggregate_top_n_per_window", df) as step:
+            buckets = df['bucket'].to_numpy()
+            results = {days: self.calculate_weights(self.aggregate_top_n(df[buckets <= position]))
+                       for position, days in enumerate(windows)}
+            step.output(results)
+        
+        return results
+    
+    def generate_index_incremental(self, aggregator: SlidingWindowAggregator,
+                                   end_date: datetime = None) -> pd.DataFrame:
+        """
+        Generate the index from a long-lived SlidingWindowAggregator. Only trades
+        disclosed since the aggregator's last update are fetched and processed;
+        the window is then slid to end_date (default: now).
+        """
+        end_date = end_date or datetime.now()
+        # Late filers disclose trades dated well before the newest one seen. Deltas
+        # re-fetch a short overlap, and the disclosure lag only on a late-filing
+        # sweep; add_trades drops ids it already has unchanged and replaces amended ones
+        
+        with stage(PIPELINE, "fetch_trades") as step:
+            if not self.api_key or aggregator.latest_trade_date is None:
+                df = self.get_congressional_trades(aggregator.days_back)
+                aggregator.last_sweep = datetime.now()  # The whole window was fetched
+            elif self.trade_store is not None:
+                self.get_congressional_trades(aggregator.days_back)  # Syncs the delta (or sweep) into the store
+                # A sweep may ingest trades whose disclosure date is up to one sweep interval old
+                known_since = aggregator.window_end - timedelta(days=config.SYNC_OVERLAP_DAYS,
+                                                                hours=config.LATE_FILING_SWEEP_HOURS)
+                df = self.trade_store.get_trades(end_date - timedelta(days=aggregator.days_back), end_date,
+                                                 columns=PIPELINE_COLUMNS, known_since=known_since)
+            else:
+                sweep = late_filing_sweep_due(aggregator.last_sweep)
+                overlap = timedelta(days=config.LATE_FILING_SWEEP_DAYS if sweep else config.SYNC_OVERLAP_DAYS)
+                df = self._fetch_trades_range(aggregator.latest_trade_date.to_pydatetime() - overlap, end_date)
+                if sweep:
+                    aggregator.last_sweep = datetime.now()
+                step.annotate(sweep=sweep)
+            step.output(df)
+        
+        with stage(PIPELINE, "prepare_buy_trades", df) as step:
+            delta_ids = set(df['transaction_id'].astype(str)) if not df.empty else set()
+            if not df.empty:
+                df = self.convert_dollar_ranges_to_midpoints(self.deduplicate_trades(self.filter_buys_only(df)))
+            step.output(df)
+        
+        if not self.api_key:
+            # Sample data is not dated relative to today, so like generate_index
+            # every sample trade counts instead of being slid out of the window
+            with stage(PIPELINE, "select_top_n", df) as step:
+                df = step.output(self.aggregate_top_n(df))
+        else:
+            with stage(PIPELINE, "slide_window", df) as step:
+                # Trades in the delta that are no longer buys (amended into a sale) leave the totals
+                buy_ids = set(df['transaction_id'].astype(str)) if not df.empty else set()
+                removed = aggregator.remove_trades(delta_ids - buy_ids)
+                aggregator.add_trades(df)
+                admitted, evicted = aggregator.advance(end_date)
+                step.annotate(admitted=admitted, evicted=evicted, removed=removed)
+            
+            with stage(PIPELINE, "select_top_n") as step:
+                df = step.output(aggregator.top_n_frame(config.TOP_N_CONSTITUENTS))
+        
+        with stage(PIPELINE, "calculate_weights", df) as step:
+            df = step.output(self.calculate_weights(df))
+        
+        return df.sort_values('weight', ascending=False).reset_index(drop=True)
+    
     def print_methodology(self):
         """Print the index methodology"""
-        methodology = """
+        methodology = f"""
         CONGRESS BUYS EQUITY INDEX - METHODOLOGY
         
         1. Data Window: All STOCK-Act purchase disclosures (House + Senate, including spouses/dependents) 
-           from the last 100 calendar days, excluding sales and short positions.
+           from the last {config.DEFAULT_DAYS_BACK} calendar days, excluding sales and short positions.
         2. Dollar Sizing: Convert reported dollar ranges to midpoints and sum all buys by ticker.
-        3. Constituent Selection: Rank tickers by total dollars purchased and select top 10.
+        3. Constituent Selection: Rank tickers by total dollars purchased and select top {config.TOP_N_CONSTITUENTS}.
         4. Weighting Rule: Weight each stock pro-rata to its share of total dollars purchased.
         5. Output: Table with ticker, company name, and index weight (rounded to 1 decimal place).
         """
@@ -286,10 +506,14 @@ class CongressBuysIndex:
         for range_str, midpoint in self.dollar_ranges.items():
             print(f"{range_str:20} → ${midpoint:>10,.0f}")
         print("\nNote: For ranges above $50M, using conservative estimate of $75M midpoint.")
+        print("Other formats (e.g. '$1,001 - $15,000', 'Over $50,000,000', numeric amounts) are parsed to the same bounds.")
         print("Data gaps: Using sample data if API is unavailable or returns no results.")
 
 def main():
     """Main function to run the Congress Buys index"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # Show per-stage timings
+    if config.COPY_FREE_PIPELINE:
+        enable_copy_on_write()
     index = CongressBuysIndex()
     
     # For demonstration, we'll use sample data
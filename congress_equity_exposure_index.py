@@ -7,12 +7,58 @@ including net positions from buys/sells and options exposure.
 
 import pandas as pd
 import requests
-import yfinance as yf
 from datetime import datetime, timedelta
 import json
+import logging
 from typing import Dict, List, Tuple
 import numpy as np
 
+from quiver_client import QuiverQuantClient
+from trade_store import HOLDINGS_SCHEMA, HoldingsStore, apply_schema, copy_on_write_enabled, enable_copy_on_write
+import config
+from single_flight import SingleFlight
+from price_providers import (PriceProvider, StaticPriceProvider, FallbackPriceProvider,
+                             default_price_provider)
+from metrics import record_cache, stage
+
+# Coalesces concurrent identical price lookups across index instances
+PRICE_FLIGHT = SingleFlight()
+
+# Pipeline label for stage metrics
+PIPELINE = "congress_equity_exposure"
+
+logger = logging.getLogger("congress_indexes.congress_equity_exposure")
+
+# Sample prices used ahead of live lookups to avoid API rate limiting issues
+SAMPLE_PRICES = {
+    "NVDA": 850.00,
+    "AVGO": 1200.00,
+    "MSFT": 400.00,
+    "AAPL": 180.00,
+    "AMZN": 150.00,
+    "GOOGL": 140.00,
+    "META": 450.00,
+    "TSLA": 200.00,
+    "AMD": 120.00,
+    "JPM": 180.00,
+    "JNJ": 160.00,
+    "V": 240.00,
+}
+
+DEFAULT_PRICE = 100.0  # Used when no provider can price a ticker
+
+_sample_then_live = {}
+
+def sample_then_live_price_provider() -> PriceProvider:
+    """Sample prices first, then the configured live provider (shared instance per live provider)"""
+    live_provider = default_price_provider()
+    if id(live_provider) not in _sample_then_live:
+        _sample_then_live[id(live_provider)] = FallbackPriceProvider([
+            StaticPriceProvider(SAMPLE_PRICES),
+            live_provider,
+        ])
+    return _sample_then_live[id(live_provider)]
+
 class CongressEquityExposureIndex:
     """
     Congress Equity Exposure Index - Top 10 stocks most heavily held by Congress
@@ -21,7 +67,12 @@ class CongressEquityExposureIndex:
     def __init__(self):
         self.base_url = "https://api.quiverquant.com/beta"
         self.api_key = None
+        self.client = None
+        self.holdings_store = None  # Optional local HoldingsStore of quarter snapshots
+        self.price_provider = None  # Default: see _default_price_provider
         self.current_prices = {}
+        # Skip defensive copies between pipeline steps (only safe once copy-on-write is on)
+        self.copy_free = config.COPY_FREE_PIPELINE and copy_on_write_enabled()
         
         # Options delta approximations for common scenarios
         self.options_deltas = {
@@ -40,6 +91,17 @@ class CongressEquityExposureIndex:
     def set_api_key(self, api_key: str):
         """Set the QuiverQuant API key"""
         self.api_key = api_key
+        self.client = None
+    
+    def _get_client(self) -> QuiverQuantClient:
+        """Return the shared QuiverQuant client, creating it on first use"""
+        if self.client is None:
+            self.client = QuiverQuantClient(self.api_key, base_url=self.base_url)
+        return self.client
+    
+    def set_holdings_store(self, holdings_store: HoldingsStore):
+        """Persist fetched quarter snapshots and reuse them for completed quarters"""
+        self.holdings_store = holdings_store
     
     def get_congressional_holdings(self, quarter_end_date: str = None) -> pd.DataFrame:
         """
@@ -47,58 +109,38 @@ class CongressEquityExposureIndex:
         Includes both stock holdings and options exposure
         """
         if not self.api_key:
-            print("No API key provided. Using sample holdings data for demonstration.")
+            logger.info("No API key provided. Using sample holdings data for demonstration.")
             return self._get_sample_holdings_data()
         
         # Calculate quarter end date if not provided
         if not quarter_end_date:
             quarter_end_date = self._get_latest_quarter_end()
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Fetch House holdings
-        house_url = f"{self.base_url}/congresstrading/house"
-        house_params = {
+        # Completed quarters only change through late filings, so serve them from
+        # the local store once those have settled (or the snapshot is recent)
+        quarter_closed = pd.Timestamp(quarter_end_date) < pd.Timestamp(datetime.now().date())
+        if self.holdings_store is not None and quarter_closed:
+            if self.holdings_store.is_current(quarter_end_date):
+                record_cache("holdings_store", "hit")
+                return self.holdings_store.get_holdings(quarter_end_date)
+            record_cache("holdings_store", "miss")
+        
+        # Fetch House and Senate holdings concurrently over one pooled session
+        all_data = self._get_client().fetch_chambers({
             "end_date": quarter_end_date,
             "include_holdings": True,
             "include_options": True
-        }
-        
-        try:
-            house_response = requests.get(house_url, headers=headers, params=house_params)
-            house_response.raise_for_status()
-            house_data = house_response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching House holdings: {e}")
-            house_data = []
-        
-        # Fetch Senate holdings
-        senate_url = f"{self.base_url}/congresstrading/senate"
-        senate_params = {
-            "end_date": quarter_end_date,
-            "include_holdings": True,
-            "include_options": True
-        }
-        
-        try:
-            senate_response = requests.get(senate_url, headers=headers, params=senate_params)
-            senate_response.raise_for_status()
-            senate_data = senate_response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching Senate holdings: {e}")
-            senate_data = []
-        
-        # Combine data
-        all_data = house_data + senate_data
+        })
         
         if not all_data:
-            print("No data received from API. Using sample holdings data for demonstration.")
+            logger.warning("No data received from API. Using sample holdings data for demonstration.")
             return self._get_sample_holdings_data()
         
-        return pd.DataFrame(all_data)
+        # Categorical text columns and float64 positions from the start
+        df = apply_schema(pd.DataFrame(all_data), HOLDINGS_SCHEMA)
+        if self.holdings_store is not None:
+            self.holdings_store.save_quarter(quarter_end_date, df)
+        return df
     
     def _get_latest_quarter_end(self) -> str:
         """Get the latest quarter end date"""
@@ -114,6 +156,12 @@ class CongressEquityExposureIndex:
         
         return f"{quarter_end_year}-{quarter_end_month:02d}-{self._get_last_day_of_month(quarter_end_year, quarter_end_month):02d}"
     
+    def _get_valuation_date(self, quarter_end_date: str = None) -> str:
+        """Value completed quarters at their quarter-end close; open quarters at current prices"""
+        if quarter_end_date and pd.Timestamp(quarter_end_date) < pd.Timestamp(datetime.now().date()):
+            return quarter_end_date
+        return None
+    
     def _get_last_day_of_month(self, year: int, month: int) -> int:
         """Get the last day of a given month"""
         if month == 12:
@@ -235,69 +283,65 @@ class CongressEquityExposureIndex:
         ]
         return pd.DataFrame(sample_data)
     
-    def get_current_prices(self, tickers: List[str]) -> Dict[str, float]:
-        """Get current stock prices for valuation"""
-        # Use sample prices to avoid API rate limiting issues
-        sample_prices = {
-            "NVDA": 850.00,
-            "AVGO": 1200.00,
-            "MSFT": 400.00,
-            "AAPL": 180.00,
-            "AMZN": 150.00,
-            "GOOGL": 140.00,
-            "META": 450.00,
-            "TSLA": 200.00,
-            "AMD": 120.00,
-            "JPM": 180.00,
-            "JNJ": 160.00,
-            "V": 240.00,
-        }
-        
-        prices = {}
-        for ticker in tickers:
-            if ticker in sample_prices:
-                prices[ticker] = sample_prices[ticker]
-            else:
-                # Fallback to API if needed
-                try:
-                    stock = yf.Ticker(ticker)
-                    current_price = stock.info.get('regularMarketPrice', 100.0)  # Default to $100
-                    prices[ticker] = current_price
-                except Exception as e:
-                    print(f"Error getting price for {ticker}: {e}")
-                    prices[ticker] = 100.0  # Default price
-        return prices
+    def set_price_provider(self, price_provider: PriceProvider):
+        """Use a specific price provider (e.g. an offline FilePriceProvider in tests)"""
+        self.price_provider = price_provider
     
-    def calculate_net_holdings(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate net holdings including options exposure"""
-        df = df.copy()
-        
-        # Get current prices for valuation
+    def _default_price_provider(self, as_of: str = None) -> PriceProvider:
+        """
+        Sample prices (then live) for sample data and current valuations. A
+        past close comes from the live provider alone: the fixed sample prices
+        ignore as_of and would value past quarters at today's prices.
+        """
+        if as_of is None or not self.api_key:
+            return sample_then_live_price_provider()
+        return default_price_provider()
+    
+    def get_current_prices(self, tickers: List[str], as_of: str = None) -> Dict[str, float]:
+        """Get stock prices for valuation (closes on or before as_of when given)"""
+        provider = self.price_provider or self._default_price_provider(as_of)
+        
+        # Identical concurrent lookups (e.g. parallel API requests) share one batch fetch
+        key = tuple(sorted(set(tickers)))
+        prices = PRICE_FLIGHT.do((id(provider), key, as_of),
+                                 lambda: provider.get_prices(key, as_of=as_of))
+        return {ticker: prices.get(ticker, DEFAULT_PRICE) for ticker in tickers}
+    
+    def _own(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Defensive copy between steps, skipped in copy-free mode (steps never mutate their input)"""
+        return df if self.copy_free else df.copy()
+    
+    def calculate_net_holdings(self, df: pd.DataFrame, valuation_date: str = None) -> pd.DataFrame:
+        """
+        Calculate net holdings including options exposure. Positions are valued
+        at the close on valuation_date when given, otherwise at current prices.
+        """
+        # Get prices for valuation
         tickers = df['ticker'].unique()
-        self.current_prices = self.get_current_prices(tickers)
+        self.current_prices = self.get_current_prices(tickers, as_of=valuation_date)
         
         # Calculate options exposure
-        df['options_exposure'] = 0.0
         mask = df['options_contracts'].notna() & (df['options_contracts'] > 0)
         
         # Calculate options exposure (contracts * delta * 100 shares per contract)
-        df.loc[mask, 'options_exposure'] = (
-            df.loc[mask, 'options_contracts'] * 
-            df.loc[mask, 'options_delta'] * 
+        options_exposure = (
+            df['options_contracts'] * 
+            df['options_delta'] * 
             100  # 100 shares per options contract
-        )
+        ).where(mask, 0.0).astype(float)
         
         # Calculate total net shares (shares + options exposure)
-        df['net_shares'] = df['shares_held'] + df['options_exposure']
+        net_shares = df['shares_held'] + options_exposure
         
-        # Calculate dollar value
-        df['dollar_value'] = df['net_shares'] * df['ticker'].map(self.current_prices)
+        # Calculate dollar value (prices looked up once per ticker category, not per row)
+        prices = df['ticker'].map(self.current_prices).astype(float)
         
-        return df
+        return self._own(df).assign(options_exposure=options_exposure, net_shares=net_shares,
+                                    dollar_value=net_shares * prices)
     
     def aggregate_by_ticker(self, df: pd.DataFrame) -> pd.DataFrame:
         """Aggregate holdings by ticker across all members"""
-        agg_data = df.groupby(['ticker', 'company']).agg({
+        agg_data = df.groupby(['ticker', 'company'], observed=True).agg({
             'shares_held': 'sum',
             'options_exposure': 'sum',
             'net_shares': 'sum',
@@ -310,18 +354,16 @@ class CongressEquityExposureIndex:
     
     def select_top_10(self, df: pd.DataFrame) -> pd.DataFrame:
         """Select top 10 stocks by dollar value"""
-        return df.nlargest(10, 'dollar_value').copy()
+        return self._own(df.nlargest(10, 'dollar_value'))
     
     def calculate_weights(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate weights proportional to dollar value"""
-        df = df.copy()
         total_value = df['dollar_value'].sum()
         
         # Handle edge case where total_value is zero
         if total_value <= 0:
             # Equal weight distribution
-            df['weight'] = 100.0 / len(df)
-            return df
+            return self._own(df).assign(weight=100.0 / len(df))
         
         # Calculate raw weights
         raw_weights = (df['dollar_value'] / total_value) * 100
@@ -338,25 +380,24 @@ class CongressEquityExposureIndex:
                 adjustment = 100.0 - total_rounded
                 rounded_weights[max_idx] += adjustment
         
-        df['weight'] = rounded_weights
-        return df
+        return self._own(df).assign(weight=rounded_weights)
     
     def generate_index(self, quarter_end_date: str = None) -> pd.DataFrame:
         """Generate the complete Congress Equity Exposure Index"""
-        print("Step 1: Fetching congressional holdings data...")
-        df = self.get_congressional_holdings(quarter_end_date)
+        with stage(PIPELINE, "fetch_holdings") as step:
+            df = step.output(self.get_congressional_holdings(quarter_end_date))
         
-        print("Step 2: Calculating net holdings including options exposure...")
-        df = self.calculate_net_holdings(df)
+        with stage(PIPELINE, "calculate_net_holdings", df) as step:
+            df = step.output(self.calculate_net_holdings(df, valuation_date=self._get_valuation_date(quarter_end_date)))
         
-        print("Step 3: Aggregating holdings by ticker...")
-        df = self.aggregate_by_ticker(df)
+        with stage(PIPELINE, "aggregate_by_ticker", df) as step:
+            df = step.output(self.aggregate_by_ticker(df))
         
-        print("Step 4: Selecting top 10 stocks by dollar value...")
-        df = self.select_top_10(df)
+        with stage(PIPELINE, "select_top_10", df) as step:
+            df = step.output(self.select_top_10(df))
         
-        print("Step 5: Calculating weights...")
-        df = self.calculate_weights(df)
+        with stage(PIPELINE, "calculate_weights", df) as step:
+            df = step.output(self.calculate_weights(df))
         
         # Sort by weight descending
         df = df.sort_values('weight', ascending=False).reset_index(drop=True)
@@ -392,6 +433,9 @@ class CongressEquityExposureIndex:
 
 def main():
     """Main function to run the Congress Equity Exposure Index"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # Show per-stage timings
+    if config.COPY_FREE_PIPELINE:
+        enable_copy_on_write()
     index = CongressEquityExposureIndex()
     
     print("CONGRESS EQUITY EXPOSURE INDEX - TOP 10 HELD")
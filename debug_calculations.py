@@ -59,7 +59,7 @@ def debug_step_by_step():
     # Step 6: Select top 10
     print("\nSTEP 6: Top 10 selection")
     print("-" * 40)
-    df_top10 = index.select_top_10(df_agg)
+    df_top10 = index.select_top_n(df_agg)
     
     print("Top 10 amounts:")
     total_top10 = 0
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Streaming Exports
+Encodes a sequence of DataFrames (one stored month or quarter at a time) as
+one CSV or Parquet byte stream, so the export endpoints can send millions of
+rows while only ever holding one partition in memory. CSV goes out in
+EXPORT_CHUNK_ROWS slices under a single header; Parquet writes each slice as
+a row group and hands over the bytes as soon as they are written, with the
+footer last. Columns are fixed by the first non-empty frame.
+"""
+
+import io
+from typing import Iterable, Iterator
+
+import config
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _slices(frames: Iterable, chunk_rows: int) -> Iterator:
+    """Frames cut into chunk_rows slices; an empty frame only when nothing matched (for the columns)"""
+    empty = None
+    sent = False
+    for frame in frames:
+        if frame.empty:
+            empty = frame
+            continue
+        for start in range(0, len(frame), chunk_rows):
+            sent = True
+            yield frame.iloc[start:start + chunk_rows]
+    if not sent and empty is not None:
+        yield empty
+
+
+def iter_csv(frames: Iterable, chunk_rows: int = None) -> Iterator[bytes]:
+    """CSV bytes for all frames' rows, header first"""
+    columns = None
+    for chunk in _slices(frames, chunk_rows or config.EXPORT_CHUNK_ROWS):
+        if columns is None:
+            columns = list(chunk.columns)
+            yield chunk.to_csv(index=False).encode()
+        else:
+            yield chunk.reindex(columns=columns).to_csv(index=False, header=False).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects what the Parquet writer has written since the last drain"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _conform(table, schema):
+    """Cast a slice to the stream's schema (missing columns as nulls, extra columns dropped)"""
+    import pyarrow as pa
+    columns = [table.column(field.name).cast(field.type) if field.name in table.column_names
+               else pa.nulls(table.num_rows, field.type) for field in schema]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def iter_parquet(frames: Iterable, chunk_rows: int = None) -> Iterator[bytes]:
+    """Parquet file bytes for all frames' rows, one row group per slice"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    for chunk in _slices(frames, chunk_rows or config.EXPORT_CHUNK_ROWS):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            # Categories differ between partitions, so dictionary columns are written as their values
+            schema = pa.schema([pa.field(field.name, field.type.value_type)
+                                if pa.types.is_dictionary(field.type) else field.remove_metadata()
+                                for field in table.schema])
+            writer = pq.ParquetWriter(sink, schema)
+        writer.write_table(_conform(table, schema))
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
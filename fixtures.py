@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Shared Test Fixtures
+Synthetic trades and fake upstreams used by several test scripts, so no test
+module has to import another one
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def make_trades(count, seed=7):
+    """Random priced buy trades over one year"""
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i:03d}" for i in range(40)]
+    ticker = rng.choice(tickers, count)
+    return pd.DataFrame({
+        "transaction_id": [str(i) for i in range(count)],
+        "ticker": ticker,
+        "company": [f"{t} Corp" for t in ticker],
+        "dollar_amount": rng.choice([8000.5, 32500.5, 75000.5, 175000.5], count),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, count), unit="D"),
+    })
+
+
+def make_trade(transaction_id, date):
+    """One upstream NVDA buy disclosure"""
+    return {"transaction_id": transaction_id, "ticker": "NVDA", "company": "NVIDIA Corporation",
+            "transaction_type": "buy", "amount": "$1,001-$15,000", "date": date}
+
+
+class FakeUpstream:
+    """Serves a fixed set of trades and records every requested range"""
+
+    def __init__(self, trades):
+        self.trades = pd.DataFrame(trades)
+        self.requests = []
+
+    def fetch_range(self, start_date, end_date):
+        self.requests.append((start_date, end_date))
+        dates = pd.to_datetime(self.trades["date"])
+        mask = (dates >= pd.Timestamp(start_date).normalize()) & (dates <= pd.Timestamp(end_date))
+        return self.trades[mask].reset_index(drop=True)
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Records calls and sleeps so serial fetching would be measurably slower"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self.lock:
+            self.calls.append((url, dict(params or {}), timeout))
+        time.sleep(self.delay)
+        return FakeResponse([{"url": url, "start_date": (params or {}).get("start_date")}])
+
+    def close(self):
+        pass
@@ -59,21 +59,25 @@ def compare_timeframes():
     
     results = {}
     
+    # One fetch and one aggregation pass for every timeframe
+    index = CongressBuysIndex()
+    try:
+        window_results = index.generate_multi_window_index([days for _, days in timeframes])
+    except Exception as e:
+        print(f"Error comparing timeframes: {e}")
+        return results
+    
     for name, days in timeframes:
         print(f"\n{name.upper()}:")
         print("-" * 40)
         
-        try:
-            df = get_latest_index(days)
-            results[name] = df
-            
-            # Show top 3
-            print("Top 3 positions:")
-            for i, (_, row) in enumerate(df.head(3).iterrows(), 1):
-                print(f"  {i}. {row['ticker']}: {row['weight']:.1f}%")
-                
-        except Exception as e:
-            print(f"Error with {name}: {e}")
+        df = window_results[days]
+        results[name] = df
+        
+        # Show top 3
+        print("Top 3 positions:")
+        for i, (_, row) in enumerate(df.head(3).iterrows(), 1):
+            print(f"  {i}. {row['ticker']}: {row['weight']:.1f}%")
     
     return results
 
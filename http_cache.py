@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+HTTP Validators and Compression
+Conditional responses and response compression for the index APIs. Each
+JSON response carries a weak ETag derived from the index content (without
+the per-computation last_updated stamp) and the data watermark behind it,
+so identical results keep the same ETag across recomputes, workers and
+published snapshots; a matching If-None-Match gets an empty 304. Bodies
+are brotli- (when the optional brotli package is installed) or
+gzip-compressed as the client accepts.
+"""
+
+import functools
+import gzip
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Union
+
+from flask import Response
+
+import config
+from serialization import dumps
+
+# Payload fields that change on every computation (or read) without the index changing
+VOLATILE_FIELDS = ("last_updated", "staleness_seconds")
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "text/html", "text/plain", "text/csv")
+
+
+def content_digest(payload: Dict) -> str:
+    """Hash of a payload's index content; compute it once per result and keep it alongside"""
+    content = {key: value for key, value in payload.items() if key not in VOLATILE_FIELDS}
+    return hashlib.sha256(dumps(content, sort_keys=True)).hexdigest()
+
+
+def payload_etag(payload: Dict, watermark: Any = None, digest: str = None) -> str:
+    """
+    Stable ETag value for a payload and the data watermark it was computed
+    from. Passing the payload's precomputed content_digest skips serializing it.
+    """
+    digest = digest or content_digest(payload)
+    return hashlib.sha256(dumps([digest, watermark], sort_keys=True)).hexdigest()[:32]
+
+
+def conditional_response(request, body: Union[bytes, Callable[[], bytes]], etag: str,
+                         last_modified: Optional[datetime] = None, cache_control: str = None,
+                         headers: Dict = None) -> Response:
+    """
+    A JSON response with validators, turned into a 304 when the client's copy
+    is current. body may be a callable, which a revalidation never calls.
+    """
+    if callable(body):
+        body = b"" if request.if_none_match.contains_weak(etag) else body()
+    response = Response(body, mimetype="application/json", headers=headers)
+    # Weak, because the same entity is sent gzip-, brotli- or un-encoded
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = cache_control or config.API_CACHE_CONTROL
+    return response.make_conditional(request)
+
+
+@functools.lru_cache(maxsize=1)
+def _brotli():
+    """The brotli module when installed, else None"""
+    try:
+        import brotli  # Optional dependency; responses fall back to gzip without it
+    except ImportError:
+        return None
+    return brotli
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """The best encoding both sides support ("br", "gzip" or None) from a parsed Accept-Encoding"""
+    if _brotli() is not None and accept_encodings.quality("br") > 0:
+        return "br"
+    if accept_encodings.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response: Response, accept_encodings) -> Response:
+    """Compress a buffered, compressible 200 body in place (used as an after_request hook)"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None or len(body) < config.COMPRESSION_MIN_BYTES:
+        return response
+
+    if encoding == "br":
+        response.set_data(_brotli().compress(body, quality=config.BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=config.GZIP_LEVEL))
+    response.headers["Content-Encoding"] = encoding
+    return response
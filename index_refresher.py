@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Background Index Refresher
+Recomputes published index payloads on a schedule (or when upstream data
+changes) and atomically swaps in the new snapshot, so API requests are always
+answered immediately from the last good snapshot.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import config
+from http_cache import content_digest
+from result_cache import make_cache_key
+
+logger = logging.getLogger("congress_indexes.index_refresher")
+
+
+class Snapshot:
+    """An immutable computed payload plus the time it was computed and its content digest"""
+
+    def __init__(self, value: Dict, computed_at: float, change_token: Any = None):
+        self.value = value
+        self.computed_at = computed_at
+        self.change_token = change_token
+        self.digest = content_digest(value)
+
+    def age_seconds(self) -> float:
+        return time.time() - self.computed_at
+
+    def to_payload(self) -> Dict:
+        """Payload with last_updated set to the compute time and the current staleness age"""
+        payload = dict(self.value)
+        payload['last_updated'] = datetime.fromtimestamp(self.computed_at).strftime('%Y-%m-%d %H:%M:%S')
+        payload['staleness_seconds'] = round(self.age_seconds(), 1)
+        return payload
+
+
+class IndexRefresher:
+    """
+    Keeps one snapshot per registered (endpoint, params) job fresh from a
+    daemon thread. Readers never block on a recomputation.
+    """
+
+    def __init__(self, interval_seconds: float = None, poll_seconds: float = None,
+                 change_token: Optional[Callable[[], Any]] = None):
+        self.interval_seconds = interval_seconds or config.REFRESH_INTERVAL_SECONDS
+        self.poll_seconds = poll_seconds or config.REFRESH_POLL_SECONDS
+        self.change_token = change_token
+        self.jobs = {}
+        self.errors = {}
+        # Replaced wholesale on every refresh; readers grab the current dict
+        # reference, so they always see a complete set of snapshots
+        self._snapshots = {}
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, endpoint: str, params: Dict, build: Callable[[], Dict]):
+        """Register a payload to keep fresh"""
+        self.jobs[make_cache_key(endpoint, params)] = build
+
+    def get(self, endpoint: str, params: Dict) -> Optional[Snapshot]:
+        """Return the last good snapshot for (endpoint, params), if any"""
+        return self._snapshots.get(make_cache_key(endpoint, params))
+
+    def _current_token(self) -> Any:
+        if self.change_token is None:
+            return None
+        try:
+            return self.change_token()
+        except Exception as e:
+            logger.error("Error reading upstream change token: %s", e)
+            return None
+
+    def needs_refresh(self, key: str, token: Any) -> bool:
+        """A snapshot is refreshed when missing, past the interval or built from older data"""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return True
+        if snapshot.age_seconds() >= self.interval_seconds:
+            return True
+        return token is not None and token != snapshot.change_token
+
+    def refresh(self, key: str):
+        """Recompute one job and swap its snapshot in; on failure keep the old one"""
+        build = self.jobs[key]
+        try:
+            value = build()
+        except Exception as e:
+            logger.error("Error refreshing %s: %s", key, e)
+            self.errors[key] = str(e)
+            return
+
+        # Read the token after building: the build itself may have synced new data
+        snapshot = Snapshot(value, time.time(), self._current_token())
+        with self._swap_lock:
+            snapshots = dict(self._snapshots)
+            snapshots[key] = snapshot
+            self._snapshots = snapshots
+        self.errors.pop(key, None)
+
+    def refresh_due(self):
+        """Refresh every job whose snapshot is missing or stale"""
+        token = self._current_token()
+        for key in list(self.jobs):
+            if self.needs_refresh(key, token):
+                self.refresh(key)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_due()
+            self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        """Start the refresher thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="index-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self) -> Dict:
+        """Snapshot ages and last errors for the health endpoint"""
+        snapshots = self._snapshots
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "snapshots": {key: round(snapshot.age_seconds(), 1) for key, snapshot in snapshots.items()},
+            "errors": dict(self.errors),
+        }
@@ -48,7 +48,7 @@ def manual_calculation_verification():
     print(f"\nTotal manual weight: {total_weight:.1f}%")
     
     # Compare with system calculation
-    df_top10 = index.select_top_10(df_agg)
+    df_top10 = index.select_top_n(df_agg)
     df_weighted = index.calculate_weights(df_top10)
     
     print("\nSystem vs Manual comparison:")
@@ -107,7 +107,7 @@ def verify_nvda_calculation():
     print(f"NVDA weight: {nvda_weight:.3f}% → {nvda_weight_rounded:.1f}%")
     
     # Verify against system
-    df_top10 = index.select_top_10(df_agg)
+    df_top10 = index.select_top_n(df_agg)
     df_weighted = index.calculate_weights(df_top10)
     system_nvda_weight = df_weighted[df_weighted['ticker'] == 'NVDA']['weight'].iloc[0]
     
@@ -151,7 +151,7 @@ def verify_broadcom_calculation():
     print(f"Broadcom weight: {avgo_weight:.3f}% → {avgo_weight_rounded:.1f}%")
     
     # Verify against system
-    df_top10 = index.select_top_10(df_agg)
+    df_top10 = index.select_top_n(df_agg)
     df_weighted = index.calculate_weights(df_top10)
     system_avgo_weight = df_weighted[df_weighted['ticker'] == 'AVGO']['weight'].iloc[0]
     
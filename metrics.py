@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Pipeline and Upstream Instrumentation
+Records duration, input/output row counts and status for every index
+pipeline stage and every upstream HTTP call, plus cache hits and misses.
+Each event is written as one JSON log record on the "congress_indexes.metrics"
+logger and folded into in-process counters and duration histograms, which
+/api/metrics serves in Prometheus text format (per worker process). With
+config.METRICS_ENABLED off, every hook returns after one flag check. A
+profiled request (see request_profiler) also collects its own events.
+"""
+
+import contextvars
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger("congress_indexes.metrics")
+
+# Event list of the request being profiled in this context; None otherwise
+_collector = contextvars.ContextVar("metrics_collector", default=None)
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_HELP = {
+    "congress_stage_duration_seconds": ("histogram", "Wall time of an index pipeline stage"),
+    "congress_stage_rows_in_total": ("counter", "Rows passed into an index pipeline stage"),
+    "congress_stage_rows_out_total": ("counter", "Rows returned by an index pipeline stage"),
+    "congress_http_request_duration_seconds": ("histogram", "Wall time of an upstream HTTP call"),
+    "congress_http_response_rows_total": ("counter", "Records returned by upstream HTTP calls"),
+    "congress_cache_lookups_total": ("counter", "Cache lookups by cache and result"),
+}
+
+
+def _row_count(value: Any) -> Optional[int]:
+    """Rows in a DataFrame, records list or mapping; None for anything without a length"""
+    if value is None or isinstance(value, (str, bytes)):
+        return None
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _log(event: Dict, level: int = logging.INFO):
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps(event, default=str))
+
+
+def _emit(event: Dict):
+    """Log an event when metrics are on and hand it to the profiled request, if any"""
+    if config.METRICS_ENABLED:
+        _log(event)
+    events = _collector.get()
+    if events is not None:
+        events.append(event)
+
+
+def collect_events(events: List[Dict]) -> contextvars.Token:
+    """Also append this context's stage and HTTP events to events (until stop_collecting)"""
+    return _collector.set(events)
+
+
+def stop_collecting(token: contextvars.Token):
+    _collector.reset(token)
+
+
+class MetricsRegistry:
+    """Thread-safe counters and fixed-bucket histograms keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name: str, labels: Tuple[Tuple[str, str], ...], value: float = 1):
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def observe(self, name: str, labels: Tuple[Tuple[str, str], ...], seconds: float):
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = [[0] * len(DURATION_BUCKETS), 0.0, 0]
+            for position, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    histogram[0][position] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(buckets), total, count)
+                          for key, (buckets, total, count) in self._histograms.items()}
+
+        lines = []
+        for name, (metric_type, help_text) in METRIC_HELP.items():
+            series = counters if metric_type == "counter" else histograms
+            keys = sorted(key for key in series if key[0] == name)
+            if not keys:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for key in keys:
+                labels = ",".join(f'{label}="{_escape(value)}"' for label, value in key[1])
+                if metric_type == "counter":
+                    lines.append(f"{name}{{{labels}}} {counters[key]:g}")
+                    continue
+                buckets, total, count = histograms[key]
+                separator = "," if labels else ""
+                for bound, bucket_count in zip(DURATION_BUCKETS, buckets):
+                    lines.append(f'{name}_bucket{{{labels}{separator}le="{bound:g}"}} {bucket_count}')
+                lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class StageTimer:
+    """Context manager behind stage(); records the stage when it exits"""
+
+    __slots__ = ("pipeline", "name", "rows_in", "rows_out", "fields", "started")
+
+    def __init__(self, pipeline: str, name: str, data: Any = None):
+        self.pipeline = pipeline
+        self.name = name
+        self.rows_in = data
+        self.rows_out = None
+        self.fields = None
+        self.started = None
+
+    def __enter__(self) -> "StageTimer":
+        if config.METRICS_ENABLED or _collector.get() is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def output(self, value: Any) -> Any:
+        """Record the stage's result and hand it back"""
+        self.rows_out = value
+        return value
+
+    def annotate(self, **fields):
+        """Extra key/value pairs for the stage's log record"""
+        self.fields = dict(self.fields or {}, **fields)
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.started is None:
+            return False
+        seconds = time.perf_counter() - self.started
+        rows_in, rows_out = _row_count(self.rows_in), _row_count(self.rows_out)
+        event = {"event": "stage", "pipeline": self.pipeline, "stage": self.name,
+                 "duration_ms": round(seconds * 1000, 3), "rows_in": rows_in, "rows_out": rows_out,
+                 "status": "error" if exc_type is not None else "ok"}
+        event.update(self.fields or {})
+        _emit(event)
+
+        if config.METRICS_ENABLED:
+            labels = (("pipeline", self.pipeline), ("stage", self.name))
+            registry.observe("congress_stage_duration_seconds", labels, seconds)
+            if rows_in is not None:
+                registry.inc("congress_stage_rows_in_total", labels, rows_in)
+            if rows_out is not None:
+                registry.inc("congress_stage_rows_out_total", labels, rows_out)
+        return False
+
+
+def stage(pipeline: str, name: str, data: Any = None) -> StageTimer:
+    """
+    Time one pipeline stage:
+
+        with stage("congress_buys", "filter_buys_only", df) as step:
+            df = step.output(self.filter_buys_only(df))
+
+    rows_in is taken from the stage's input data, rows_out from the value
+    passed to output(); annotate() adds extra fields to the stage's log record.
+    """
+    return StageTimer(pipeline, name, data)
+
+
+def record_http(service: str, endpoint: str, status: Any, seconds: float, rows: Any = None):
+    """Record one upstream HTTP call; status is the HTTP status code or "error" """
+    if not config.METRICS_ENABLED and _collector.get() is None:
+        return
+    rows = _row_count(rows)
+    _emit({"event": "http", "service": service, "endpoint": endpoint, "status": status,
+           "duration_ms": round(seconds * 1000, 3), "rows": rows})
+
+    if config.METRICS_ENABLED:
+        labels = (("service", service), ("endpoint", endpoint), ("status", str(status)))
+        registry.observe("congress_http_request_duration_seconds", labels, seconds)
+        if rows is not None:
+            registry.inc("congress_http_response_rows_total", labels[:2], rows)
+
+
+def record_cache(cache: str, result: str, count: int = 1):
+    """Record cache lookups; result is "hit", "miss" or a tier-specific hit such as "shared_hit" """
+    if not config.METRICS_ENABLED or count <= 0:
+        return
+    registry.inc("congress_cache_lookups_total", (("cache", cache), ("result", result)), count)
+    _log({"event": "cache", "cache": cache, "result": result, "count": count}, logging.DEBUG)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Prefix-Sum Index for the Congress Buys Index
+A dense tickers x days array of cumulative purchase dollars built over the
+local trade history. The total bought for any [start, end] range is one
+column subtraction, so top-N tables for arbitrary date ranges come back in
+milliseconds without touching the trades again.
+"""
+
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from metrics import record_cache
+from trade_store import KNOWN_COLUMN, PARTITION_FILE, SUPERSEDED_COLUMN, TradeStore, get_date_column
+
+
+def top_n_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Positions of the n largest positive values, largest first, without sorting
+    the rest. Ties keep the lower position first (like nlargest keep='first').
+    """
+    candidates = np.flatnonzero(values > 0)
+    if len(candidates) > n:
+        # Partial selection: find the n-th largest value, then take everything above
+        # it plus just enough of the ties at it, in position order
+        kth = np.partition(values[candidates], len(candidates) - n)[len(candidates) - n]
+        above = candidates[values[candidates] > kth]
+        at = candidates[values[candidates] == kth][:n - len(above)]
+        candidates = np.sort(np.concatenate([above, at]))
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+def most_frequent_names(keys: np.ndarray, names: np.ndarray) -> pd.Series:
+    """
+    Company name per key (a ticker or ticker code): the name reported most
+    often, ties going to the alphabetically first. Every Congress Buys path
+    names tickers through this, so they agree however the index is computed.
+    """
+    counts = (pd.DataFrame({"key": keys, "name": np.asarray(names, dtype=object)})
+              .value_counts()
+              .reset_index(name="count")
+              .sort_values(["key", "count", "name"], ascending=[True, False, True]))
+    return counts.drop_duplicates("key").set_index("key")["name"]
+
+
+class CumulativeDollarIndex:
+    """
+    cumulative[i, d] = dollars bought in tickers[i] from first_day through
+    first_day + d (inclusive). Memory is 8 bytes per ticker-day.
+    """
+
+    def __init__(self, tickers: np.ndarray, companies: np.ndarray, first_day: pd.Timestamp,
+                 cumulative: np.ndarray):
+        self.tickers = tickers
+        self.companies = companies
+        self.first_day = first_day
+        self.cumulative = cumulative
+
+    @property
+    def num_days(self) -> int:
+        return self.cumulative.shape[1]
+
+    @property
+    def last_day(self) -> pd.Timestamp:
+        return self.first_day + pd.Timedelta(days=self.num_days - 1)
+
+    @classmethod
+    def from_trades(cls, df: pd.DataFrame) -> "CumulativeDollarIndex":
+        """
+        Build from filtered, deduplicated buy trades with ticker, company,
+        dollar_amount and a trade date
+        """
+        date_column = get_date_column(df)
+        names = most_frequent_names(df["ticker"].astype(str).to_numpy(), df["company"].to_numpy())
+        df = df[df["dollar_amount"].notna()]
+        days = pd.to_datetime(df[date_column]).dt.normalize()
+        if df.empty:
+            return cls(np.array([], dtype=object), np.array([], dtype=object),
+                       pd.Timestamp(datetime.now().date()), np.zeros((0, 1)))
+
+        first_day = days.min()
+        num_days = (days.max() - first_day).days + 1
+        codes, tickers = pd.factorize(df["ticker"].astype(str), sort=True)
+        day_index = (days - first_day).dt.days.to_numpy()
+
+        # Daily dollars per ticker in one bincount, then a running sum along days
+        flat = codes * num_days + day_index
+        daily = np.bincount(flat, weights=df["dollar_amount"].to_numpy(dtype="float64"),
+                            minlength=len(tickers) * num_days)
+        cumulative = np.cumsum(daily.reshape(len(tickers), num_days), axis=1)
+
+        companies = names.reindex(tickers).astype(str).to_numpy()
+        return cls(np.asarray(tickers, dtype=object), companies, first_day, cumulative)
+
+    def _day_offset(self, date) -> int:
+        return (pd.Timestamp(date).normalize() - self.first_day).days
+
+    def range_totals(self, start_date, end_date) -> np.ndarray:
+        """Per-ticker dollars bought between start_date and end_date inclusive"""
+        totals = np.zeros(len(self.tickers))
+        start = max(self._day_offset(start_date), 0)
+        end = min(self._day_offset(end_date), self.num_days - 1)
+        if len(self.tickers) == 0 or end < 0 or start > end:
+            return totals
+
+        totals = self.cumulative[:, end].copy()
+        if start > 0:
+            totals -= self.cumulative[:, start - 1]
+        return totals
+
+    def window_totals(self, days: pd.DatetimeIndex, days_back: int) -> np.ndarray:
+        """
+        Per-ticker totals for the days_back window ending on each day, as a
+        tickers x days array (one fancy-indexed subtraction per call)
+        """
+        offsets = (days - self.first_day).days.to_numpy()
+        last = self.num_days - 1
+        end = np.minimum(offsets, last)
+        before_start = np.minimum(offsets - days_back, self.num_days) - 1
+        ends = np.where(end >= 0, self.cumulative[:, np.maximum(end, 0)], 0.0)
+        starts = np.where(before_start >= 0, self.cumulative[:, np.clip(before_start, 0, last)], 0.0)
+        return ends - starts
+
+    def top_n_frame(self, start_date, end_date, n: int) -> pd.DataFrame:
+        """Top-N tickers for a date range, shaped like aggregate_by_ticker output"""
+        totals = self.range_totals(start_date, end_date)
+        order = top_n_positions(totals, n)
+        return pd.DataFrame({
+            "ticker": self.tickers[order],
+            "company": self.companies[order],
+            "dollar_amount": totals[order],
+        })
+
+
+class AsDisclosedWindowIndex:
+    """
+    Point-in-time totals for a fixed trailing window. A trade version counts
+    towards the window ending on day d when its trade date is within the
+    window and it had been disclosed (and not yet amended) by d, so it enters
+    on max(trade date, known_date) and leaves when it ages out of the window
+    or is superseded. Those entries and exits are scattered into a dense
+    tickers x days array whose running sum is every day's window total.
+    """
+
+    def __init__(self, tickers: np.ndarray, companies: np.ndarray, first_day: pd.Timestamp,
+                 totals: np.ndarray, days_back: int):
+        self.tickers = tickers
+        self.companies = companies
+        self.first_day = first_day
+        self.totals = totals
+        self.days_back = days_back
+
+    @classmethod
+    def from_trades(cls, df: pd.DataFrame, days_back: int) -> "AsDisclosedWindowIndex":
+        """Build from every stored version of the filtered, priced buy trades"""
+        date_column = get_date_column(df)
+        df = df[df["dollar_amount"].notna()]
+        if df.empty:
+            return cls(np.array([], dtype=object), np.array([], dtype=object),
+                       pd.Timestamp(datetime.now().date()), np.zeros((0, 1)), days_back)
+
+        trade_days = pd.to_datetime(df[date_column]).dt.normalize()
+        known = pd.to_datetime(df[KNOWN_COLUMN]).fillna(trade_days) if KNOWN_COLUMN in df else trade_days
+        enter = trade_days.where(trade_days >= known, known)
+        leave = trade_days + pd.Timedelta(days=days_back + 1)
+        if SUPERSEDED_COLUMN in df:
+            leave = pd.to_datetime(df[SUPERSEDED_COLUMN]).fillna(leave).clip(upper=leave)
+        live = (leave > enter).to_numpy()
+        df, enter, leave = df[live], enter[live], leave[live]
+
+        first_day = enter.min()
+        num_days = (leave.max() - first_day).days + 1
+        codes, tickers = pd.factorize(df["ticker"].astype(str), sort=True)
+        amounts = df["dollar_amount"].to_numpy(dtype="float64")
+        flat = np.concatenate([codes * num_days + (enter - first_day).dt.days.to_numpy(),
+                               codes * num_days + (leave - first_day).dt.days.to_numpy()])
+        deltas = np.bincount(flat, weights=np.concatenate([amounts, -amounts]),
+                             minlength=len(tickers) * num_days)
+        totals = np.cumsum(deltas.reshape(len(tickers), num_days), axis=1)
+
+        companies = (most_frequent_names(df["ticker"].astype(str).to_numpy(), df["company"].to_numpy())
+                     .reindex(tickers).astype(str).to_numpy())
+        return cls(np.asarray(tickers, dtype=object), companies, first_day, totals, days_back)
+
+    def window_totals(self, days: pd.DatetimeIndex, days_back: int) -> np.ndarray:
+        """Per-ticker point-in-time totals for the window ending on each day"""
+        if days_back != self.days_back:
+            raise ValueError(f"Index was built for a {self.days_back}-day window, not {days_back}")
+        offsets = (days - self.first_day).days.to_numpy()
+        inside = (offsets >= 0) & (offsets < self.totals.shape[1])
+        return np.where(inside, self.totals[:, np.clip(offsets, 0, self.totals.shape[1] - 1)], 0.0)
+
+
+_store_indexes = {}
+_store_indexes_lock = threading.Lock()
+
+
+def index_for_store(store: TradeStore, prepare_trades) -> Optional[CumulativeDollarIndex]:
+    """
+    Return a CumulativeDollarIndex over everything in store, rebuilding it only
+    when a partition has been rewritten since the last build. prepare_trades
+    turns raw stored trades into filtered, deduplicated, priced buys.
+    """
+    # Syncs that find nothing new leave the partitions untouched
+    version = tuple((partition, os.stat(os.path.join(store.path, partition, PARTITION_FILE)).st_mtime_ns)
+                    for partition in store.partitions())
+    with _store_indexes_lock:
+        cached = _store_indexes.get(store.path)
+        if cached is not None and cached[0] == version:
+            record_cache("prefix_index", "hit")
+            return cached[1]
+    record_cache("prefix_index", "miss")
+
+    trades = store.load()
+    if trades.empty:
+        return None
+    prefix_index = CumulativeDollarIndex.from_trades(prepare_trades(trades))
+    with _store_indexes_lock:
+        _store_indexes[store.path] = (version, prefix_index)
+    return prefix_index
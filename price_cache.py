@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Persistent Price Cache
+SQLite-backed cache of prices keyed by (ticker, as_of_date). Quotes for today
+expire after a short TTL; closes for past dates never change and are kept
+forever, so re-pricing a past quarter needs no network calls. A row only counts
+as a close if it was fetched after that date's market close, so an intraday
+quote cached yesterday is refetched rather than served as yesterday's close.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional
+
+import config
+from metrics import record_cache
+from price_providers import PriceProvider
+
+
+def normalize_as_of(as_of: Optional[str]) -> str:
+    """Resolve an as-of date to YYYY-MM-DD, treating missing or future dates as today"""
+    today = date.today().isoformat()
+    if as_of is None:
+        return today
+    as_of = str(as_of)[:10]
+    return min(as_of, today)
+
+
+def market_close_timestamp(as_of: str) -> float:
+    """Unix time of the market close on as_of (YYYY-MM-DD)"""
+    close = datetime.fromisoformat(as_of).replace(hour=config.MARKET_CLOSE_UTC_HOUR, tzinfo=timezone.utc)
+    return close.timestamp()
+
+
+class PriceCache:
+    """Persistent (ticker, as_of_date) → price store"""
+
+    def __init__(self, path: str = None, intraday_ttl_seconds: float = None):
+        self.path = path or config.PRICE_CACHE_FILE
+        self.intraday_ttl_seconds = (intraday_ttl_seconds if intraday_ttl_seconds is not None
+                                     else config.INTRADAY_PRICE_TTL_SECONDS)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS prices ("
+                " ticker TEXT NOT NULL,"
+                " as_of TEXT NOT NULL,"
+                " price REAL NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (ticker, as_of))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps this safe across threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, tickers: Iterable[str], as_of: str) -> Dict[str, float]:
+        """Return cached prices that are still valid for as_of"""
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        historical = as_of < date.today().isoformat()
+        if historical:
+            min_fetched_at = market_close_timestamp(as_of)
+        else:
+            min_fetched_at = time.time() - self.intraday_ttl_seconds
+
+        prices = {}
+        with self._connect() as connection:
+            # Stay under SQLite's bound-parameter limit on large universes
+            for start in range(0, len(tickers), 500):
+                batch = tickers[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT ticker, price FROM prices WHERE as_of = ? AND fetched_at >= ?"
+                    f" AND ticker IN ({placeholders})",
+                    [as_of, min_fetched_at] + batch,
+                ).fetchall()
+                prices.update(rows)
+        return prices
+
+    def set_many(self, prices: Dict[str, float], as_of: str):
+        """Store prices for as_of, replacing any expired or intraday quotes"""
+        if not prices:
+            return
+        fetched_at = time.time()
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO prices (ticker, as_of, price, fetched_at) VALUES (?, ?, ?, ?)",
+                [(ticker, as_of, float(price), fetched_at) for ticker, price in prices.items()],
+            )
+
+
+class CachedPriceProvider(PriceProvider):
+    """Serve prices from a PriceCache, asking the wrapped provider only for misses"""
+
+    def __init__(self, provider: PriceProvider, cache: PriceCache):
+        self.provider = provider
+        self.cache = cache
+
+    def get_prices(self, tickers: Iterable[str], as_of: Optional[str] = None) -> Dict[str, float]:
+        as_of_key = normalize_as_of(as_of)
+        tickers = list(dict.fromkeys(tickers))
+
+        prices = self.cache.get_many(tickers, as_of_key)
+        missing = [ticker for ticker in tickers if ticker not in prices]
+        record_cache("price", "hit", len(tickers) - len(missing))
+        record_cache("price", "miss", len(missing))
+        if missing:
+            historical = as_of_key < date.today().isoformat()
+            fetched = self.provider.get_prices(missing, as_of=as_of_key if historical else None)
+            self.cache.set_many(fetched, as_of_key)
+            prices.update(fetched)
+        return prices
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Price Providers
+Pluggable stock price sources for index valuation. Every provider prices a
+whole batch of tickers at once; tickers it cannot price are simply omitted.
+Passing as_of (YYYY-MM-DD) asks for the close on or before that date instead
+of the latest quote.
+"""
+
+import abc
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+import config
+from metrics import record_http
+
+logger = logging.getLogger("congress_indexes.price_providers")
+
+
+class PriceProvider(abc.ABC):
+    """Base class: price a batch of tickers in one call"""
+
+    @abc.abstractmethod
+    def get_prices(self, tickers: Iterable[str], as_of: Optional[str] = None) -> Dict[str, float]:
+        """Return {ticker: price} for the tickers this provider can price"""
+
+
+class StaticPriceProvider(PriceProvider):
+    """Fixed in-memory prices (sample data and tests); as_of is ignored"""
+
+    def __init__(self, prices: Dict[str, float]):
+        self.prices = dict(prices)
+
+    def get_prices(self, tickers: Iterable[str], as_of: Optional[str] = None) -> Dict[str, float]:
+        return {ticker: self.prices[ticker] for ticker in tickers if ticker in self.prices}
+
+
+class FilePriceProvider(PriceProvider):
+    """
+    Offline prices from a local file: a CSV with ticker and price columns
+    (plus an optional date column for historical closes), or a JSON object
+    mapping ticker to price
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path.endswith(".json"):
+            with open(path) as f:
+                prices = json.load(f)
+            self.prices = pd.DataFrame({"ticker": list(prices), "price": list(prices.values())})
+        else:
+            self.prices = pd.read_csv(path)
+        self.prices["price"] = self.prices["price"].astype(float)
+
+    def get_prices(self, tickers: Iterable[str], as_of: Optional[str] = None) -> Dict[str, float]:
+        df = self.prices[self.prices["ticker"].isin(list(tickers))]
+        if "date" in df.columns:
+            if as_of is not None:
+                df = df[df["date"] <= as_of]
+            df = df.sort_values("date")
+        # Last row per ticker is the latest close on or before as_of
+        return dict(zip(df["ticker"], df["price"]))
+
+
+class YFinancePriceProvider(PriceProvider):
+    """
+    Latest closes from yfinance using multi-ticker downloads, one request per
+    batch of tickers instead of one slow .info call per ticker
+    """
+
+    def __init__(self, batch_size: int = None, period: str = "5d"):
+        self.batch_size = batch_size or config.PRICE_BATCH_SIZE
+        self.period = period
+
+    def get_prices(self, tickers: Iterable[str], as_of: Optional[str] = None) -> Dict[str, float]:
+        import yfinance as yf  # Heavy import, only paid when live prices are needed
+
+        if as_of is not None:
+            # A short window ending on as_of covers weekends and market holidays
+            end = pd.Timestamp(as_of) + timedelta(days=1)
+            window = {"start": (end - timedelta(days=10)).strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d")}
+        else:
+            window = {"period": self.period}
+
+        tickers = sorted(set(tickers))
+        prices = {}
+        for start in range(0, len(tickers), self.batch_size):
+            batch = tickers[start:start + self.batch_size]
+            started = time.perf_counter()
+            try:
+                frame = yf.download(batch, progress=False, threads=True, auto_adjust=False,
+                                    group_by="column", **window)
+            except Exception as e:
+                record_http("yfinance", "download", "error", time.perf_counter() - started)
+                logger.error("Error downloading prices for %d tickers: %s", len(batch), e)
+                continue
+            closes = latest_closes(frame, batch)
+            record_http("yfinance", "download", "ok", time.perf_counter() - started, closes)
+            prices.update(closes)
+        return prices
+
+
+def latest_closes(frame: pd.DataFrame, tickers: List[str]) -> Dict[str, float]:
+    """Extract each ticker's most recent non-missing close from a yfinance download"""
+    if frame is None or frame.empty or "Close" not in frame.columns.get_level_values(0):
+        return {}
+
+    closes = frame["Close"]
+    if isinstance(closes, pd.Series):
+        # Single-ticker downloads come back without a ticker column level
+        closes = closes.to_frame(tickers[0])
+
+    last_valid = closes.ffill().iloc[-1]
+    return {ticker: float(price) for ticker, price in last_valid.items() if pd.notna(price)}
+
+
+class FallbackPriceProvider(PriceProvider):
+    """Ask each provider in turn for the tickers the previous ones could not price"""
+
+    def __init__(self, providers: List[PriceProvider]):
+        self.providers = providers
+
+    def get_prices(self, tickers: Iterable[str], as_of: Optional[str] = None) -> Dict[str, float]:
+        remaining = list(dict.fromkeys(tickers))
+        prices = {}
+        for provider in self.providers:
+            if not remaining:
+                break
+            prices.update(provider.get_prices(remaining, as_of=as_of))
+            remaining = [ticker for ticker in remaining if ticker not in prices]
+        return prices
+
+
+_default_providers = {}
+
+
+def default_price_provider() -> PriceProvider:
+    """
+    Return the live price provider selected by config.PRICE_PROVIDER, behind
+    the persistent price cache when one is configured. One instance is shared
+    per setting so concurrent lookups can be coalesced.
+    """
+    from price_cache import CachedPriceProvider, PriceCache
+
+    provider = os.environ.get("PRICE_PROVIDER", config.PRICE_PROVIDER)
+    price_file = os.environ.get("PRICE_FILE", config.PRICE_FILE)
+    cache_file = os.environ.get("PRICE_CACHE_FILE", config.PRICE_CACHE_FILE)
+    key = (provider, price_file if provider == "file" else None, cache_file)
+
+    if key not in _default_providers:
+        if provider == "file":
+            live_provider = FilePriceProvider(price_file)
+        elif provider == "yfinance":
+            live_provider = YFinancePriceProvider()
+        else:
+            raise ValueError(f"Unknown price provider: {provider}")
+
+        if cache_file:
+            try:
+                live_provider = CachedPriceProvider(live_provider, PriceCache(cache_file))
+            except (OSError, sqlite3.Error) as e:
+                # Read-only filesystems (e.g. serverless) simply run uncached
+                logger.warning("Price cache unavailable (%s); fetching prices uncached", e)
+        _default_providers[key] = live_provider
+    return _default_providers[key]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+QuiverQuant HTTP Client
+Shared fetch layer for the Congress indexes: one pooled keep-alive session,
+concurrent House/Senate (and date-sliced) requests with a bounded worker pool
+"""
+
+import contextvars
+import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import config
+from metrics import record_http
+
+logger = logging.getLogger("congress_indexes.quiver_client")
+
+CHAMBER_ENDPOINTS = {
+    "House": "/congresstrading/house",
+    "Senate": "/congresstrading/senate",
+}
+
+
+def date_slices(start_date: datetime, end_date: datetime, slice_days: int) -> List[Tuple[datetime, datetime]]:
+    """Split [start_date, end_date] into consecutive windows of at most slice_days"""
+    if not slice_days or slice_days <= 0:
+        return [(start_date, end_date)]
+
+    slices = []
+    slice_start = start_date
+    while slice_start < end_date:
+        slice_end = min(slice_start + timedelta(days=slice_days), end_date)
+        slices.append((slice_start, slice_end))
+        slice_start = slice_end + timedelta(days=1)
+    return slices or [(start_date, end_date)]
+
+
+class QuiverQuantClient:
+    """
+    Thin QuiverQuant client sharing one pooled session across concurrent requests
+    """
+
+    def __init__(self, api_key: str, base_url: str = "https://api.quiverquant.com/beta",
+                 max_workers: int = None, timeout: float = None):
+        self.base_url = base_url
+        self.max_workers = max_workers or config.MAX_FETCH_WORKERS
+        self.timeout = timeout or config.REQUEST_TIMEOUT_SECONDS
+
+        # Size the connection pool to the worker count so concurrent requests
+        # reuse keep-alive connections instead of opening new ones
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def fetch(self, endpoint: str, params: Dict, label: str = None, raise_errors: bool = False) -> List[Dict]:
+        """Fetch a single endpoint, returning [] on any request error unless raise_errors is set"""
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.session.get(f"{self.base_url}{endpoint}", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            record_http("quiverquant", endpoint, response.status_code, time.perf_counter() - start, data)
+            return data
+        except requests.exceptions.RequestException as e:
+            record_http("quiverquant", endpoint, response.status_code if response is not None else "error",
+                        time.perf_counter() - start)
+            logger.error("Error fetching %s data: %s", label or endpoint, e)
+            if raise_errors:
+                raise
+            return []
+
+    def fetch_many(self, jobs: List[Tuple[str, str, Dict]], raise_errors: bool = False) -> List[Dict]:
+        """
+        Run (label, endpoint, params) jobs concurrently and concatenate the
+        results in job order
+        """
+        if not jobs:
+            return []
+
+        workers = min(self.max_workers, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each job runs in a copy of the caller's context, so a profiled request sees its calls
+            futures = [executor.submit(contextvars.copy_context().run, self.fetch, endpoint, params, label,
+                                       raise_errors)
+                       for label, endpoint, params in jobs]
+            results = [future.result() for future in futures]
+
+        all_data = []
+        for data in results:
+            all_data.extend(data)
+        return all_data
+
+    def fetch_chambers(self, params: Dict, start_date: Optional[datetime] = None,
+                       end_date: Optional[datetime] = None, slice_days: int = None,
+                       raise_errors: bool = False) -> List[Dict]:
+        """
+        Fetch House and Senate concurrently. When a date range is given it is
+        split into slice_days windows, each fetched as its own sub-request.
+        """
+        if slice_days is None:
+            slice_days = config.FETCH_SLICE_DAYS
+
+        jobs = []
+        for chamber, endpoint in CHAMBER_ENDPOINTS.items():
+            if start_date is None or end_date is None:
+                jobs.append((chamber, endpoint, dict(params)))
+                continue
+
+            for slice_start, slice_end in date_slices(start_date, end_date, slice_days):
+                slice_params = dict(params)
+                slice_params["start_date"] = slice_start.strftime("%Y-%m-%d")
+                slice_params["end_date"] = slice_end.strftime("%Y-%m-%d")
+                jobs.append((chamber, endpoint, slice_params))
+
+        return self.fetch_many(jobs, raise_errors=raise_errors)
+
+    def close(self):
+        """Close the pooled session"""
+        self.session.close()
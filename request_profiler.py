@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Per-Request Profiling
+Opt-in profiling of single API requests. With config.PROFILING_ENABLED on, a
+request carrying an X-Profile header or a ?profile= query flag equal to
+PROFILING_TOKEN runs under cProfile (without a token nothing is profiled). Its
+report combines the index classes' per-stage breakdown and upstream HTTP calls
+(from metrics) with the hottest functions, and is saved under PROFILE_DIR next
+to the raw .prof file; only the newest PROFILE_MAX_SAVED are kept. The
+response carries a Server-Timing header and an X-Profile-Id to fetch the
+report with (again presenting the token). Requests without the flag only pay
+one flag check.
+"""
+
+import cProfile
+import glob
+import hmac
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import config
+from metrics import collect_events, stop_collecting
+
+# Functions listed in a report, by cumulative time
+TOP_FUNCTIONS = 40
+
+# cProfile cannot profile two requests in one thread, and the reports are
+# clearer without concurrent profiled requests interleaving, so one at a time
+_profiling_lock = threading.Lock()
+
+
+def profile_dir() -> str:
+    return os.environ.get('PROFILE_DIR', config.PROFILE_DIR)
+
+
+def profiling_requested(headers, args) -> bool:
+    """Whether this request carries the profiling token (profiling must be enabled and a token set)"""
+    if not config.PROFILING_ENABLED:
+        return False
+    flag = headers.get('X-Profile') or args.get('profile')
+    if not flag:
+        return False
+    token = os.environ.get('PROFILING_TOKEN', config.PROFILING_TOKEN)
+    return bool(token) and hmac.compare_digest(flag.encode(), token.encode())
+
+
+class RequestProfile:
+    """One profiled request: cProfile plus the stage and HTTP events it produced"""
+
+    def __init__(self, method: str, path: str, query: str):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.query = query
+        self.events = []
+        self.profiler = cProfile.Profile()
+        self._token = None
+        self._started = None
+
+    def start(self) -> bool:
+        """Start profiling; False when another request is already being profiled"""
+        if not _profiling_lock.acquire(blocking=False):
+            return False
+        self._token = collect_events(self.events)
+        self._started = time.perf_counter()
+        self.profiler.enable()
+        return True
+
+    def stop(self, status_code: int) -> Dict:
+        """Stop profiling, save the report and the raw profile, and return the report"""
+        self.profiler.disable()
+        duration = time.perf_counter() - self._started
+        stop_collecting(self._token)
+        _profiling_lock.release()
+
+        os.makedirs(profile_dir(), exist_ok=True)
+        self.profiler.dump_stats(os.path.join(profile_dir(), f"{self.id}.prof"))
+        report = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "stages": [event for event in self.events if event["event"] == "stage"],
+            "http_calls": [event for event in self.events if event["event"] == "http"],
+            "functions": top_functions(self.profiler),
+        }
+        tmp_file = os.path.join(profile_dir(), f"{self.id}.json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        os.replace(tmp_file, os.path.join(profile_dir(), f"{self.id}.json"))
+        prune_profiles()
+        return report
+
+
+def prune_profiles(keep: int = None):
+    """Delete saved profiles (report and raw .prof) beyond the newest keep"""
+    keep = keep if keep is not None else config.PROFILE_MAX_SAVED
+    reports = sorted(glob.glob(os.path.join(profile_dir(), "*.json")), key=os.path.getmtime, reverse=True)
+    for report_file in reports[keep:]:
+        for file_path in (report_file, f"{report_file[:-len('.json')]}.prof"):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass  # Already pruned by a concurrent request
+
+
+def top_functions(profiler: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+    """The functions with the largest cumulative time, with call counts and own time"""
+    stats = pstats.Stats(profiler).stats
+    rows = []
+    for (file_name, line, function), (_, calls, own_time, cumulative_time, _) in stats.items():
+        rows.append({
+            "function": function,
+            "file": file_name,
+            "line": line,
+            "calls": calls,
+            "own_ms": round(own_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3),
+        })
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:limit]
+
+
+def server_timing(report: Dict) -> str:
+    """Server-Timing header value: the total and each stage (browser devtools show these)"""
+    entries = [f'total;dur={report["duration_ms"]}']
+    for position, event in enumerate(report["stages"]):
+        entries.append(f'{position}-{event["stage"]};desc="{event["pipeline"]}";dur={event["duration_ms"]}')
+    return ", ".join(entries)
+
+
+def load_report(profile_id: str) -> Optional[Dict]:
+    """A saved report by id, or None"""
+    if not all(c.isalnum() or c == '-' for c in profile_id):
+        return None
+    file_path = os.path.join(profile_dir(), f"{profile_id}.json")
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path) as f:
+        return json.load(f)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Result Cache for the index API endpoints
+In-process TTL + LRU cache keyed by endpoint and normalized parameters, with an
+optional shared second tier (file-based or Redis) selected through config
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import config
+from metrics import record_cache
+from single_flight import SingleFlight
+
+# Lookup result label reported to metrics for each stats counter
+LOOKUP_RESULTS = {"hits": "hit", "shared_hits": "shared_hit", "misses": "miss"}
+
+
+def make_cache_key(endpoint: str, params: Dict) -> str:
+    """Build a stable cache key from an endpoint name and its parameters"""
+    return f"{endpoint}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileCacheBackend:
+    """
+    Shared cache tier backed by JSON files in a directory. Stands in for a
+    shared service in tests and single-host deployments with several workers.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file_for(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[Any]:
+        file_path = self._file_for(key)
+        try:
+            with open(file_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry["expires_at"] <= time.time():
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            return None
+
+        # Touch the file so eviction order follows recency of use
+        os.utime(file_path, None)
+        return entry["value"]
+
+    def set(self, key: str, value: Any):
+        file_path = self._file_for(key)
+        tmp_file = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"key": key, "expires_at": time.time() + self.ttl_seconds, "value": value}, f)
+        os.replace(tmp_file, file_path)
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used files beyond max_entries"""
+        entries = [os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda file_path: os.path.getmtime(file_path))
+        for file_path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.path, name))
+
+
+class RedisCacheBackend:
+    """Shared cache tier backed by Redis; expiry and eviction are left to Redis"""
+
+    def __init__(self, url: str, ttl_seconds: float, prefix: str = "congress-indexes:"):
+        import redis  # Optional dependency, only needed when this backend is selected
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any):
+        self.client.setex(self.prefix + key, int(self.ttl_seconds), json.dumps(value))
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+class ResultCache:
+    """
+    Two-tier result cache: a local LRU in front of an optional shared backend
+    """
+
+    def __init__(self, ttl_seconds: float = None, max_entries: int = None, shared_backend=None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else config.CACHE_MAX_ENTRIES
+        self.local = MemoryCache(self.max_entries, self.ttl_seconds)
+        self.shared = shared_backend
+        self.flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls) -> "ResultCache":
+        """Build the cache selected by config.CACHE_BACKEND"""
+        backend = os.environ.get("CACHE_BACKEND", config.CACHE_BACKEND)
+        shared = None
+        if backend == "file":
+            shared = FileCacheBackend(os.environ.get("CACHE_DIR", config.CACHE_DIR),
+                                      config.CACHE_MAX_ENTRIES, config.CACHE_TTL_SECONDS)
+        elif backend == "redis":
+            shared = RedisCacheBackend(os.environ.get("CACHE_REDIS_URL", config.CACHE_REDIS_URL),
+                                       config.CACHE_TTL_SECONDS)
+        elif backend != "memory":
+            raise ValueError(f"Unknown cache backend: {backend}")
+        return cls(shared_backend=shared)
+
+    def _record(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        record_cache("result", LOOKUP_RESULTS[counter])
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look a key up locally, then in the shared tier"""
+        value = self.local.get(key)
+        if value is not None:
+            self._record("hits")
+            return value
+
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self._record("shared_hits")
+                self.local.set(key, value)
+                return value
+
+        self._record("misses")
+        return None
+
+    def set(self, key: str, value: Any):
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def get_or_compute(self, endpoint: str, params: Dict, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for (endpoint, params), computing and storing
+        it on a miss. Concurrent misses for the same key share one computation.
+        """
+        key = make_cache_key(endpoint, params)
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def compute_and_store():
+            # A computation for this key may have finished between our miss and now
+            value = self.local.get(key)
+            if value is None:
+                value = compute()
+                self.set(key, value)
+            return value
+
+        return self.flight.do(key, compute_and_store)
+
+    def clear(self):
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for the health endpoint"""
+        with self._stats_lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "backend": type(self.shared).__name__ if self.shared is not None else "MemoryCache",
+                "entries": len(self.local),
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "coalesced": self.flight.coalesced,
+                "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Fast JSON Serialization
+Turns index tables into JSON with orjson, converting DataFrames one column
+at a time (numpy's tolist, dates formatted in one vectorized pass) instead
+of boxing every value row by row through to_dict('records') and the stdlib
+encoder. A table goes out either as records, a list of row objects (the
+default), or columnar, one array per column (?format=columnar), which is
+smaller on the wire and cheaper to build and parse. Missing values become
+null. Importing this module does not import pandas.
+"""
+
+from typing import Any, Dict, List
+
+import orjson
+
+FORMATS = ("records", "columnar")
+DEFAULT_FORMAT = "records"
+
+
+def _column_values(series) -> List:
+    """One column as JSON-ready Python values"""
+    kind = series.dtype.kind
+    if kind == "M":
+        # One strftime pass; midnight-only columns (trade and filing dates) as plain dates
+        date_only = bool((series.dropna().dt.normalize() == series.dropna()).all())
+        formatted = series.dt.strftime("%Y-%m-%d" if date_only else "%Y-%m-%dT%H:%M:%S")
+        return formatted.astype(object).where(series.notna(), None).tolist()
+    if kind == "f" or (kind in "biu" and not series.hasnans):
+        # NaN floats are written as null by orjson
+        return series.to_numpy().tolist()
+    # object, string, category and nullable extension columns
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def frame_records(df) -> List[Dict[str, Any]]:
+    """A DataFrame as a list of row dicts (the to_dict('records') shape)"""
+    names = [str(name) for name in df.columns]
+    columns = [_column_values(df[name]) for name in df.columns]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def frame_columns(df) -> Dict[str, List]:
+    """A DataFrame as {column: values}, in column order"""
+    return {str(name): _column_values(df[name]) for name in df.columns}
+
+
+def records_columns(records: List[Dict[str, Any]]) -> Dict[str, List]:
+    """Row dicts (frame_records output) reshaped to frame_columns output without the DataFrame"""
+    names = list(records[0]) if records else []
+    return {name: [row.get(name) for row in records] for name in names}
+
+
+def frame_table(df, fmt: str = DEFAULT_FORMAT):
+    """A DataFrame in the requested response format"""
+    if fmt == "columnar":
+        return frame_columns(df)
+    return frame_records(df)
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """JSON bytes; anything orjson does not know natively falls back to str()"""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(value, default=str, option=option)
@@ -21,6 +21,10 @@ def install_dependencies():
 
 def create_config_template():
     """Create a configuration template"""
+    if os.path.exists("config.py"):
+        print("✓ Existing config.py kept")
+        return
+    
     config_content = '''# Configuration file for Congress Buys Index
 
 # QuiverQuant API Configuration
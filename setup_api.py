@@ -4,6 +4,7 @@ Setup script for QuiverQuant API to get real congressional trading data
 """
 
 import os
+import re
 from congress_buys_index import CongressBuysIndex
 
 def setup_api_key():
@@ -24,34 +25,13 @@ def setup_api_key():
     api_key = input("Enter your QuiverQuant API key (or press Enter to skip): ").strip()
     
     if api_key:
-        # Save to config file
-        config_content = f'''# Configuration file for Congress Buys Index
-
-# QuiverQuant API Configuration
-QUIVERQUANT_API_KEY = "{api_key}"  # Your API key
-
-# Index Configuration
-DEFAULT_DAYS_BACK = 100  # Number of days to look back for trades
-TOP_N_CONSTITUENTS = 10  # Number of top stocks to include in index
-
-# Dollar Range Mappings (midpoints)
-DOLLAR_RANGES = {{
-    "$1,001-$15,000": 8000.5,
-    "$15,001-$50,000": 32500.5,
-    "$50,001-$100,000": 75000.5,
-    "$100,001-$250,000": 175000.5,
-    "$250,001-$500,000": 375000.5,
-    "$500,001-$1,000,000": 750000.5,
-    "$1,000,001-$5,000,000": 3000000.5,
-    "$5,000,001-$25,000,000": 15000000.5,
-    "$25,000,001-$50,000,000": 37500000.5,
-    "$50,000,001+": 75000000.5  # Conservative estimate for upper bound
-}}
-
-# Output Configuration
-OUTPUT_CSV_FILE = "congress_buys_index.csv"
-OUTPUT_EXCEL_FILE = "congress_buys_index.xlsx"
-'''
+        # Save to config file, keeping every other setting in place
+        with open("config.py") as f:
+            config_content = f.read()
+        
+        config_content = re.sub(r'^QUIVERQUANT_API_KEY = .*$',
+                                lambda _: f'QUIVERQUANT_API_KEY = "{api_key}"  # Your API key',
+                                config_content, count=1, flags=re.MULTILINE)
         
         with open("config.py", "w") as f:
             f.write(config_content)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Sliding-Window Aggregator for the Congress Buys Index
+Keeps per-ticker running dollar totals for a trailing N-day window. As the
+window advances, only trades entering or leaving it touch the totals, and the
+top-N is read from a lazily invalidated max-heap, so a daily refresh costs
+O(changed trades) rather than a full groupby over the window.
+"""
+
+import heapq
+import itertools
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+import config
+from trade_store import get_date_column
+
+
+class SlidingWindowAggregator:
+    """
+    Running per-ticker totals over trades dated within
+    [window_end - days_back, window_end]
+    """
+
+    def __init__(self, days_back: int = 100):
+        self.days_back = days_back
+        self.window_end = None
+        self.latest_trade_date = None
+        # When the fetched deltas last reached back for late filings (see late_filing_sweep_due)
+        self.last_sweep = None
+
+        self.totals = defaultdict(float)
+        # How often each company name is reported for a ticker by trades inside the window
+        self._names = defaultdict(Counter)
+        # Current (date, sequence, transaction_id, ticker, amount, company) of every
+        # trade in the window or pending, so a re-sent id can replace its old version
+        self.trades = {}
+        self._sequence = itertools.count()
+
+        # Trades inside the window, ordered by date for eviction
+        self._active = []
+        # Trades dated after the current window end, ordered by date for admission.
+        # Entries for replaced or removed trades stay behind and are skipped when popped.
+        self._pending = []
+        # Max-heap of (-total, ticker, version); entries with an old version are stale
+        self._heap = []
+        self._versions = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _window_start(self) -> pd.Timestamp:
+        return (self.window_end - timedelta(days=self.days_back)).normalize()
+
+    def _apply(self, ticker: str, delta: float):
+        """Apply a delta to a ticker total and push its new heap entry"""
+        total = self.totals[ticker] + delta
+        if abs(total) < 1e-6:
+            del self.totals[ticker]
+        else:
+            self.totals[ticker] = total
+        self._versions[ticker] += 1
+        if ticker in self.totals:
+            heapq.heappush(self._heap, (-total, ticker, self._versions[ticker]))
+
+        # Rebuild once stale entries dominate so the heap stays O(tickers)
+        if len(self._heap) > 4 * max(len(self.totals), 16):
+            self._heap = [(-value, name, self._versions[name]) for name, value in self.totals.items()]
+            heapq.heapify(self._heap)
+
+    def _enter(self, trade: Tuple):
+        """Count a trade that is now inside the window"""
+        self._names[trade[3]][trade[5]] += 1
+        self._apply(trade[3], trade[4])
+
+    def _leave(self, trade: Tuple):
+        """Uncount a trade that was inside the window"""
+        names = self._names[trade[3]]
+        names[trade[5]] -= 1
+        if names[trade[5]] <= 0:
+            del names[trade[5]]
+        if not names:
+            del self._names[trade[3]]
+        self._apply(trade[3], -trade[4])
+
+    def company(self, ticker: str) -> str:
+        """Name reported most often by the window's trades for ticker (the most_frequent_names rule)"""
+        names = self._names.get(ticker)
+        if not names:
+            return ""
+        return min(names.items(), key=lambda item: (-item[1], item[0]))[0]
+
+    def _is_current(self, trade: Tuple) -> bool:
+        return self.trades.get(trade[2]) is trade
+
+    def _discard(self, transaction_id: str):
+        """Forget a trade, taking it out of the totals if it is inside the window"""
+        trade = self.trades.pop(transaction_id, None)
+        if trade is not None and self.window_end is not None and trade[0] <= self.window_end:
+            self._leave(trade)
+        # Its heap entry is now stale and skipped when popped
+
+    def add_trades(self, df: pd.DataFrame) -> int:
+        """
+        Add already filtered and priced buy trades (transaction_id, ticker,
+        company, dollar_amount and a trade date). A trade seen before with
+        the same date, ticker, amount and company is ignored, so overlapping deltas are
+        safe; one that differs (an amendment) replaces the old version. Trades
+        already older than the window never contribute. Returns the number of
+        trades added or replaced.
+        """
+        if df.empty:
+            return 0
+
+        date_column = get_date_column(df)
+        dates = pd.to_datetime(df[date_column])
+        amounts = df["dollar_amount"].astype("float64").fillna(0.0)
+
+        added = 0
+        with self._lock:
+            for transaction_id, ticker, company, date, amount in zip(
+                    df["transaction_id"].astype(str), df["ticker"].astype(str), df["company"].astype(str),
+                    dates, amounts):
+                known = self.trades.get(transaction_id)
+                if known is not None and known[:1] + known[3:] == (date, ticker, amount, company):
+                    continue
+                self._discard(transaction_id)
+                if self.window_end is not None and date < self._window_start():
+                    continue  # Already older than the window, so it never contributes
+                trade = (date, next(self._sequence), transaction_id, ticker, amount, company)
+                self.trades[transaction_id] = trade
+                added += 1
+
+                if self.latest_trade_date is None or date > self.latest_trade_date:
+                    self.latest_trade_date = date
+
+                if self.window_end is None or date > self.window_end:
+                    heapq.heappush(self._pending, trade)
+                else:
+                    heapq.heappush(self._active, trade)
+                    self._enter(trade)
+        return added
+
+    def remove_trades(self, transaction_ids) -> int:
+        """
+        Drop trades that are no longer buys (amended into a sale, withdrawn).
+        Returns the number that were in the window or pending.
+        """
+        removed = 0
+        with self._lock:
+            for transaction_id in transaction_ids:
+                if str(transaction_id) in self.trades:
+                    self._discard(str(transaction_id))
+                    removed += 1
+        return removed
+
+    def advance(self, window_end: datetime) -> Tuple[int, int]:
+        """
+        Move the window end forward, admitting pending trades and evicting
+        trades that fell out of the window. An earlier window_end (a concurrent
+        refresh that started first) leaves the window where it is. Evicted
+        trades are forgotten, so trades only covers the window and pending
+        trades. Returns (admitted, evicted).
+        """
+        window_end = pd.Timestamp(window_end)
+        admitted = evicted = 0
+        with self._lock:
+            if self.window_end is not None:
+                window_end = max(window_end, self.window_end)
+            self.window_end = window_end
+            window_start = self._window_start()
+
+            while self._pending and self._pending[0][0] <= window_end:
+                trade = heapq.heappop(self._pending)
+                if not self._is_current(trade):
+                    continue  # Replaced or removed while pending
+                if trade[0] >= window_start:
+                    heapq.heappush(self._active, trade)
+                    self._enter(trade)
+                    admitted += 1
+                else:
+                    del self.trades[trade[2]]
+
+            while self._active and self._active[0][0] < window_start:
+                trade = heapq.heappop(self._active)
+                if not self._is_current(trade):
+                    continue  # Already taken out of the totals when replaced
+                self._leave(trade)
+                del self.trades[trade[2]]
+                evicted += 1
+        return admitted, evicted
+
+    def top_n(self, n: int = None) -> List[Tuple[str, float]]:
+        """Return the n largest (ticker, total) pairs without sorting every ticker"""
+        n = n or config.TOP_N_CONSTITUENTS
+        with self._lock:
+            result = []
+            valid_entries = []
+            while self._heap and len(result) < n:
+                entry = heapq.heappop(self._heap)
+                neg_total, ticker, version = entry
+                if version != self._versions[ticker] or ticker not in self.totals:
+                    continue  # Stale entry from an earlier total
+                result.append((ticker, -neg_total))
+                valid_entries.append(entry)
+            for entry in valid_entries:
+                heapq.heappush(self._heap, entry)
+        return result
+
+    def top_n_frame(self, n: int = None) -> pd.DataFrame:
+        """Top-N totals shaped like aggregate_by_ticker output"""
+        top = self.top_n(n)
+        with self._lock:
+            rows = [{"ticker": ticker, "company": self.company(ticker), "dollar_amount": total}
+                    for ticker, total in top]
+        return pd.DataFrame(rows, columns=["ticker", "company", "dollar_amount"])
+
+    def window_size(self) -> int:
+        return sum(1 for trade in self.trades.values() if trade[0] <= self.window_end)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Published Index Snapshots
+Every parameter combination the dashboards request, rendered ahead of time
+into static JSON files that a CDN can serve. A publish writes one version
+directory of content-hashed files (immutable, so cacheable for a year) and
+a manifest mapping each endpoint and parameters to its file, hash and
+Cache-Control value, then switches current.json to the new version:
+
+    snapshots/
+        current.json                      # {"version": ...}, short-lived
+        20261017T093000Z/
+            manifest.json
+            congress-buys-<params>.<sha256>.json
+
+Each job is published in every response format: its records payload as
+built and a columnar copy reshaped from it, keyed like ?format=columnar.
+
+app.py serves the files under /snapshots/ and, with SERVE_SNAPSHOTS or
+SNAPSHOT_ONLY on, answers the API endpoints from them instead of
+recomputing. SNAPSHOT_ONLY never runs a pipeline, so such an instance never
+imports the index modules (or pandas); parameters without a snapshot get a
+404. Publish wherever the full pipeline runs:
+
+    python snapshots.py [snapshot_dir]
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+from http_cache import payload_etag
+from result_cache import make_cache_key
+from serialization import dumps, records_columns
+
+CURRENT_FILE = "current.json"
+MANIFEST_FILE = "manifest.json"
+
+# Parsed manifest of the current version, reloaded when current.json changes
+_manifest_cache = {}
+_manifest_lock = threading.Lock()
+
+
+def snapshot_dir() -> str:
+    return os.environ.get('SNAPSHOT_DIR', config.SNAPSHOT_DIR)
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def snapshot_only() -> bool:
+    """Whether the API serves published snapshots only (SNAPSHOT_ONLY env var or config)"""
+    return _flag('SNAPSHOT_ONLY', config.SNAPSHOT_ONLY)
+
+
+def serve_snapshots() -> bool:
+    """Whether the API answers from published snapshots when one matches"""
+    return snapshot_only() or _flag('SERVE_SNAPSHOTS', config.SERVE_SNAPSHOTS)
+
+
+def _write_atomic(file_path: str, data: bytes):
+    tmp_file = f"{file_path}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(data)
+    os.replace(tmp_file, file_path)
+
+
+def snapshot_file_name(endpoint: str, params: Dict, body: bytes) -> Tuple[str, str]:
+    """(file name, content sha256) for one rendered payload"""
+    params_digest = hashlib.sha256(make_cache_key(endpoint, params).encode()).hexdigest()[:12]
+    content_hash = hashlib.sha256(body).hexdigest()
+    return f"{endpoint}-{params_digest}.{content_hash[:16]}.json", content_hash
+
+
+def columnar_payload(value: Any) -> Any:
+    """A records payload with every constituents table reshaped to one array per column"""
+    if isinstance(value, dict):
+        return {key: records_columns(item) if key == "constituents" and isinstance(item, list)
+                else columnar_payload(item)
+                for key, item in value.items()}
+    return value
+
+
+def publish_snapshots(jobs: List[Tuple[str, Dict, Callable[[], Dict]]], directory: str = None,
+                      watermark: Callable[[str], Any] = None) -> Dict:
+    """
+    Render each (endpoint, params, build) job, in records and columnar format,
+    into a new version directory, switch current.json to it and prune old
+    versions; returns the manifest. watermark(endpoint) gives the data
+    watermark folded into each ETag.
+    """
+    directory = directory or snapshot_dir()
+    published_at = datetime.now(timezone.utc)
+    version = published_at.strftime('%Y%m%dT%H%M%S%fZ')
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+
+    entries = {}
+    for endpoint, job_params, build in jobs:
+        records = build()
+        # Like the API, the default format is not part of the parameters
+        variants = [(job_params, records), (dict(job_params, format="columnar"), columnar_payload(records))]
+        for params, payload in variants:
+            body = dumps(payload)
+            file_name, content_hash = snapshot_file_name(endpoint, params, body)
+            _write_atomic(os.path.join(version_dir, file_name), body)
+            entries[make_cache_key(endpoint, params)] = {
+                "endpoint": endpoint,
+                "params": params,
+                "path": f"{version}/{file_name}",
+                "sha256": content_hash,
+                # Same value the live endpoint sends for this content, so clients revalidate across the switch
+                "etag": payload_etag(payload, watermark(endpoint) if watermark else None),
+                "bytes": len(body),
+                "cache_control": config.SNAPSHOT_FILE_CACHE_CONTROL,
+            }
+
+    manifest = {
+        "version": version,
+        "published_at": published_at.isoformat(),
+        "api_cache_control": config.SNAPSHOT_API_CACHE_CONTROL,
+        "entries": entries,
+    }
+    _write_atomic(os.path.join(version_dir, MANIFEST_FILE), json.dumps(manifest, indent=2).encode())
+    # Readers only ever see a complete version: the pointer moves last
+    _write_atomic(os.path.join(directory, CURRENT_FILE),
+                  json.dumps({"version": version, "published_at": manifest["published_at"]}).encode())
+    prune_versions(directory, keep=config.SNAPSHOT_KEEP_VERSIONS)
+    return manifest
+
+
+def prune_versions(directory: str, keep: int) -> List[str]:
+    """Delete all but the newest keep versions (older URLs stay valid until then)"""
+    versions = sorted(name for name in os.listdir(directory)
+                      if os.path.exists(os.path.join(directory, name, MANIFEST_FILE)))
+    removed = versions[:-keep] if keep > 0 else []
+    for version in removed:
+        shutil.rmtree(os.path.join(directory, version), ignore_errors=True)
+    return removed
+
+
+def current_manifest(directory: str = None) -> Optional[Dict]:
+    """The manifest of the published version, or None before the first publish"""
+    directory = directory or snapshot_dir()
+    current_path = os.path.join(directory, CURRENT_FILE)
+    try:
+        modified = os.stat(current_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    with _manifest_lock:
+        cached = _manifest_cache.get(directory)
+        if cached is not None and cached[0] == modified:
+            return cached[1]
+    with open(current_path) as f:
+        version = json.load(f)["version"]
+    with open(os.path.join(directory, version, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    with _manifest_lock:
+        _manifest_cache[directory] = (modified, manifest)
+    return manifest
+
+
+def find_snapshot(endpoint: str, params: Dict) -> Optional[Dict]:
+    """The manifest entry for these parameters (plus its absolute file path), or None"""
+    manifest = current_manifest()
+    entry = manifest["entries"].get(make_cache_key(endpoint, params)) if manifest else None
+    if entry is None:
+        return None
+    return dict(entry, file=os.path.join(snapshot_dir(), entry["path"]), version=manifest["version"],
+                published_at=manifest["published_at"], api_cache_control=manifest["api_cache_control"])
+
+
+def read_snapshot(entry: Dict) -> bytes:
+    with open(entry["file"], "rb") as f:
+        return f.read()
+
+
+def main():
+    if len(sys.argv) > 1:
+        os.environ['SNAPSHOT_DIR'] = sys.argv[1]
+    # Runs the full pipelines, so this is the one place that needs the heavy imports
+    from app import data_watermark, precomputed_jobs
+
+    manifest = publish_snapshots(precomputed_jobs(), watermark=data_watermark)
+    for key, entry in manifest["entries"].items():
+        print(f"{key} -> {entry['path']} ({entry['bytes']:,} bytes)")
+    print(f"Published version {manifest['version']} to {snapshot_dir()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Startup Time Report
+Measures what a cold start of a module (by default app, i.e. one Vercel
+instance) spends importing, broken down by top-level package. It runs the
+import in a fresh interpreter under `python -X importtime`, so environment
+variables such as SNAPSHOT_ONLY=1 apply to the measured start:
+
+    python startup_report.py [module] [--json]
+"""
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Dependencies that dominate a cold start when imported
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "requests", "yfinance")
+
+
+def loaded_heavy_modules() -> List[str]:
+    """The heavy dependencies this process has imported so far"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def measure_imports(module: str = "app") -> List[Tuple[str, int, float, float]]:
+    """(module, depth, self seconds, cumulative seconds) for each module a fresh import loads"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, env=dict(os.environ),
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def by_package(rows: List[Tuple[str, int, float, float]]) -> Dict[str, float]:
+    """Import seconds per top-level package (each module's own time, so nothing is counted twice)"""
+    totals = defaultdict(float)
+    for name, _, self_seconds, _ in rows:
+        totals[name.split(".")[0]] += self_seconds
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def startup_report(module: str = "app") -> Dict:
+    rows = measure_imports(module)
+    packages = by_package(rows)
+    return {
+        "module": module,
+        "total_seconds": round(sum(row[3] for row in rows if row[1] == 0), 4),
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in packages],
+        "packages": {name: round(seconds, 4) for name, seconds in packages.items()},
+    }
+
+
+def print_report(report: Dict, limit: int = 25):
+    print(f"Startup import time for '{report['module']}': {report['total_seconds'] * 1000:.1f} ms")
+    print(f"Heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+    print(f"{'package':<32} {'ms':>9} {'share':>7}")
+    for name, seconds in list(report["packages"].items())[:limit]:
+        share = seconds / report["total_seconds"] if report["total_seconds"] else 0
+        print(f"{name:<32} {seconds * 1000:>9.1f} {share:>7.1%}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    report = startup_report(args[0] if args else "app")
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Synthetic Congressional Trades and Holdings
+Seeded generator for load and scale testing, from 10k to 50M rows. Ticker
+popularity and member activity are heavy-tailed, amounts follow the STOCK Act
+brackets (with a share of formatting variants), most disclosures land within
+the 45-day deadline with a tail of late filings, and a share of rows repeat a
+transaction_id either unchanged (re-fetch) or amended (later disclosure).
+Rows are generated one month at a time, so large datasets can be streamed
+straight into the trade store without holding every row in memory.
+
+Usage: python synthetic_data.py [rows] [path] [seed]
+"""
+
+import os
+import sys
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from trade_store import (CONTENT_COLUMNS, KNOWN_COLUMN, SUPERSEDED_COLUMN, HoldingsStore, TradeStore,
+                         _write_partition, month_partition, normalize_trades, stamp_known_dates)
+
+DEFAULT_TICKERS = 5000
+HOUSE_MEMBERS = 435
+SENATE_MEMBERS = 100
+
+# Share of trades per STOCK Act bracket, smallest first (same order as config.DOLLAR_RANGES)
+AMOUNT_SHARES = [0.62, 0.20, 0.08, 0.05, 0.025, 0.015, 0.007, 0.002, 0.0007, 0.0003]
+
+TRANSACTION_TYPES = ["buy", "sell", "exchange"]
+TRANSACTION_TYPE_SHARES = [0.50, 0.45, 0.05]
+
+# Disclosures are due within 45 days; this share is filed late
+LATE_FILING_RATE = 0.05
+
+
+def _ticker_symbols(num_tickers: int) -> np.ndarray:
+    """Distinct 3-4 letter symbols, the same for a given universe size"""
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    index = np.arange(num_tickers) + 26 ** 2  # Skip 1-2 letter symbols
+    symbols = np.full(num_tickers, "", dtype=object)
+    while index.any():
+        symbols = letters[index % 26].astype(object) + symbols
+        index = index // 26
+    return symbols
+
+
+def synthetic_universe(num_tickers: int = DEFAULT_TICKERS) -> pd.DataFrame:
+    """
+    Tickers with company names and Zipf-like popularity: a handful of names
+    draw most of the trading, as in real disclosures
+    """
+    tickers = _ticker_symbols(num_tickers)
+    popularity = 1.0 / np.arange(1, num_tickers + 1) ** 1.1
+    return pd.DataFrame({
+        "ticker": tickers,
+        "company": [f"{ticker} Holdings Corporation" for ticker in tickers],
+        "popularity": popularity / popularity.sum(),
+    })
+
+
+def synthetic_members(seed: int = 0) -> pd.DataFrame:
+    """House and Senate members with lognormal trading activity"""
+    rng = np.random.default_rng(seed)
+    chambers = ["House"] * HOUSE_MEMBERS + ["Senate"] * SENATE_MEMBERS
+    prefixes = {"House": "Rep.", "Senate": "Sen."}
+    activity = rng.lognormal(0.0, 1.5, len(chambers))
+    return pd.DataFrame({
+        "representative": [f"{prefixes[chamber]} Member {i:03d}" for i, chamber in enumerate(chambers)],
+        "chamber": chambers,
+        "activity": activity / activity.sum(),
+    })
+
+
+def synthetic_prices(num_tickers: int = DEFAULT_TICKERS, seed: int = 0) -> Dict[str, float]:
+    """Lognormal stock prices for the synthetic universe (offline valuation)"""
+    rng = np.random.default_rng(seed)
+    prices = np.round(rng.lognormal(4.0, 1.0, num_tickers), 2) + 1.0
+    return dict(zip(synthetic_universe(num_tickers)["ticker"], prices))
+
+
+def _amount_labels() -> Tuple[list, list]:
+    """Standard bracket labels followed by their spaced, en-dash formatting variants"""
+    labels = list(config.DOLLAR_RANGES)
+    variants = [label.replace("-", " – ").replace("+", " +") for label in labels]
+    return labels, variants
+
+
+def _month_row_counts(rows: int, start_date, end_date, rng) -> pd.Series:
+    """Split rows over the months of [start_date, end_date] in proportion to their weekdays"""
+    days = pd.bdate_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize())
+    weekdays = pd.Series(1, index=days).groupby(days.to_period("M")).sum()
+    counts = rng.multinomial(rows, (weekdays / weekdays.sum()).to_numpy())
+    return pd.Series(counts, index=weekdays.index)
+
+
+def iter_trades(rows: int, seed: int = 0, start_date="2020-01-01", end_date="2024-12-31",
+                num_tickers: int = DEFAULT_TICKERS, duplicate_rate: float = 0.02,
+                amend_rate: float = 0.25, options_rate: float = 0.04,
+                variant_rate: float = 0.05) -> Iterator[pd.DataFrame]:
+    """
+    Yield one month of synthetic upstream trades at a time, rows in total.
+    duplicate_rate of the rows repeat an earlier transaction_id of the same
+    month; amend_rate of those repeats are amendments with another amount and
+    a later disclosure date. Text columns are categorical from the start.
+    """
+    rng = np.random.default_rng(seed)
+    universe = synthetic_universe(num_tickers)
+    members = synthetic_members(seed)
+    labels, variants = _amount_labels()
+    amount_shares = np.array(AMOUNT_SHARES) / sum(AMOUNT_SHARES)
+    next_id = 0
+
+    for month, month_rows in _month_row_counts(rows, start_date, end_date, rng).items():
+        if month_rows == 0:
+            continue
+        days = pd.bdate_range(max(month.start_time, pd.Timestamp(start_date).normalize()),
+                              min(month.end_time, pd.Timestamp(end_date)).normalize())
+        duplicates = min(int(round(month_rows * duplicate_rate)), month_rows - 1)
+        originals = month_rows - duplicates
+
+        ticker = rng.choice(num_tickers, originals, p=universe["popularity"].to_numpy())
+        member = rng.choice(len(members), originals, p=members["activity"].to_numpy())
+        bracket = rng.choice(len(labels), originals, p=amount_shares)
+        lag = np.ceil(rng.gamma(2.0, 10.0, originals)).clip(1, 45)
+        late = rng.random(originals) < LATE_FILING_RATE
+        lag[late] = rng.integers(46, 400, late.sum())
+        trades = pd.DataFrame({
+            "transaction_id": np.arange(next_id, next_id + originals),
+            "ticker": ticker,
+            "representative": member,
+            "transaction_type": rng.choice(len(TRANSACTION_TYPES), originals, p=TRANSACTION_TYPE_SHARES),
+            "asset_type": (rng.random(originals) < options_rate).astype("int8"),
+            "amount": bracket + len(labels) * (rng.random(originals) < variant_rate),
+            "date": days[rng.integers(0, len(days), originals)],
+            "lag": lag.astype("int64"),
+        })
+        next_id += originals
+
+        # Re-fetched copies keep everything; amendments move to another bracket and disclose later
+        repeats = trades.iloc[rng.integers(0, originals, duplicates)].copy()
+        amended = rng.random(duplicates) < amend_rate
+        repeats.loc[amended, "amount"] = (repeats.loc[amended, "amount"] % len(labels) + 1) % len(labels)
+        repeats.loc[amended, "lag"] += rng.integers(1, 60, amended.sum())
+        trades = pd.concat([trades, repeats], ignore_index=True).sort_values("date", kind="stable")
+
+        member_codes = trades["representative"].to_numpy()
+        yield pd.DataFrame({
+            "transaction_id": trades["transaction_id"].astype("string").to_numpy(),
+            "ticker": pd.Categorical.from_codes(trades["ticker"], universe["ticker"]),
+            "company": pd.Categorical.from_codes(trades["ticker"], universe["company"]),
+            "representative": pd.Categorical.from_codes(member_codes, members["representative"]),
+            "chamber": pd.Categorical(members["chamber"].to_numpy()[member_codes]),
+            "transaction_type": pd.Categorical.from_codes(trades["transaction_type"], TRANSACTION_TYPES),
+            "asset_type": pd.Categorical.from_codes(trades["asset_type"], ["Stock", "Stock Option"]),
+            "amount": pd.Categorical.from_codes(trades["amount"], labels + variants),
+            "date": trades["date"].to_numpy(),
+            "disclosure_date": (trades["date"] + pd.to_timedelta(trades["lag"], unit="D")).to_numpy(),
+        })
+
+
+def generate_trades(rows: int, seed: int = 0, **kwargs) -> pd.DataFrame:
+    """All synthetic trades in one DataFrame (see iter_trades for the options)"""
+    return pd.concat(iter_trades(rows, seed, **kwargs), ignore_index=True)
+
+
+def generate_holdings(rows: int, seed: int = 0, quarter_end_date: str = "2024-12-31",
+                      num_tickers: int = DEFAULT_TICKERS, options_rate: float = 0.15) -> pd.DataFrame:
+    """
+    Synthetic quarter-end holdings in the upstream shape: lognormal share
+    counts, and options_rate of the positions with call or put contracts
+    """
+    rng = np.random.default_rng(seed)
+    universe = synthetic_universe(num_tickers)
+    members = synthetic_members(seed)
+
+    ticker = rng.choice(num_tickers, rows, p=universe["popularity"].to_numpy())
+    member = rng.choice(len(members), rows, p=members["activity"].to_numpy())
+    has_options = rng.random(rows) < options_rate
+    is_call = rng.random(rows) < 0.75
+    contracts = np.where(has_options, rng.geometric(0.2, rows), 0).astype("float64")
+    delta = np.where(is_call, rng.uniform(0.2, 0.95, rows), -rng.uniform(0.05, 0.9, rows))
+
+    return pd.DataFrame({
+        "ticker": pd.Categorical.from_codes(ticker, universe["ticker"]),
+        "company": pd.Categorical.from_codes(ticker, universe["company"]),
+        "representative": pd.Categorical.from_codes(member, members["representative"]),
+        "shares_held": np.round(rng.lognormal(5.0, 1.3, rows)),
+        "options_contracts": contracts,
+        "options_type": pd.Categorical(np.where(has_options, np.where(is_call, "call", "put"), None),
+                                       categories=["call", "put"]),
+        "options_delta": np.where(has_options, np.round(delta, 2), 0.0),
+        "quarter_end_date": quarter_end_date,
+        "chamber": pd.Categorical(members["chamber"].to_numpy()[member]),
+    })
+
+
+def _versioned_month(trades: pd.DataFrame, ingest_date) -> pd.DataFrame:
+    """
+    One month of trades as TradeStore.merge would have stored them: unchanged
+    re-fetches dropped, amendments kept as new versions that supersede the
+    previous one on the day they became known
+    """
+    df = stamp_known_dates(normalize_trades(trades), ingest_date, backfill=True)
+    content = [column for column in ["transaction_id", "date"] + CONTENT_COLUMNS if column in df.columns]
+    df = df.drop_duplicates(subset=content).sort_values(["transaction_id", KNOWN_COLUMN], kind="stable")
+    next_known = df.groupby("transaction_id", observed=True)[KNOWN_COLUMN].shift(-1)
+    df[SUPERSEDED_COLUMN] = next_known.astype("datetime64[ns]")
+    return normalize_trades(df.sort_values("date", kind="stable").reset_index(drop=True))
+
+
+def write_trade_store(path: str, rows: int, seed: int = 0, **kwargs) -> TradeStore:
+    """
+    Stream synthetic trades into a TradeStore at path, one month partition at
+    a time. Partitions already present for the generated months are replaced,
+    along with their rows of the id index TradeStore.merge locates trades by.
+    """
+    store = TradeStore(path)
+    start_date = pd.Timestamp(kwargs.get("start_date", "2020-01-01"))
+    end_date = pd.Timestamp(kwargs.get("end_date", "2024-12-31"))
+    stale_index = pd.read_parquet(store.id_index_file) if os.path.exists(store.id_index_file) else None
+    written = []
+    for trades in iter_trades(rows, seed, **kwargs):
+        month = month_partition(trades["date"].iloc[0])
+        df = _versioned_month(trades, end_date)
+        _write_partition(os.path.join(store.path, month), df)
+        written.append(store._partition_ids(month, df["transaction_id"]))
+
+    if stale_index is None:
+        store._id_index()  # Scans every partition, including ones written before
+    else:
+        months = {ids["partition"].iloc[0] for ids in written}
+        store._save_id_index(pd.concat([stale_index[~stale_index["partition"].isin(months)]] + written,
+                                       ignore_index=True))
+    store._save_state(start_date.to_pydatetime(), end_date.to_pydatetime())
+    return store
+
+
+def write_holdings_store(path: str, rows: int, seed: int = 0,
+                         quarter_end_date: str = "2024-12-31", **kwargs) -> HoldingsStore:
+    """Write one synthetic quarter snapshot into a HoldingsStore at path"""
+    store = HoldingsStore(path)
+    store.save_quarter(quarter_end_date, generate_holdings(rows, seed, quarter_end_date, **kwargs))
+    return store
+
+
+def write_price_file(path: str, num_tickers: int = DEFAULT_TICKERS, seed: int = 0):
+    """Write synthetic prices as a ticker,price CSV for FilePriceProvider"""
+    prices = synthetic_prices(num_tickers, seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    pd.DataFrame({"ticker": list(prices), "price": list(prices.values())}).to_csv(path, index=False)
+
+
+def main():
+    """Write a synthetic trade store, holdings snapshot and price file"""
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000
+    path = sys.argv[2] if len(sys.argv) > 2 else "data/synthetic"
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    print(f"GENERATING SYNTHETIC CONGRESSIONAL DATA ({rows:,} trades, seed {seed})")
+    print("=" * 60)
+    write_trade_store(os.path.join(path, "trades"), rows, seed)
+    print(f"✓ Trade store written to {os.path.join(path, 'trades')}")
+    write_holdings_store(os.path.join(path, "holdings"), max(rows // 10, 1), seed)
+    print(f"✓ Holdings snapshot written to {os.path.join(path, 'holdings')}")
+    write_price_file(os.path.join(path, "prices.csv"), seed=seed)
+    print(f"✓ Prices written to {os.path.join(path, 'prices.csv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the fused aggregation + top-N stage
+Checks it against groupby + nlargest and the company name resolution
+"""
+
+import numpy as np
+import pandas as pd
+
+import config
+from congress_buys_index import CongressBuysIndex
+from fixtures import make_trades
+
+
+def test_matches_groupby_nlargest():
+    """Test totals, order and tie-breaking against the multi-pass pipeline"""
+    index = CongressBuysIndex()
+    trades = make_trades(5000)
+    for n in [1, 10, 25, 100]:
+        expected = index.aggregate_by_ticker(trades).nlargest(n, 'dollar_amount').reset_index(drop=True)
+        actual = index.aggregate_top_n(trades, n=n)
+        assert actual["ticker"].tolist() == expected["ticker"].tolist(), n
+        assert np.allclose(actual["dollar_amount"], expected["dollar_amount"])
+    print("✓ Fused top-N matched groupby + nlargest for N in 1, 10, 25, 100")
+
+
+def test_company_resolved_per_ticker():
+    """Test that name variants no longer split a ticker"""
+    index = CongressBuysIndex()
+    df = pd.DataFrame({
+        "ticker": ["NVDA", "NVDA", "NVDA", "AAPL"],
+        "company": ["NVIDIA Corp", "NVIDIA Corporation", "NVIDIA Corporation", "Apple Inc."],
+        "dollar_amount": [100.0, 100.0, 100.0, 250.0],
+    }).astype({"ticker": "category", "company": "category"})
+    result = index.aggregate_top_n(df)
+    assert result["ticker"].tolist() == ["NVDA", "AAPL"]
+    assert result["company"].tolist() == ["NVIDIA Corporation", "Apple Inc."]
+    assert result["dollar_amount"].tolist() == [300.0, 250.0]
+    print("✓ Company names resolved after grouping on the ticker")
+
+
+def test_top_n_from_config():
+    """Test that the index size follows config.TOP_N_CONSTITUENTS"""
+    original = config.TOP_N_CONSTITUENTS
+    try:
+        config.TOP_N_CONSTITUENTS = 5
+        result_df = CongressBuysIndex().generate_index()
+        assert len(result_df) == 5
+        assert abs(result_df["weight"].sum() - 100.0) <= 0.1
+        assert result_df["dollar_amount"].is_monotonic_decreasing
+
+        import app
+        payload = app.build_congress_buys_result(60)
+        assert payload["methodology"].startswith("Top 5 stocks") and "last 60 days" in payload["methodology"]
+        assert len(payload["constituents"]) == 5
+    finally:
+        config.TOP_N_CONSTITUENTS = original
+    print("✓ Index size and methodology taken from config.TOP_N_CONSTITUENTS")
+
+
+if __name__ == "__main__":
+    test_matches_groupby_nlargest()
+    test_company_resolved_per_ticker()
+    test_top_n_from_config()
+    print("All fused top-N tests passed")
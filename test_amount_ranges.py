@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the disclosure amount parser
+Checks formatting variants, open-ended brackets and numeric amounts
+"""
+
+import numpy as np
+import pandas as pd
+
+import config
+import amount_ranges
+from amount_ranges import parse_amount_ranges
+from congress_buys_index import CongressBuysIndex
+
+
+def test_standard_ranges_match_methodology():
+    """Test that every configured range parses to its documented midpoint"""
+    parsed = parse_amount_ranges(pd.Series(list(config.DOLLAR_RANGES)))
+    assert parsed["dollar_amount"].tolist() == list(config.DOLLAR_RANGES.values())
+    assert parsed["dollar_low"].iloc[0] == 1001.0 and parsed["dollar_high"].iloc[0] == 15000.0
+    print(f"✓ {len(config.DOLLAR_RANGES)} standard ranges parsed to their midpoints")
+
+
+def test_formatting_variants():
+    """Test spacing, dashes, open-ended and numeric amounts"""
+    amounts = pd.Series(["$1,001 - $15,000", "$1,001 – $15,000", "$1,001—$15,000", "Over $50,000,000",
+                         "Spouse/DC Over $1,000,000", "$15K-$50K", "15000", 250000.0, None, "$UNKNOWN_RANGE"])
+    parsed = parse_amount_ranges(amounts)
+    assert parsed["dollar_amount"].iloc[:3].tolist() == [8000.5] * 3
+    assert parsed["dollar_amount"].iloc[3] == config.DOLLAR_RANGES["$50,000,001+"]
+    assert parsed.iloc[4].tolist() == [1000001.0, 1500000.5, 2000000.0]
+    assert parsed["dollar_amount"].iloc[5] == 32500.0
+    assert parsed["dollar_amount"].iloc[6:8].tolist() == [15000.0, 250000.0]
+    assert parsed.iloc[8:].isna().all().all()
+    print("✓ Dashes, spacing, 'Over', K suffixes and numeric amounts parsed")
+
+
+def test_distinct_values_parsed_once():
+    """Test that repeated values hit the per-string cache"""
+    amounts = pd.Series(np.random.default_rng(1).choice(list(config.DOLLAR_RANGES), 100000))
+    amount_ranges._parsed_amounts.clear()
+    parse_amount_ranges(amounts)
+    assert len(amount_ranges._parsed_amounts) == len(config.DOLLAR_RANGES)
+    assert parse_amount_ranges(amounts.astype("category"))["dollar_amount"].notna().all()
+    print("✓ 100,000 amounts parsed through the distinct values only")
+
+
+def test_index_bounds():
+    """Test that the pipeline carries low/high bounds through aggregation"""
+    index = CongressBuysIndex()
+    df = index.aggregate_by_ticker(index.prepare_buy_trades(index._get_sample_data()))
+    assert (df["dollar_low"] <= df["dollar_amount"]).all()
+    assert (df["dollar_amount"] <= df["dollar_high"]).all()
+    print("✓ Index totals come with low/high bounds")
+
+
+if __name__ == "__main__":
+    test_standard_ranges_match_methodology()
+    test_formatting_variants()
+    test_distinct_values_parsed_once()
+    test_index_bounds()
+    print("All amount parser tests passed")
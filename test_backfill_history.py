@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the historical backfill
+Checks swept daily snapshots against the per-day pipeline and resumption
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from backfill_history import backfill, load_history, sweep, trading_days
+from congress_buys_index import CongressBuysIndex
+from fixtures import make_trades
+from prefix_index import AsDisclosedWindowIndex, CumulativeDollarIndex
+from trade_store import TradeStore
+
+
+def test_sweep_matches_daily_pipeline():
+    """Test every trading day against top_n_frame + calculate_weights"""
+    prefix_index = CumulativeDollarIndex.from_trades(make_trades(3000))
+    index = CongressBuysIndex()
+    days = trading_days("2024-01-01", "2024-12-31")
+
+    history = sweep(prefix_index, days, days_back=100)
+    for day, snapshot in history.groupby("date", observed=True):
+        expected = index.calculate_weights(prefix_index.top_n_frame(day - pd.Timedelta(days=100), day, 10))
+        assert np.allclose(snapshot["dollar_amount"].to_numpy(), expected["dollar_amount"].to_numpy()), day
+        assert np.allclose(snapshot["weight"].to_numpy(), expected["weight"].to_numpy()), day
+        assert abs(snapshot["weight"].sum() - 100.0) <= 0.1
+    assert history["date"].nunique() == len(days)
+    print(f"✓ {len(days)} daily snapshots matched the per-day pipeline")
+
+
+def test_backfill_resumes():
+    """Test that completed months are skipped after an interruption"""
+    prefix_index = CumulativeDollarIndex.from_trades(make_trades(500))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        written = backfill(prefix_index, "2024-01-01", "2024-06-30", days_back=30, path=tmp_dir)
+        assert written == ["2024-01", "2024-02", "2024-03", "2024-04", "2024-05", "2024-06"]
+        full = load_history(30, tmp_dir)
+
+        # Simulate an interruption that lost March
+        os.remove(os.path.join(tmp_dir, "days_back=30", "month=2024-03.parquet"))
+        written = backfill(prefix_index, "2024-01-01", "2024-06-30", days_back=30, path=tmp_dir)
+        assert written == ["2024-03", "2024-06"]
+
+        resumed = load_history(30, tmp_dir).sort_values(["date", "rank"]).reset_index(drop=True)
+        full = full.sort_values(["date", "rank"]).reset_index(drop=True)
+        assert resumed["weight"].equals(full["weight"])
+        assert len(load_history(30, tmp_dir, start_date="2024-06-01")) < len(full)
+        print(f"✓ Resumed backfill rewrote only the missing and current months ({len(full)} rows)")
+
+
+def test_as_disclosed_sweep_matches_point_in_time_reads():
+    """Test the as-disclosed sweep against per-day as_of reads of a versioned store"""
+    trades = make_trades(400)
+    rng = np.random.default_rng(5)
+    trades["disclosure_date"] = trades["date"] + pd.to_timedelta(rng.integers(0, 45, len(trades)), unit="D")
+    trades["transaction_type"] = "buy"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TradeStore(tmp_dir)
+        store.merge(trades)
+        # Amend a few trades after the fact: new amounts become known on June 1st
+        amended = trades.head(20).assign(dollar_amount=1000000.5).drop(columns=["disclosure_date"])
+        store.merge(amended, ingest_date=pd.Timestamp("2024-06-01"))
+
+        window_index = AsDisclosedWindowIndex.from_trades(store.load(all_versions=True), days_back=60)
+        days = trading_days("2024-02-01", "2024-08-30")
+        history = sweep(window_index, days, days_back=60)
+
+        for day in days[::7]:
+            known = store.get_trades(day - pd.Timedelta(days=60), day, as_of=day)
+            expected = known.groupby("ticker", observed=True)["dollar_amount"].sum().nlargest(10)
+            snapshot = history[history["date"] == day]
+            assert np.allclose(snapshot["dollar_amount"].to_numpy(), expected.to_numpy()), day
+        print(f"✓ As-disclosed sweep matched point-in-time reads on {len(days[::7])} days")
+
+
+if __name__ == "__main__":
+    test_sweep_matches_daily_pipeline()
+    test_backfill_resumes()
+    test_as_disclosed_sweep_matches_point_in_time_reads()
+    print("All backfill tests passed")
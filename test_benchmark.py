@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the pipeline benchmark harness
+Checks the per-stage records, the JSON round trip and regression detection
+"""
+
+import os
+import tempfile
+
+from benchmark import (BUYS_STAGES, EXPOSURE_STAGES, SERIALIZATION_STAGES, compare_results, load_results,
+                       run_benchmarks, save_results)
+
+
+def test_run_and_compare():
+    """Test one small offline run end to end"""
+    results = run_benchmarks([2000], repeats=1)
+    stages = [(r["pipeline"], r["stage"]) for r in results]
+    assert stages == ([("congress_buys", name) for name, _ in BUYS_STAGES] +
+                      [("serialization", name) for name, _ in SERIALIZATION_STAGES] +
+                      [("congress_equity_exposure", name) for name, _ in EXPOSURE_STAGES])
+    assert all(r["seconds"] > 0 and r["peak_mb"] >= 0 for r in results)
+    assert results[-1]["output_rows"] == 10
+
+    encoded = {r["stage"]: r for r in results if r["pipeline"] == "serialization"}
+    assert encoded["records_stdlib"]["output_rows"] == results[0]["output_rows"]
+    assert encoded["columnar_orjson"]["output_bytes"] < encoded["records_orjson"]["output_bytes"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "nested", "baseline.json")
+        save_results(results, path)
+        assert load_results(path) == results
+    assert compare_results(results, results, threshold=0.25) == []
+    print(f"✓ {len(results)} stages timed offline and saved")
+
+
+def test_regressions_beyond_threshold():
+    """Test that only growth beyond both the threshold and the noise floor fails"""
+    baseline = [
+        {"pipeline": "congress_buys", "rows": 1000, "stage": "aggregate_top_n", "seconds": 0.10, "peak_mb": 50.0},
+        {"pipeline": "congress_buys", "rows": 1000, "stage": "calculate_weights", "seconds": 0.001, "peak_mb": 0.1},
+    ]
+    current = [
+        {"pipeline": "congress_buys", "rows": 1000, "stage": "aggregate_top_n", "seconds": 0.20, "peak_mb": 55.0},
+        # Doubled, but within timer noise
+        {"pipeline": "congress_buys", "rows": 1000, "stage": "calculate_weights", "seconds": 0.002, "peak_mb": 0.2},
+        # Not in the baseline
+        {"pipeline": "congress_buys", "rows": 5000, "stage": "aggregate_top_n", "seconds": 9.0, "peak_mb": 900.0},
+    ]
+    regressions = compare_results(current, baseline, threshold=0.25)
+    assert len(regressions) == 1 and "aggregate_top_n: seconds" in regressions[0]
+    assert len(compare_results(current, baseline, threshold=0.05)) == 2
+    print("✓ Regressions flagged beyond the threshold, noise ignored")
+
+
+if __name__ == "__main__":
+    test_run_and_compare()
+    test_regressions_beyond_threshold()
+    print("All benchmark tests passed")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming trade and holdings exports
+Checks CSV and Parquet round trips, the filters and chunked encoding
+"""
+
+import io
+import os
+import tempfile
+
+import pandas as pd
+
+import app
+from exports import iter_csv, iter_parquet
+from synthetic_data import write_holdings_store, write_trade_store
+
+
+def export_client(tmp_dir):
+    os.environ['TRADE_STORE_DIR'] = os.path.join(tmp_dir, "trades")
+    os.environ['HOLDINGS_STORE_DIR'] = os.path.join(tmp_dir, "holdings")
+    return app.app.test_client()
+
+
+def reset():
+    os.environ.pop('TRADE_STORE_DIR', None)
+    os.environ.pop('HOLDINGS_STORE_DIR', None)
+
+
+def test_trades_export_filters():
+    """Test that both formats stream exactly the stored trades the filters select"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = write_trade_store(os.path.join(tmp_dir, "trades"), 20000, seed=5)
+        try:
+            client = export_client(tmp_dir)
+            response = client.get('/api/congress-buys/trades')
+            assert response.is_streamed and response.headers['Content-Type'].startswith('text/csv')
+            assert 'congress_buys_trades.csv' in response.headers['Content-Disposition']
+            assert len(pd.read_csv(io.BytesIO(response.get_data()))) == len(store.get_trades())
+
+            query = '?start_date=2022-02-01&end_date=2022-07-31&ticker=baa,BAC&format=parquet'
+            exported = pd.read_parquet(io.BytesIO(client.get(f'/api/congress-buys/trades{query}').get_data()))
+            expected = store.get_trades(pd.Timestamp('2022-02-01'), pd.Timestamp('2022-07-31'), tickers=['BAA', 'BAC'])
+            assert len(exported) == len(expected) > 0
+            assert set(exported['ticker']) == {'BAA', 'BAC'}
+            assert exported['date'].min() >= pd.Timestamp('2022-02-01')
+            assert exported['date'].max() <= pd.Timestamp('2022-07-31')
+
+            nothing = client.get('/api/congress-buys/trades?ticker=ZZZZ').get_data(as_text=True)
+            assert nothing.startswith('transaction_id,') and nothing.count('\n') == 1
+            assert client.get('/api/congress-buys/trades?format=xlsx').status_code == 400
+            assert client.get('/api/congress-buys/trades?start_date=2022-13-01').status_code == 400
+        finally:
+            reset()
+    print(f"✓ {len(exported)} filtered trades exported as Parquet")
+
+
+def test_holdings_export():
+    """Test quarter ranges and ticker filters on the holdings export"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        holdings_dir = os.path.join(tmp_dir, "holdings")
+        for seed, quarter_end in enumerate(['2024-09-30', '2024-12-31']):
+            write_holdings_store(holdings_dir, 3000, seed, quarter_end_date=quarter_end)
+        try:
+            client = export_client(tmp_dir)
+            everything = pd.read_csv(io.BytesIO(client.get('/api/congress-equity-exposure/holdings').get_data()))
+            assert len(everything) == 6000
+            assert sorted(everything['quarter_end_date'].unique()) == ['2024-09-30', '2024-12-31']
+
+            response = client.get('/api/congress-equity-exposure/holdings?start_date=2024-10-01&ticker=BAA&format=parquet')
+            latest = pd.read_parquet(io.BytesIO(response.get_data()))
+            assert set(latest['quarter_end_date']) == {'2024-12-31'} and set(latest['ticker']) == {'BAA'}
+            assert client.get('/api/congress-buys/trades').status_code == 404
+        finally:
+            reset()
+    print(f"✓ Holdings of 2 quarters exported, {len(latest)} BAA rows in the latest")
+
+
+def test_chunked_encoding():
+    """Test one header across CSV chunks and one row group per Parquet slice"""
+    frames = [pd.DataFrame({'ticker': pd.Categorical(['AAPL', 'MSFT', 'NVDA']), 'value': [1.0, 2.0, 3.0]}),
+              pd.DataFrame({'ticker': pd.Categorical(['TSLA']), 'value': [4.0]})]
+    chunks = list(iter_csv(iter(frames), chunk_rows=2))
+    assert len(chunks) == 3 and b''.join(chunks).decode().count('ticker') == 1
+
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(io.BytesIO(b''.join(iter_parquet(iter(frames), chunk_rows=2))))
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().to_pandas()['ticker'].tolist() == ['AAPL', 'MSFT', 'NVDA', 'TSLA']
+    print("✓ Exports encoded in bounded chunks")
+
+
+if __name__ == "__main__":
+    test_trades_export_filters()
+    test_holdings_export()
+    test_chunked_encoding()
+    print("All export tests passed")
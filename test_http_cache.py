@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for HTTP validators and compression on the index APIs
+Checks stable ETags, 304 responses and gzip encoding
+"""
+
+import gzip
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import app
+import config
+from fixtures import FakeUpstream, make_trade
+from http_cache import content_digest, payload_etag
+from snapshots import publish_snapshots
+from trade_store import TradeStore
+
+
+def test_etag_stable_across_recomputes():
+    """Test that recomputing the same index keeps its ETag and a matching If-None-Match gets a 304"""
+    client = app.app.test_client()
+    app.result_cache.clear()
+    first = client.get('/api/congress-buys?days_back=75')
+    app.result_cache.clear()
+    second = client.get('/api/congress-buys?days_back=75')
+    etag = first.headers['ETag']
+    assert etag.startswith('W/"') and second.headers['ETag'] == etag
+    assert first.headers['Cache-Control'] == 'no-cache' and 'Last-Modified' not in first.headers
+
+    not_modified = client.get('/api/congress-buys?days_back=75', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304 and not_modified.get_data() == b''
+    assert client.get('/api/congress-buys?days_back=76', headers={'If-None-Match': etag}).status_code == 200
+
+    payload = first.get_json()
+    assert payload_etag(dict(payload, last_updated='later')) == payload_etag(payload)
+    assert payload_etag(payload, {'latest_date': '2024-12-31'}) != payload_etag(payload)
+    assert payload_etag(payload, digest=content_digest(payload)) == payload_etag(payload)
+    print(f"✓ ETag {etag} stable across recomputes, revalidation answered with 304")
+
+
+def test_watermark_follows_data_not_syncs():
+    """Test that empty syncs keep the data watermark and amendments move it"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['TRADE_STORE_DIR'] = tmp_dir
+        use_trade_store = config.USE_TRADE_STORE
+        config.USE_TRADE_STORE = True
+        try:
+            store = TradeStore(tmp_dir)
+            upstream = FakeUpstream([make_trade("1", "2024-03-01"), make_trade("2", "2024-03-05")])
+            store.sync(upstream.fetch_range, datetime(2024, 1, 1), datetime(2024, 3, 31))
+            first = app.data_watermark('congress-buys')
+            time.sleep(0.01)
+            store.sync(upstream.fetch_range, datetime(2024, 1, 1), datetime(2024, 3, 31))
+            assert app.data_watermark('congress-buys') == first
+
+            upstream.trades = pd.DataFrame([make_trade("1", "2024-03-01"),
+                                            {**make_trade("2", "2024-03-05"), "amount": "$15,001-$50,000"}])
+            store.sync(upstream.fetch_range, datetime(2024, 1, 1), datetime(2024, 3, 31))
+            assert app.data_watermark('congress-buys') != first
+            assert app.data_watermark('congress-equity-exposure') is None
+        finally:
+            config.USE_TRADE_STORE = use_trade_store
+            os.environ.pop('TRADE_STORE_DIR', None)
+    print("✓ Data watermark unchanged by empty syncs, moved by an amendment")
+
+
+def test_snapshot_etag_matches_live():
+    """Test that a published snapshot revalidates a copy fetched from the live endpoint"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['SNAPSHOT_DIR'] = tmp_dir
+        try:
+            publish_snapshots([job for job in app.precomputed_jobs() if job[0] == 'congress-equity-exposure'],
+                              watermark=app.data_watermark)
+            client = app.app.test_client()
+            live_etag = client.get('/api/congress-equity-exposure').headers['ETag']
+            os.environ['SNAPSHOT_ONLY'] = '1'
+            response = client.get('/api/congress-equity-exposure', headers={'If-None-Match': live_etag})
+            assert response.status_code == 304 and 'X-Snapshot-Version' in response.headers
+        finally:
+            os.environ.pop('SNAPSHOT_DIR', None)
+            os.environ.pop('SNAPSHOT_ONLY', None)
+    print("✓ Snapshot and live responses share ETags")
+
+
+def test_gzip_compression():
+    """Test encoding negotiation and the size floor"""
+    client = app.app.test_client()
+    plain = client.get('/api/congress-buys')
+    encoded = client.get('/api/congress-buys', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert 'Content-Encoding' not in plain.headers and 'Accept-Encoding' in plain.headers['Vary']
+    assert encoded.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(encoded.get_data()) == plain.get_data()
+    assert len(encoded.get_data()) < len(plain.get_data()) / 2
+
+    refused = client.get('/api/congress-buys', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in refused.headers
+    assert 'Content-Encoding' not in client.get('/api/profiles/none', headers={'Accept-Encoding': 'gzip'}).headers
+    print(f"✓ gzip: {len(plain.get_data())} -> {len(encoded.get_data())} bytes")
+
+
+if __name__ == "__main__":
+    test_etag_stable_across_recomputes()
+    test_watermark_follows_data_not_syncs()
+    test_snapshot_etag_matches_live()
+    test_gzip_compression()
+    print("All HTTP caching tests passed")
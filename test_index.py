@@ -80,7 +80,7 @@ def test_individual_steps():
     
     # Step 6: Select top 10
     print("Step 6: Selecting top 10 tickers...")
-    df_top10 = index.select_top_10(df_agg)
+    df_top10 = index.select_top_n(df_agg)
     print(f"   Selected top {len(df_top10)} tickers")
     
     # Step 7: Calculate weights
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the background index refresher
+Verifies snapshot swapping, last-good-snapshot fallback and change detection
+"""
+
+from index_refresher import IndexRefresher
+
+
+def test_refresh_and_fallback():
+    """Test that a failed refresh keeps serving the previous snapshot"""
+    results = [{"constituents": ["NVDA"]}, RuntimeError("upstream timeout")]
+
+    def build():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    refresher = IndexRefresher(interval_seconds=3600, poll_seconds=1)
+    refresher.register("congress-buys", {"days_back": 100}, build)
+
+    assert refresher.get("congress-buys", {"days_back": 100}) is None
+    refresher.refresh_due()
+    snapshot = refresher.get("congress-buys", {"days_back": 100})
+    assert snapshot.value["constituents"] == ["NVDA"]
+
+    refresher.refresh(next(iter(refresher.jobs)))
+    assert refresher.get("congress-buys", {"days_back": 100}) is snapshot
+    assert "upstream timeout" in next(iter(refresher.status()["errors"].values()))
+
+    payload = snapshot.to_payload()
+    assert "last_updated" in payload and payload["staleness_seconds"] >= 0
+    print("✓ Failed refresh kept the last good snapshot")
+
+
+def test_change_token_triggers_refresh():
+    """Test that new upstream data triggers a refresh before the interval elapses"""
+    token = {"value": "2024-03-01"}
+    builds = []
+
+    refresher = IndexRefresher(interval_seconds=3600, poll_seconds=1, change_token=lambda: token["value"])
+    refresher.register("congress-buys", {"days_back": 30}, lambda: builds.append(1) or {"build": len(builds)})
+
+    refresher.refresh_due()
+    refresher.refresh_due()
+    assert len(builds) == 1
+
+    token["value"] = "2024-03-02"
+    refresher.refresh_due()
+    assert len(builds) == 2
+    assert refresher.get("congress-buys", {"days_back": 30}).value == {"build": 2}
+    print("✓ Upstream change triggered a refresh")
+
+
+if __name__ == "__main__":
+    test_refresh_and_fallback()
+    test_change_token_triggers_refresh()
+    print("All refresher tests passed")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for pipeline and upstream instrumentation
+Checks stage records, HTTP calls, cache lookups and the Prometheus endpoint
+"""
+
+import json
+import logging
+import time
+
+import config
+import metrics
+from congress_buys_index import CongressBuysIndex
+from fixtures import FakeSession
+from quiver_client import QuiverQuantClient
+from result_cache import ResultCache
+
+
+class CapturedLogs(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def emit(self, record):
+        self.events.append(json.loads(record.getMessage()))
+
+
+def capture_events():
+    handler = CapturedLogs()
+    metrics.logger.addHandler(handler)
+    metrics.logger.setLevel(logging.DEBUG)
+    return handler
+
+
+def test_pipeline_stages_recorded():
+    """Test one structured record per stage with durations and row counts"""
+    metrics.registry.reset()
+    handler = capture_events()
+    try:
+        CongressBuysIndex().generate_index()
+    finally:
+        metrics.logger.removeHandler(handler)
+        metrics.logger.setLevel(logging.NOTSET)
+
+    stages = [event for event in handler.events if event["event"] == "stage"]
+    assert [event["stage"] for event in stages] == ["fetch_trades", "filter_buys_only", "deduplicate_trades",
+                                                    "convert_dollar_ranges", "aggregate_top_n", "calculate_weights"]
+    assert all(event["status"] == "ok" and event["duration_ms"] >= 0 for event in stages)
+    assert stages[1]["rows_in"] == stages[0]["rows_out"] and stages[-1]["rows_out"] == 10
+
+    text = metrics.registry.render()
+    assert "# TYPE congress_stage_duration_seconds histogram" in text
+    assert 'congress_stage_duration_seconds_count{pipeline="congress_buys",stage="aggregate_top_n"} 1' in text
+    assert 'congress_stage_rows_out_total{pipeline="congress_buys",stage="calculate_weights"} 10' in text
+    print(f"✓ {len(stages)} stages logged and exported")
+
+
+def test_http_and_cache_recorded():
+    """Test upstream calls and result cache lookups"""
+    metrics.registry.reset()
+    client = QuiverQuantClient("test-key", max_workers=2)
+    client.session = FakeSession(delay=0.0)
+    client.fetch_chambers({})
+
+    cache = ResultCache(ttl_seconds=60, max_entries=4)
+    cache.get_or_compute("congress-buys", {"days_back": 100}, lambda: {"ok": True})
+    cache.get_or_compute("congress-buys", {"days_back": 100}, lambda: {"ok": True})
+
+    text = metrics.registry.render()
+    assert ('congress_http_request_duration_seconds_count{service="quiverquant",'
+            'endpoint="/congresstrading/house",status="200"} 1') in text
+    assert 'congress_http_response_rows_total{service="quiverquant",endpoint="/congresstrading/senate"} 1' in text
+    assert 'congress_cache_lookups_total{cache="result",result="hit"} 1' in text
+    assert 'congress_cache_lookups_total{cache="result",result="miss"} 1' in text
+    print("✓ Upstream HTTP calls and cache lookups exported")
+
+
+def test_disabled_is_negligible():
+    """Test that nothing is recorded and a stage costs about a microsecond when disabled"""
+    metrics.registry.reset()
+    original = config.METRICS_ENABLED
+    try:
+        config.METRICS_ENABLED = False
+        start = time.perf_counter()
+        for _ in range(10000):
+            with metrics.stage("congress_buys", "noop", [1, 2, 3]) as step:
+                step.output([1])
+        per_stage = (time.perf_counter() - start) / 10000
+        metrics.record_http("quiverquant", "/x", 200, 0.1, [1])
+        metrics.record_cache("result", "hit")
+    finally:
+        config.METRICS_ENABLED = original
+    assert metrics.registry.render() == "\n"
+    assert per_stage < 20e-6
+    print(f"✓ Disabled instrumentation recorded nothing ({per_stage * 1e6:.2f} µs per stage)")
+
+
+def test_metrics_endpoint():
+    """Test the Prometheus text endpoint"""
+    import app
+    app.result_cache.clear()
+    client = app.app.test_client()
+    client.get('/api/congress-equity-exposure?quarter_end=2024-12-31')
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    assert 'pipeline="congress_equity_exposure",stage="calculate_net_holdings"' in response.get_data(as_text=True)
+    print("✓ /api/metrics served Prometheus text")
+
+
+if __name__ == "__main__":
+    test_pipeline_stages_recorded()
+    test_http_and_cache_recorded()
+    test_disabled_is_negligible()
+    test_metrics_endpoint()
+    print("All metrics tests passed")
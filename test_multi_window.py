@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-window Congress Buys computation
+Checks that one pass over the longest window matches per-window filtering
+"""
+
+import pandas as pd
+
+from congress_buys_index import CongressBuysIndex
+from prefix_index import CumulativeDollarIndex
+from sliding_window import SlidingWindowAggregator
+
+
+def make_upstream_trades(end):
+    """Dated trades spread over the last 200 days, plus one sale"""
+    rows = []
+    tickers = [("NVDA", "NVIDIA Corporation"), ("AAPL", "Apple Inc."), ("MSFT", "Microsoft Corporation"),
+               ("AMD", "Advanced Micro Devices")]
+    amounts = ["$1,001-$15,000", "$15,001-$50,000", "$50,001-$100,000", "$100,001-$250,000"]
+    for i in range(120):
+        ticker, company = tickers[(i * 7) % 4]
+        rows.append({"transaction_id": str(i), "ticker": ticker, "company": company, "transaction_type": "buy",
+                     "amount": amounts[(i * 3) % 4],
+                     "date": (end - pd.Timedelta(days=(i * 13) % 200)).strftime("%Y-%m-%d")})
+    rows.append({"transaction_id": "sale", "ticker": "NVDA", "company": "NVIDIA Corporation",
+                 "transaction_type": "sell", "amount": "$100,001-$250,000", "date": end.strftime("%Y-%m-%d")})
+    return pd.DataFrame(rows)
+
+
+def test_multi_window_matches_single_windows():
+    """Test each window against a direct filter + generate_index style computation"""
+    end = pd.Timestamp.now()
+    trades = make_upstream_trades(end)
+
+    index = CongressBuysIndex()
+    index.set_api_key("test-key")
+    fetches = []
+    index._fetch_trades_range = lambda start, stop: fetches.append((start, stop)) or trades
+
+    results = index.generate_multi_window_index([30, 60, 100, 180], end_date=end)
+    assert len(fetches) == 1
+    assert fetches[0][1] == end
+
+    for days, result_df in results.items():
+        start = (end - pd.Timedelta(days=days)).normalize()
+        window = trades[pd.to_datetime(trades["date"]) >= start]
+        buys = index.convert_dollar_ranges_to_midpoints(index.filter_buys_only(window))
+        totals = buys.groupby("ticker")["dollar_amount"].sum()
+        actual = {ticker: round(total, 2) for ticker, total in zip(result_df["ticker"], result_df["dollar_amount"])}
+        assert actual == totals.round(2).to_dict(), days
+        assert abs(result_df["weight"].sum() - 100.0) <= 0.1
+    print(f"✓ {len(results)} windows from {len(fetches)} fetch")
+
+
+def test_company_names_agree_across_paths():
+    """Test that every path names a ticker by its most reported name, ties alphabetically"""
+    end = pd.Timestamp.now().normalize()
+    names = [("NVDA", "NVIDIA Corp"), ("NVDA", "NVIDIA Corporation"), ("NVDA", "NVIDIA Corporation"),
+             ("AAPL", "Apple Inc."), ("AAPL", "Apple Inc")]
+    trades = pd.DataFrame([{"transaction_id": str(i), "ticker": ticker, "company": company,
+                            "transaction_type": "buy", "amount": "$15,001-$50,000",
+                            "date": (end - pd.Timedelta(days=10 - i)).strftime("%Y-%m-%d")}
+                           for i, (ticker, company) in enumerate(names)])
+    expected = {"NVDA": "NVIDIA Corporation", "AAPL": "Apple Inc"}
+
+    index = CongressBuysIndex()
+    index.set_api_key("test-key")
+    index._fetch_trades_range = lambda start, stop: trades
+    buys = index.prepare_buy_trades(trades)
+
+    aggregator = SlidingWindowAggregator(100)
+    aggregator.add_trades(buys)
+    aggregator.advance(end)
+
+    results = {
+        "generate_index": index.generate_index(100, end_date=end.to_pydatetime()),
+        "multi_window": index.generate_multi_window_index([30, 100], end_date=end)[100],
+        "aggregate_by_ticker": index.aggregate_by_ticker(buys),
+        "prefix_index": CumulativeDollarIndex.from_trades(buys).top_n_frame(end - pd.Timedelta(days=100), end, 10),
+        "sliding_window": aggregator.top_n_frame(10),
+    }
+    for path, result_df in results.items():
+        assert dict(zip(result_df["ticker"].astype(str), result_df["company"])) == expected, path
+    print(f"✓ {len(results)} paths agree on company names")
+
+
+def test_windows_endpoint():
+    """Test the combined endpoint returns every requested window"""
+    import app as app_module
+
+    client = app_module.app.test_client()
+    payload = client.get("/api/congress-buys/windows?windows=30,100").get_json()
+    assert sorted(payload["windows"]) == ["100", "30"]
+    assert client.get("/api/congress-buys/windows?windows=abc").status_code == 400
+    print("✓ /api/congress-buys/windows returned both windows")
+
+
+if __name__ == "__main__":
+    test_multi_window_matches_single_windows()
+    test_company_names_agree_across_paths()
+    test_windows_endpoint()
+    print("All multi-window tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the prefix-sum index
+Checks arbitrary date-range totals against a full groupby
+"""
+
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from congress_buys_index import CongressBuysIndex
+from fixtures import FakeUpstream, make_trade, make_trades
+from prefix_index import CumulativeDollarIndex
+from trade_store import TradeStore
+
+
+def test_range_totals_match_groupby():
+    """Test random [start, end] ranges, including ones past either edge of the history"""
+    trades = make_trades(3000)
+    prefix_index = CumulativeDollarIndex.from_trades(trades)
+    rng = np.random.default_rng(3)
+
+    for _ in range(200):
+        start = pd.Timestamp("2023-12-01") + pd.Timedelta(days=int(rng.integers(0, 420)))
+        end = start + pd.Timedelta(days=int(rng.integers(0, 200)))
+        window = trades[(trades["date"] >= start) & (trades["date"] <= end)]
+        expected = window.groupby("ticker")["dollar_amount"].sum().nlargest(10)
+
+        actual = prefix_index.top_n_frame(start, end, 10)
+        # Compare totals rather than tickers: ties at the cut-off may pick either ticker
+        assert np.allclose(actual["dollar_amount"].to_numpy(), expected.to_numpy()), f"{start} - {end}"
+        totals = window.groupby("ticker")["dollar_amount"].sum()
+        assert np.allclose(totals[actual["ticker"]].to_numpy(), actual["dollar_amount"].to_numpy())
+
+    assert prefix_index.range_totals("2030-01-01", "2030-12-31").sum() == 0
+    print(f"✓ 200 random date ranges matched a full groupby "
+          f"({len(prefix_index.tickers)} tickers x {prefix_index.num_days} days)")
+
+
+def test_generate_index_for_past_end_date():
+    """Test the store-backed pipeline for a window ending in the past"""
+    upstream = FakeUpstream([
+        make_trade("1", "2024-01-05"),
+        {**make_trade("2", "2024-02-10"), "ticker": "AAPL", "company": "Apple Inc.",
+         "amount": "$15,001-$50,000"},
+        {**make_trade("3", "2024-03-20"), "ticker": "MSFT", "company": "Microsoft Corporation"},
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = CongressBuysIndex()
+        index.set_api_key("test-key")
+        index.set_trade_store(TradeStore(tmp_dir))
+        index._fetch_trades_range = upstream.fetch_range
+
+        result_df = index.generate_index(days_back=45, end_date=datetime(2024, 2, 15))
+        assert list(result_df["ticker"]) == ["AAPL", "NVDA"]
+
+        # A second range over the same history is answered without refetching it
+        requests_before = len(upstream.requests)
+        result_df = index.generate_index(days_back=30, end_date=datetime(2024, 3, 31))
+        assert list(result_df["ticker"]) == ["MSFT"]
+        assert all(start >= datetime(2024, 2, 15) for start, _ in upstream.requests[requests_before:])
+        print("✓ Historical windows served from the prefix-sum index")
+
+
+if __name__ == "__main__":
+    test_range_totals_match_groupby()
+    test_generate_index_for_past_end_date()
+    print("All prefix index tests passed")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent price cache
+Verifies that past closes are served without refetching and that intraday
+quotes expire after their TTL
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+import congress_equity_exposure_index
+from congress_equity_exposure_index import SAMPLE_PRICES, CongressEquityExposureIndex
+from price_cache import CachedPriceProvider, PriceCache, market_close_timestamp
+from price_providers import FilePriceProvider, PriceProvider
+
+
+class CountingProvider(PriceProvider):
+    """Returns a fixed price and records every ticker batch it is asked for"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_prices(self, tickers, as_of=None):
+        self.calls.append((list(tickers), as_of))
+        return {ticker: 100.0 for ticker in tickers}
+
+
+def test_historical_closes_cached_forever():
+    """Test that re-pricing a past date needs no provider calls, even across instances"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = os.path.join(tmp_dir, "prices.sqlite")
+        upstream = CountingProvider()
+
+        provider = CachedPriceProvider(upstream, PriceCache(cache_file, intraday_ttl_seconds=0))
+        provider.get_prices(["NVDA", "AAPL"], as_of="2024-12-31")
+
+        reopened = CachedPriceProvider(upstream, PriceCache(cache_file, intraday_ttl_seconds=0))
+        assert reopened.get_prices(["NVDA", "AAPL"], as_of="2024-12-31") == {"NVDA": 100.0, "AAPL": 100.0}
+        assert upstream.calls == [(["NVDA", "AAPL"], "2024-12-31")]
+        print("✓ Past quarter re-priced with no upstream calls")
+
+
+def test_intraday_quotes_expire():
+    """Test that today's quotes are reused within the TTL and refetched after it"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        upstream = CountingProvider()
+        provider = CachedPriceProvider(upstream, PriceCache(os.path.join(tmp_dir, "prices.sqlite"),
+                                                            intraday_ttl_seconds=0.2))
+        provider.get_prices(["NVDA"])
+        provider.get_prices(["NVDA"])
+        assert len(upstream.calls) == 1
+
+        time.sleep(0.25)
+        provider.get_prices(["NVDA"])
+        assert len(upstream.calls) == 2
+        print("✓ Intraday quote refetched after TTL")
+
+
+def test_intraday_quote_not_kept_as_close():
+    """Test that a quote cached before the close is refetched once its date is in the past"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = os.path.join(tmp_dir, "prices.sqlite")
+        upstream = CountingProvider()
+        provider = CachedPriceProvider(upstream, PriceCache(cache_file))
+
+        # Yesterday's quote, cached an hour before that day's close
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        provider.get_prices(["NVDA"], as_of=yesterday)
+        with sqlite3.connect(cache_file) as connection:
+            connection.execute("UPDATE prices SET fetched_at = ?", (market_close_timestamp(yesterday) - 3600,))
+
+        provider.get_prices(["NVDA"], as_of=yesterday)
+        provider.get_prices(["NVDA"], as_of=yesterday)
+        assert upstream.calls == [(["NVDA"], yesterday), (["NVDA"], yesterday)]
+        print("✓ Intraday quote refetched as the close, then kept")
+
+
+def test_quarter_end_valuation():
+    """Test that a completed quarter is valued at its quarter-end close"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        price_file = os.path.join(tmp_dir, "prices.csv")
+        pd.DataFrame({
+            "ticker": ["NVDA", "NVDA", "NVDA"],
+            "date": ["2024-12-30", "2024-12-31", "2025-01-02"],
+            "price": [130.0, 134.0, 138.0],
+        }).to_csv(price_file, index=False)
+
+        index = CongressEquityExposureIndex()
+        index.set_price_provider(FilePriceProvider(price_file))
+        holdings = index._get_sample_holdings_data()
+        index.calculate_net_holdings(holdings, valuation_date=index._get_valuation_date("2024-12-31"))
+        assert index.current_prices["NVDA"] == 134.0
+
+        index.calculate_net_holdings(holdings)
+        assert index.current_prices["NVDA"] == 138.0
+        print("✓ Quarter-end close used for a past quarter")
+
+
+def test_past_quarter_skips_sample_prices():
+    """Test that a past as_of is priced by the live provider, never from SAMPLE_PRICES"""
+    upstream = CountingProvider()
+    default_provider = congress_equity_exposure_index.default_price_provider
+    congress_equity_exposure_index.default_price_provider = lambda: upstream
+    try:
+        index = CongressEquityExposureIndex()
+        index.set_api_key("test-key")
+        assert index.get_current_prices(["NVDA", "AAPL"], as_of="2024-12-31") == {"NVDA": 100.0, "AAPL": 100.0}
+        assert upstream.calls == [(["AAPL", "NVDA"], "2024-12-31")]
+
+        # Current valuations still start from the sample prices
+        assert index.get_current_prices(["NVDA"])["NVDA"] == SAMPLE_PRICES["NVDA"]
+    finally:
+        congress_equity_exposure_index.default_price_provider = default_provider
+    print("✓ Past quarter priced at its own close, not the sample prices")
+
+
+if __name__ == "__main__":
+    test_historical_closes_cached_forever()
+    test_intraday_quotes_expire()
+    test_intraday_quote_not_kept_as_close()
+    test_quarter_end_valuation()
+    test_past_quarter_skips_sample_prices()
+    print("All price cache tests passed")
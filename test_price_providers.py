@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable price providers
+Runs fully offline: file-backed prices, fallback chains and parsing of a
+multi-ticker download frame
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from congress_equity_exposure_index import CongressEquityExposureIndex
+from price_providers import FallbackPriceProvider, FilePriceProvider, StaticPriceProvider, latest_closes
+
+
+def test_file_provider_and_fallback():
+    """Test an offline price file backed by a second provider"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        price_file = os.path.join(tmp_dir, "prices.csv")
+        pd.DataFrame({"ticker": ["NVDA", "AAPL"], "price": [900.0, 190.0]}).to_csv(price_file, index=False)
+
+        provider = FallbackPriceProvider([FilePriceProvider(price_file), StaticPriceProvider({"MSFT": 410.0})])
+        prices = provider.get_prices(["NVDA", "MSFT", "ZZZZ"])
+        assert prices == {"NVDA": 900.0, "MSFT": 410.0}
+        print(f"✓ File + fallback prices: {prices}")
+
+
+def test_latest_closes_from_bulk_download():
+    """Test that the last non-missing close per ticker is used"""
+    index = pd.date_range("2024-12-27", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([["Close", "Open"], ["AAPL", "NVDA"]])
+    frame = pd.DataFrame([[180.0, 850.0, 1, 1], [181.0, 855.0, 1, 1], [182.0, np.nan, 1, 1]],
+                         index=index, columns=columns)
+
+    assert latest_closes(frame, ["AAPL", "NVDA"]) == {"AAPL": 182.0, "NVDA": 855.0}
+    print("✓ Latest closes parsed from a multi-ticker frame")
+
+
+def test_equity_index_with_offline_provider():
+    """Test that the equity index values holdings using the injected provider"""
+    index = CongressEquityExposureIndex()
+    index.set_price_provider(StaticPriceProvider({"NVDA": 1000.0}))
+
+    df = index.calculate_net_holdings(index._get_sample_holdings_data())
+    nvda = df[df["ticker"] == "NVDA"]
+    assert (nvda["dollar_value"] == nvda["net_shares"] * 1000.0).all()
+    assert index.current_prices["AAPL"] == 100.0  # Unpriced tickers use the default price
+    print("✓ Equity index priced offline")
+
+
+if __name__ == "__main__":
+    test_file_provider_and_fallback()
+    test_latest_closes_from_bulk_download()
+    test_equity_index_with_offline_provider()
+    print("All price provider tests passed")
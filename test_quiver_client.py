@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared QuiverQuant fetch layer
+Verifies concurrent chamber fetching and date slicing without network access
+"""
+
+import time
+from datetime import datetime
+
+from fixtures import FakeSession
+from quiver_client import QuiverQuantClient, date_slices
+
+
+def test_date_slices():
+    """Test that date slices cover the window without overlap"""
+    start = datetime(2024, 1, 1)
+    end = datetime(2024, 1, 31)
+
+    assert date_slices(start, end, 0) == [(start, end)]
+
+    slices = date_slices(start, end, 10)
+    assert slices[0][0] == start
+    assert slices[-1][1] == end
+    for (_, prev_end), (next_start, _) in zip(slices, slices[1:]):
+        assert (next_start - prev_end).days == 1
+    print(f"✓ {len(slices)} slices cover {start.date()} → {end.date()}")
+
+
+def test_chambers_fetched_concurrently():
+    """Test that House and Senate requests overlap and share one session"""
+    client = QuiverQuantClient("test-key", max_workers=4, timeout=5)
+    client.session = FakeSession(delay=0.2)
+
+    started = time.perf_counter()
+    data = client.fetch_chambers({}, start_date=datetime(2024, 1, 1), end_date=datetime(2024, 3, 1),
+                                 slice_days=30)
+    elapsed = time.perf_counter() - started
+
+    calls = client.session.calls
+    assert len(calls) == len(data) == 4  # 2 chambers x 2 slices
+    assert all(timeout == 5 for _, _, timeout in calls)
+    assert elapsed < 0.6, f"requests ran serially ({elapsed:.2f}s)"
+
+    # Results keep House-before-Senate job order regardless of completion order
+    assert [row["url"].endswith("/house") for row in data] == [True, True, False, False]
+    print(f"✓ {len(calls)} sub-requests completed in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_date_slices()
+    test_chambers_fetched_concurrently()
+    print("All fetch layer tests passed")
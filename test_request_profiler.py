@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for opt-in per-request profiling
+Checks the config gate, the token, the saved report and the response headers
+"""
+
+import os
+import pstats
+import tempfile
+
+import config
+import app
+
+
+def profiled_client(tmp_dir, token="s3cret"):
+    os.environ['PROFILE_DIR'] = tmp_dir
+    os.environ['PROFILING_TOKEN'] = token
+    config.PROFILING_ENABLED = True
+    return app.app.test_client()
+
+
+def reset():
+    config.PROFILING_ENABLED = False
+    os.environ.pop('PROFILE_DIR', None)
+    os.environ.pop('PROFILING_TOKEN', None)
+
+
+def test_off_by_default():
+    """Test that the flag is ignored unless profiling is enabled in config"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['PROFILE_DIR'] = tmp_dir
+        try:
+            response = app.app.test_client().get('/api/congress-buys?profile=1')
+        finally:
+            reset()
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers and 'Server-Timing' not in response.headers
+        assert os.listdir(tmp_dir) == []
+    print("✓ Profiling flag ignored while disabled")
+
+
+def test_profiled_request_report():
+    """Test the per-stage breakdown, function stats and raw profile of one request"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            client = profiled_client(tmp_dir)
+            # Served from the result cache first; a profiled request still runs the pipeline
+            client.get('/api/congress-buys?days_back=45')
+            response = client.get('/api/congress-buys?days_back=45&profile=s3cret')
+            profile_id = response.headers['X-Profile-Id']
+            assert response.status_code == 200 and response.get_json()['constituents']
+            assert 'aggregate_top_n;desc="congress_buys";dur=' in response.headers['Server-Timing']
+
+            assert client.get(f'/api/profiles/{profile_id}').status_code == 404
+            report = client.get(f'/api/profiles/{profile_id}', headers={'X-Profile': 's3cret'}).get_json()
+            assert [stage['stage'] for stage in report['stages']][0] == 'fetch_trades'
+            assert report['stages'][-1]['rows_out'] == 10
+            assert report['duration_ms'] >= sum(stage['duration_ms'] for stage in report['stages'])
+            assert any(row['function'] == 'aggregate_top_n' for row in report['functions'])
+            assert pstats.Stats(os.path.join(tmp_dir, f"{profile_id}.prof")).total_calls > 0
+
+            assert client.get('/api/profiles/../../etc?profile=s3cret').status_code == 404
+        finally:
+            reset()
+    print(f"✓ Profile {profile_id} saved with {len(report['stages'])} stages")
+
+
+def test_token_required():
+    """Test that only the configured token turns profiling on, and no token means no profiling"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            client = profiled_client(tmp_dir, token="")
+            assert 'X-Profile-Id' not in client.get('/api/congress-equity-exposure?profile=1').headers
+
+            client = profiled_client(tmp_dir)
+            assert 'X-Profile-Id' not in client.get('/api/congress-equity-exposure?profile=1').headers
+            response = client.get('/api/congress-equity-exposure', headers={'X-Profile': 's3cret'})
+            assert 'X-Profile-Id' in response.headers
+            assert 'calculate_net_holdings' in response.headers['Server-Timing']
+        finally:
+            reset()
+    print("✓ Profiling restricted to the configured token")
+
+
+def test_saved_profiles_capped():
+    """Test that only the newest PROFILE_MAX_SAVED profiles are kept"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        max_saved = config.PROFILE_MAX_SAVED
+        config.PROFILE_MAX_SAVED = 2
+        try:
+            client = profiled_client(tmp_dir)
+            ids = [client.get('/api/congress-buys?profile=s3cret').headers['X-Profile-Id'] for _ in range(3)]
+        finally:
+            config.PROFILE_MAX_SAVED = max_saved
+            reset()
+        assert sorted(os.listdir(tmp_dir)) == sorted(f"{profile_id}.{ext}" for profile_id in ids[1:]
+                                                     for ext in ("json", "prof"))
+    print("✓ Oldest saved profile deleted beyond the cap")
+
+
+if __name__ == "__main__":
+    test_off_by_default()
+    test_profiled_request_report()
+    test_token_required()
+    test_saved_profiles_capped()
+    print("All request profiling tests passed")
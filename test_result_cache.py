@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the API result cache
+Verifies TTL expiry, LRU eviction, the file-based shared tier and the
+hit/miss counters reported by /api/health
+"""
+
+import tempfile
+import time
+
+from result_cache import FileCacheBackend, MemoryCache, ResultCache
+
+
+def test_memory_cache_ttl_and_lru():
+    """Test that entries expire after the TTL and the oldest is evicted first"""
+    cache = MemoryCache(max_entries=2, ttl_seconds=0.2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    time.sleep(0.25)
+    assert cache.get("a") is None
+    print("✓ TTL expiry and LRU eviction")
+
+
+def test_shared_file_backend():
+    """Test that a second process-local cache is served from the shared tier"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        first = ResultCache(ttl_seconds=60, max_entries=8, shared_backend=FileCacheBackend(tmp_dir, 8, 60))
+        second = ResultCache(ttl_seconds=60, max_entries=8, shared_backend=FileCacheBackend(tmp_dir, 8, 60))
+
+        calls = []
+        compute = lambda: calls.append(1) or {"constituents": [{"ticker": "NVDA", "weight": 100.0}]}
+
+        first.get_or_compute("congress-buys", {"days_back": 30}, compute)
+        value = second.get_or_compute("congress-buys", {"days_back": 30}, compute)
+
+        assert len(calls) == 1
+        assert value["constituents"][0]["ticker"] == "NVDA"
+        assert second.stats()["shared_hits"] == 1
+        print("✓ Shared file tier reused across cache instances")
+
+
+def test_api_cache_counters():
+    """Test that repeated API calls hit the cache and show up on /api/health"""
+    import app as app_module
+
+    app_module.result_cache.clear()
+    client = app_module.app.test_client()
+
+    before = app_module.result_cache.stats()
+    first = client.get("/api/congress-buys?days_back=100").get_json()
+    second = client.get("/api/congress-buys?days_back=100").get_json()
+    assert first == second
+
+    health = client.get("/api/health").get_json()
+    assert health["cache"]["misses"] == before["misses"] + 1
+    assert health["cache"]["hits"] == before["hits"] + 1
+    print(f"✓ Cache stats on /api/health: {health['cache']}")
+
+
+if __name__ == "__main__":
+    test_memory_cache_ttl_and_lru()
+    test_shared_file_backend()
+    test_api_cache_counters()
+    print("All result cache tests passed")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for column-wise JSON serialization
+Checks parity with to_dict('records'), missing values and ?format=columnar
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+import app
+from serialization import dumps, frame_columns, frame_records
+from synthetic_data import generate_trades
+
+
+def test_records_match_to_dict():
+    """Test the column-wise records against pandas' own records on synthetic trades"""
+    df = generate_trades(5000, seed=3)
+    expected = json.loads(df.to_json(orient="records", date_format="iso"))
+    records = json.loads(dumps(frame_records(df)))
+    for row in expected:
+        for column in ["date", "disclosure_date"]:
+            row[column] = row[column][:10] if row[column] else None
+    assert records == expected
+    assert json.loads(dumps(frame_columns(df))) == {column: [row[column] for row in expected] for column in df.columns}
+    print(f"✓ {len(records):,} trades encoded column-wise, identical to to_dict('records')")
+
+
+def test_missing_values_are_null():
+    """Test NaN, NaT, None and nullable extension values"""
+    df = pd.DataFrame({
+        "price": [1.5, np.nan],
+        "shares": pd.array([3, None], dtype="Int64"),
+        "ticker": pd.Categorical(["AAPL", None]),
+        "filed": pd.to_datetime(["2024-03-01 09:30", None]),
+    })
+    assert dumps(frame_columns(df)) == (b'{"price":[1.5,null],"shares":[3,null],"ticker":["AAPL",null],'
+                                        b'"filed":["2024-03-01T09:30:00",null]}')
+    print("✓ Missing values encoded as null")
+
+
+def test_columnar_format_endpoint():
+    """Test ?format=columnar against the default records response"""
+    client = app.app.test_client()
+    records = client.get('/api/congress-equity-exposure').get_json()
+    columnar = client.get('/api/congress-equity-exposure?format=columnar').get_json()
+    assert columnar['constituents']['ticker'] == [row['ticker'] for row in records['constituents']]
+    assert columnar['constituents']['weight'] == [row['weight'] for row in records['constituents']]
+
+    windows = client.get('/api/congress-buys/windows?windows=30,100&format=columnar').get_json()
+    assert set(windows['windows']['100']['constituents']) >= {'ticker', 'dollar_amount', 'weight'}
+    assert client.get('/api/congress-buys?format=csv').status_code == 400
+    print("✓ Columnar responses carry the same constituents")
+
+
+if __name__ == "__main__":
+    test_records_match_to_dict()
+    test_missing_values_are_null()
+    test_columnar_format_endpoint()
+    print("All serialization tests passed")
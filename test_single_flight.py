@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight request coalescing
+Verifies that concurrent identical computations run once and share the result
+"""
+
+import threading
+import time
+
+from result_cache import ResultCache
+from single_flight import SingleFlight
+
+
+def run_concurrently(count, target):
+    """Start count threads on target together and wait for all of them"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_misses_share_one_computation():
+    """Test that eight cold-cache requests trigger one pipeline run"""
+    cache = ResultCache(ttl_seconds=60, max_entries=8)
+    calls = []
+
+    def slow_pipeline():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"constituents": ["NVDA"]}
+
+    results = run_concurrently(8, lambda: cache.get_or_compute("congress-buys", {"days_back": 100}, slow_pipeline))
+
+    assert len(calls) == 1
+    assert all(result == {"constituents": ["NVDA"]} for result in results)
+    assert cache.stats()["coalesced"] + 1 + cache.stats()["hits"] == 8
+    print(f"✓ 8 concurrent requests, 1 computation ({cache.stats()['coalesced']} coalesced)")
+
+
+def test_errors_are_shared_and_not_cached():
+    """Test that waiters see the leader's exception and the next call retries"""
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("rate limited")
+
+    results = run_concurrently(4, lambda: flight.do("prices", failing))
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight() == 0
+    assert flight.do("prices", lambda: 42) == 42
+    print("✓ Errors shared with waiters, next call retried")
+
+
+if __name__ == "__main__":
+    test_concurrent_misses_share_one_computation()
+    test_errors_are_shared_and_not_cached()
+    print("All single-flight tests passed")
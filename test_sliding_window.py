@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for the sliding-window aggregator
+Checks running totals and top-N against a full groupby as the window slides
+"""
+
+import tempfile
+
+import pandas as pd
+
+from congress_buys_index import CongressBuysIndex
+from fixtures import make_trades
+from sliding_window import SlidingWindowAggregator
+from trade_store import TradeStore
+
+
+def full_top_n(trades, end, days_back, n):
+    """Reference: full groupby over the window"""
+    start = (end - pd.Timedelta(days=days_back)).normalize()
+    window = trades[(trades["date"] >= start) & (trades["date"] <= end)]
+    return window.groupby("ticker")["dollar_amount"].sum().nlargest(n)
+
+
+def test_matches_full_groupby_while_sliding():
+    """Test daily advances with trades disclosed late and out of order"""
+    trades = make_trades(3000)
+    aggregator = SlidingWindowAggregator(days_back=100)
+
+    # Disclosures arrive in batches by an arbitrary order, not by trade date
+    shuffled = trades.sample(frac=1, random_state=1)
+    batches = [shuffled.iloc[i::5] for i in range(5)]
+    end = pd.Timestamp("2024-04-15")
+    aggregator.add_trades(batches[0])
+    aggregator.advance(end)
+
+    for day in range(1, 200):
+        if day % 40 == 0:
+            aggregator.add_trades(batches[day // 40])
+        end = pd.Timestamp("2024-04-15") + pd.Timedelta(days=day)
+        aggregator.advance(end)
+
+        # Only trades added so far are known to the aggregator
+        known = pd.concat(batches[:day // 40 + 1])
+        expected = full_top_n(known, end, 100, 10)
+        actual = dict(aggregator.top_n(10))
+        assert set(actual) == set(expected.index), f"day {day}"
+        for ticker, total in expected.items():
+            assert abs(actual[ticker] - total) < 1e-6
+
+    print(f"✓ Top-10 matched a full groupby on 200 daily advances ({aggregator.window_size()} trades in window)")
+
+
+def test_duplicates_ignored():
+    """Test that re-sending overlapping deltas does not double count"""
+    trades = make_trades(50)
+    aggregator = SlidingWindowAggregator(days_back=365)
+    aggregator.advance(pd.Timestamp("2024-12-31"))
+    assert aggregator.add_trades(trades) == 50
+    assert aggregator.add_trades(trades.head(10)) == 0
+    assert abs(sum(aggregator.totals.values()) - trades["dollar_amount"].sum()) < 1e-6
+    print("✓ Overlapping deltas counted once")
+
+
+def test_concurrent_advance_and_eviction():
+    """Test that a stale advance does not move the window back and evicted ids are forgotten"""
+    trades = make_trades(500)
+    aggregator = SlidingWindowAggregator(days_back=30)
+    aggregator.add_trades(trades)
+    aggregator.advance(pd.Timestamp("2024-06-30"))
+    totals = dict(aggregator.totals)
+
+    # A refresh that started earlier finishes last
+    aggregator.advance(pd.Timestamp("2024-06-29"))
+    assert aggregator.window_end == pd.Timestamp("2024-06-30")
+    assert dict(aggregator.totals) == totals
+
+    window_ids = set(trades.loc[trades["date"] >= pd.Timestamp("2024-05-31"), "transaction_id"])
+    assert set(aggregator.trades) == window_ids
+    assert aggregator.add_trades(trades) == 0
+    print(f"✓ Stale advance ignored, known trades pruned to {len(window_ids)} in or after the window")
+
+
+def test_incremental_index_sample_data():
+    """Test that sample data (dated 2024) is not slid out of a window ending today"""
+    index = CongressBuysIndex()
+    result_df = index.generate_index_incremental(SlidingWindowAggregator(days_back=100))
+    assert len(result_df) > 0
+    assert abs(result_df["weight"].sum() - 100.0) <= 0.1
+    print(f"✓ Incremental index built from {len(result_df)} sample constituents")
+
+
+def test_incremental_index_late_disclosure():
+    """Test that a late filing dated before the newest trade seen still enters the window"""
+    now = pd.Timestamp.now().normalize()
+
+    def trade(transaction_id, ticker, days_ago, disclosed_days_ago):
+        return {"transaction_id": transaction_id, "ticker": ticker, "company": f"{ticker} Corp",
+                "transaction_type": "buy", "amount": "$15,001-$50,000",
+                "date": (now - pd.Timedelta(days=days_ago)).strftime("%Y-%m-%d"),
+                "disclosure_date": (now - pd.Timedelta(days=disclosed_days_ago)).strftime("%Y-%m-%d")}
+
+    upstream = [trade("1", "NVDA", 20, 5), trade("2", "AAPL", 2, 1)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = CongressBuysIndex()
+        index.set_api_key("test-key")
+        index.set_trade_store(TradeStore(tmp_dir))
+        index._fetch_trades_range = lambda start, stop: pd.DataFrame(upstream)
+
+        aggregator = SlidingWindowAggregator(days_back=100)
+        assert set(index.generate_index_incremental(aggregator)["ticker"]) == {"NVDA", "AAPL"}
+
+        upstream.append(trade("3", "MSFT", 30, 0))
+        assert set(index.generate_index_incremental(aggregator)["ticker"]) == {"NVDA", "AAPL", "MSFT"}
+    print("✓ Late disclosure picked up by the incremental refresh")
+
+
+def test_incremental_index_amendments():
+    """Test that amending a trade between incremental runs matches a full rebuild"""
+    now = pd.Timestamp.now().normalize()
+
+    def trade(transaction_id, ticker, days_ago, amount="$1,001-$15,000", transaction_type="buy"):
+        return {"transaction_id": transaction_id, "ticker": ticker, "company": f"{ticker} Corp",
+                "transaction_type": transaction_type, "amount": amount,
+                "date": (now - pd.Timedelta(days=days_ago)).strftime("%Y-%m-%d")}
+
+    upstream = {"1": trade("1", "NVDA", 10), "2": trade("2", "AAPL", 12, "$15,001-$50,000"),
+                "3": trade("3", "MSFT", 15, "$50,001-$100,000")}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = CongressBuysIndex()
+        index.set_api_key("test-key")
+        index.set_trade_store(TradeStore(tmp_dir))
+        index._fetch_trades_range = lambda start, stop: pd.DataFrame(list(upstream.values()))
+
+        aggregator = SlidingWindowAggregator(days_back=100)
+        index.generate_index_incremental(aggregator)
+
+        # NVDA amended to a far larger bracket, MSFT amended into a sale
+        upstream["1"] = trade("1", "NVDA", 10, "$1,000,001-$5,000,000")
+        upstream["3"] = trade("3", "MSFT", 15, "$50,001-$100,000", transaction_type="sell")
+        incremental = index.generate_index_incremental(aggregator)
+        rebuilt = index.generate_index(days_back=100)
+
+        totals = lambda result_df: dict(zip(result_df["ticker"], result_df["dollar_amount"].round(2)))
+        assert totals(incremental) == totals(rebuilt) == {"NVDA": 3000000.5, "AAPL": 32500.5}
+    print("✓ Amended and withdrawn buys replaced in the incremental index")
+
+
+if __name__ == "__main__":
+    test_matches_full_groupby_while_sliding()
+    test_duplicates_ignored()
+    test_concurrent_advance_and_eviction()
+    test_incremental_index_sample_data()
+    test_incremental_index_late_disclosure()
+    test_incremental_index_amendments()
+    print("All sliding window tests passed")
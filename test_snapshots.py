@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for published snapshots and cold start
+Checks versioned publishing, snapshot serving and that app imports without pandas
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import app
+import config
+from snapshots import current_manifest, find_snapshot, publish_snapshots
+from startup_report import by_package, startup_report
+
+SAMPLE_JOBS = [('congress-buys', {'days_back': 30}, lambda: {'constituents': [{'ticker': 'AAPL'}]})]
+
+# A cold snapshot-only instance serving one request, in a fresh interpreter
+SNAPSHOT_REQUEST = """
+import sys
+import app
+response = app.app.test_client().get('/api/congress-buys?days_back=30')
+assert response.status_code == 200, response.status_code
+assert response.get_json()['constituents'][0]['ticker'] == 'AAPL'
+assert app.app.test_client().get('/api/congress-buys?days_back=31').status_code == 404
+columnar = app.app.test_client().get('/api/congress-buys?days_back=30&format=columnar')
+assert columnar.status_code == 200 and columnar.get_json()['constituents'] == {'ticker': ['AAPL']}
+assert 'pandas' not in sys.modules, 'pandas imported'
+"""
+
+
+def test_publish_versions():
+    """Test content-hashed files, the manifest, the current pointer and pruning"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['SNAPSHOT_DIR'] = tmp_dir
+        try:
+            versions = [publish_snapshots(SAMPLE_JOBS)['version'] for _ in range(config.SNAPSHOT_KEEP_VERSIONS + 1)]
+            assert current_manifest()['version'] == versions[-1]
+            assert sorted(name for name in os.listdir(tmp_dir) if name != 'current.json') == versions[1:]
+
+            entry = find_snapshot('congress-buys', {'days_back': 30})
+            with open(entry['file'], 'rb') as f:
+                body = f.read()
+            assert hashlib.sha256(body).hexdigest() == entry['sha256'] and entry['sha256'][:16] in entry['path']
+            assert json.loads(body) == {'constituents': [{'ticker': 'AAPL'}]}
+            assert entry['cache_control'] == config.SNAPSHOT_FILE_CACHE_CONTROL
+            assert find_snapshot('congress-buys', {'days_back': 60}) is None
+        finally:
+            os.environ.pop('SNAPSHOT_DIR', None)
+    print(f"✓ Published {len(versions)} versions, kept the newest {config.SNAPSHOT_KEEP_VERSIONS}")
+
+
+def test_every_dashboard_combination_served():
+    """Test publishing the real jobs and serving them from the API and /snapshots/"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['SNAPSHOT_DIR'] = tmp_dir
+        os.environ['SERVE_SNAPSHOTS'] = '1'
+        try:
+            manifest = publish_snapshots(app.precomputed_jobs())
+            client = app.app.test_client()
+            for url in ['/api/congress-buys', '/api/congress-buys?days_back=30',
+                        '/api/congress-buys/windows?windows=30,60,100,180',
+                        '/api/congress-equity-exposure', '/api/congress-equity-exposure?quarter_end=2024-06-30']:
+                response = client.get(url)
+                assert response.status_code == 200 and response.headers['X-Snapshot-Version'] == manifest['version']
+                assert response.headers['Cache-Control'] == config.SNAPSHOT_API_CACHE_CONTROL
+            # Not published, so computed as before
+            assert 'X-Snapshot-Version' not in client.get('/api/congress-buys?days_back=45').headers
+
+            # Columnar variants are published too, with the content and ETag the live endpoint produces
+            url = '/api/congress-equity-exposure?quarter_end=2024-06-30&format=columnar'
+            published = client.get(url)
+            os.environ['SERVE_SNAPSHOTS'] = '0'
+            live = client.get(url)
+            os.environ['SERVE_SNAPSHOTS'] = '1'
+            assert 'X-Snapshot-Version' in published.headers and 'X-Snapshot-Version' not in live.headers
+            assert published.get_json()['constituents'] == live.get_json()['constituents']
+            assert published.headers['ETag'] == live.headers['ETag']
+
+            entry = next(iter(manifest['entries'].values()))
+            response = client.get(f"/snapshots/{entry['path']}")
+            assert response.status_code == 200 and len(response.get_data()) == entry['bytes']
+            assert response.headers['Cache-Control'] == config.SNAPSHOT_FILE_CACHE_CONTROL
+            assert client.get('/snapshots/current.json').get_json()['version'] == manifest['version']
+            assert client.get('/snapshots/../app.py').status_code == 404
+        finally:
+            os.environ.pop('SNAPSHOT_DIR', None)
+            os.environ.pop('SERVE_SNAPSHOTS', None)
+    print(f"✓ {len(manifest['entries'])} dashboard combinations published and served")
+
+
+def test_snapshot_only_serving_skips_pandas():
+    """Test a cold snapshot-only start end to end in a fresh interpreter"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, SNAPSHOT_DIR=tmp_dir, SNAPSHOT_ONLY='1')
+        publish_snapshots(SAMPLE_JOBS, tmp_dir)
+        completed = subprocess.run([sys.executable, '-c', SNAPSHOT_REQUEST], env=env,
+                                   capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert completed.returncode == 0, completed.stderr
+    print("✓ Snapshot-only instance served a snapshot without importing pandas")
+
+
+def test_startup_report():
+    """Test the per-package import breakdown of a cold app import"""
+    report = startup_report('app')
+    assert report['heavy_modules_loaded'] == []
+    assert 'flask' in report['packages'] and 'pandas' not in report['packages']
+    assert sum(report['packages'].values()) <= report['total_seconds'] + 0.01
+
+    rows = [('pandas', 0, 0.2, 0.5), ('pandas.core', 1, 0.3, 0.3), ('json', 0, 0.01, 0.01)]
+    assert by_package(rows) == {'pandas': 0.5, 'json': 0.01}
+
+    health = app.app.test_client().get('/api/health').get_json()['startup']
+    assert health['mode'] == 'live' and health['import_seconds'] > 0
+    print(f"✓ Cold app import took {report['total_seconds'] * 1000:.0f} ms without heavy modules")
+
+
+if __name__ == "__main__":
+    test_publish_versions()
+    test_every_dashboard_combination_served()
+    test_snapshot_only_serving_skips_pandas()
+    test_startup_report()
+    print("All snapshot tests passed")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthetic data generator
+Checks reproducibility, the generated distributions and the on-disk stores
+"""
+
+import tempfile
+
+import pandas as pd
+
+from congress_buys_index import CongressBuysIndex
+from congress_equity_exposure_index import CongressEquityExposureIndex
+from price_providers import StaticPriceProvider
+from synthetic_data import (generate_holdings, generate_trades, iter_trades, synthetic_prices,
+                            write_holdings_store, write_trade_store)
+
+
+def test_trades_reproducible_and_realistic():
+    """Test seeding, row counts, duplicate ids, options and disclosure lags"""
+    trades = generate_trades(20000, seed=3)
+    assert trades.equals(generate_trades(20000, seed=3))
+    assert not trades.equals(generate_trades(20000, seed=4))
+    assert len(trades) == 20000
+    assert sum(len(month) for month in iter_trades(20000, seed=3)) == 20000
+
+    duplicated = trades["transaction_id"].duplicated().mean()
+    assert 0.01 < duplicated < 0.03
+    assert set(trades["chamber"].unique()) == {"House", "Senate"}
+    assert 0 < (trades["asset_type"] == "Stock Option").mean() < 0.1
+
+    lag = (trades["disclosure_date"] - trades["date"]).dt.days
+    assert lag.min() >= 1 and lag.quantile(0.9) <= 45 and lag.max() > 45
+
+    # Heavy-tailed ticker popularity
+    counts = trades["ticker"].value_counts()
+    assert counts.iloc[0] > 20 * counts.median()
+    print(f"✓ {len(trades)} reproducible trades ({duplicated:.1%} repeated ids, median lag {lag.median():.0f} days)")
+
+
+def test_pipelines_consume_generated_data():
+    """Test both index pipelines end to end on generated trades and holdings"""
+    index = CongressBuysIndex()
+    buys = index.prepare_buy_trades(generate_trades(20000, seed=5))
+    assert buys["dollar_amount"].notna().all()
+    assert buys["transaction_id"].is_unique
+    result = index.calculate_weights(index.aggregate_top_n(buys))
+    assert len(result) == 10 and abs(result["weight"].sum() - 100.0) <= 0.1
+
+    exposure = CongressEquityExposureIndex()
+    exposure.set_price_provider(StaticPriceProvider(synthetic_prices()))
+    holdings = generate_holdings(5000, seed=5)
+    assert (holdings["options_contracts"] > 0).any() and (holdings["options_delta"] < 0).any()
+    df = exposure.select_top_10(exposure.aggregate_by_ticker(exposure.calculate_net_holdings(holdings)))
+    df = exposure.calculate_weights(df)
+    assert len(df) == 10 and abs(df["weight"].sum() - 100.0) <= 0.1
+    print("✓ Both index pipelines ran on generated trades and holdings")
+
+
+def test_written_stores():
+    """Test that the written trade store holds current and superseded versions"""
+    trades = generate_trades(30000, seed=6)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = write_trade_store(f"{tmp_dir}/trades", 30000, seed=6)
+        current = store.load()
+        all_versions = store.load(all_versions=True)
+        assert len(current) == trades["transaction_id"].nunique()
+        assert len(all_versions) > len(current)
+        assert store.get_watermark()["latest_date"] is not None
+
+        # Point-in-time reads only see trades disclosed by then
+        as_of = pd.Timestamp("2022-06-30")
+        known = store.load(as_of=as_of)
+        assert 0 < len(known) < len(current)
+        assert (known["date"] < as_of).all()
+
+        # Rewriting the store refreshes the id index merge locates trades by, so
+        # amending a rewritten trade still supersedes its stored version
+        def amend_first_trade(store):
+            amended = store.load().head(1).assign(amount="$1,000,001-$5,000,000")
+            store.merge(amended, ingest_date=pd.Timestamp("2025-01-15"))
+            assert store.load()["transaction_id"].value_counts().max() == 1
+
+        amend_first_trade(store)
+        store = write_trade_store(f"{tmp_dir}/trades", 20000, seed=7)
+        stored = store.load(all_versions=True)
+        indexed = pd.read_parquet(store.id_index_file)
+        assert set(zip(indexed["transaction_id"], indexed["partition"])) == {
+            (str(transaction_id), f"month={date:%Y-%m}")
+            for transaction_id, date in zip(stored["transaction_id"], stored["date"])}
+        amend_first_trade(store)
+
+        holdings_store = write_holdings_store(f"{tmp_dir}/holdings", 1000, seed=6)
+        assert len(holdings_store.get_holdings("2024-12-31")) == 1000
+    print(f"✓ Trade store written with {len(all_versions) - len(current)} superseded versions")
+
+
+if __name__ == "__main__":
+    test_trades_reproducible_and_realistic()
+    test_pipelines_consume_generated_data()
+    test_written_stores()
+    print("All synthetic data tests passed")
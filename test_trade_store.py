@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Test script for the local trade store
+Verifies that repeated syncs only fetch the delta past the high-water mark
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+
+import os
+
+import pandas as pd
+
+import config
+from congress_buys_index import CongressBuysIndex
+from fixtures import FakeUpstream, make_trade
+from trade_store import HoldingsStore, TradeStore
+
+
+def test_incremental_sync():
+    """Test that the second sync only requests trades past the high-water mark"""
+    upstream = FakeUpstream([
+        make_trade("1", "2024-01-05"),
+        make_trade("2", "2024-02-10"),
+        make_trade("3", "2024-03-01"),
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TradeStore(tmp_dir)
+        start = datetime(2024, 1, 1)
+
+        assert store.sync(upstream.fetch_range, start, datetime(2024, 3, 1)) == 3
+        assert store.get_watermark()["latest_transaction_ids"] == ["3"]
+
+        # New disclosures land: a second trade on the high-water mark date, a
+        # newer trade, and a late filing for a trade made before the mark
+        upstream.trades = pd.DataFrame(upstream.trades.to_dict("records") + [
+            make_trade("4", "2024-03-01"),
+            make_trade("5", "2024-03-20"),
+            make_trade("6", "2024-02-20"),
+        ])
+
+        reopened = TradeStore(tmp_dir)
+        assert reopened.sync(upstream.fetch_range, start, datetime(2024, 3, 31)) == 2
+        delta_start, _ = upstream.requests[-1]
+        assert delta_start == datetime(2024, 3, 1) - timedelta(days=config.SYNC_OVERLAP_DAYS)
+
+        # The late filing arrives with the next late-filing sweep, which reaches back further
+        original = config.LATE_FILING_SWEEP_HOURS
+        try:
+            config.LATE_FILING_SWEEP_HOURS = 0
+            assert reopened.sync(upstream.fetch_range, start, datetime(2024, 3, 31)) == 1
+        finally:
+            config.LATE_FILING_SWEEP_HOURS = original
+        sweep_start, _ = upstream.requests[-1]
+        assert sweep_start == datetime(2024, 3, 20) - timedelta(days=config.LATE_FILING_SWEEP_DAYS)
+        assert len(upstream.requests) == 3
+        assert reopened.get_watermark()["last_sweep"] is not None
+
+        window = reopened.get_trades(datetime(2024, 2, 1), datetime(2024, 3, 31))
+        assert sorted(window["transaction_id"]) == ["2", "3", "4", "5", "6"]
+        print(f"✓ Delta sync fetched only {delta_start.date()} onwards, the sweep {sweep_start.date()} onwards")
+
+
+def test_window_extended_backwards():
+    """Test that widening the window fetches only the uncovered prefix"""
+    upstream = FakeUpstream([make_trade("1", "2024-01-05"), make_trade("2", "2024-03-01")])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TradeStore(tmp_dir)
+        end = datetime(2024, 3, 1)
+        store.sync(upstream.fetch_range, end - timedelta(days=30), end)
+        store.sync(upstream.fetch_range, end - timedelta(days=90), end)
+
+        assert upstream.requests[1] == (end - timedelta(days=90), end - timedelta(days=30))
+        assert len(store.load()) == 2
+        print("✓ Widened window fetched only the missing prefix")
+
+
+def test_partitioned_reads():
+    """Test month partitioning, typed columns and amended trades moving partitions"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TradeStore(tmp_dir)
+        store.merge(pd.DataFrame([
+            make_trade("1", "2024-01-05"),
+            make_trade("2", "2024-02-10"),
+            make_trade("3", "2024-03-01"),
+        ]))
+        assert store.partitions() == ["month=2024-01", "month=2024-02", "month=2024-03"]
+
+        # An amended disclosure moves trade 1 into February; January keeps only the superseded version
+        assert store.merge(pd.DataFrame([make_trade("1", "2024-02-20")])) == 0
+        assert store.get_trades(datetime(2024, 1, 1), datetime(2024, 1, 31)).empty
+        assert sorted(store.load()["transaction_id"]) == ["1", "2", "3"]
+
+        window = store.get_trades(datetime(2024, 2, 15), datetime(2024, 2, 29), columns=["ticker", "dollar_amount"])
+        assert "transaction_id" not in window.columns
+        assert len(window) == 1
+        assert str(window["ticker"].dtype) == "category"
+        assert str(window["dollar_amount"].dtype) == "float64"
+        assert str(window["date"].dtype).startswith("datetime64")
+        print(f"✓ Partitions {store.partitions()} with typed, projected reads")
+
+
+def test_point_in_time_reads():
+    """Test that as_of reads only see what had been disclosed by then"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = TradeStore(tmp_dir)
+        store.merge(pd.DataFrame([
+            {**make_trade("1", "2024-01-05"), "disclosure_date": "2024-02-01"},
+            {**make_trade("2", "2024-01-10"), "disclosure_date": "2024-01-20"},
+        ]))
+        # Trade 2 is amended on March 1st; re-sending trade 1 unchanged adds no version
+        store.merge(pd.DataFrame([make_trade("1", "2024-01-05")]), ingest_date=datetime(2024, 3, 1))
+        store.merge(pd.DataFrame([{**make_trade("2", "2024-01-10"), "amount": "$15,001-$50,000"}]),
+                    ingest_date=datetime(2024, 3, 1))
+        assert len(store.load(all_versions=True)) == 3
+
+        def known(as_of):
+            trades = store.get_trades(datetime(2024, 1, 1), datetime(2024, 1, 31), as_of=as_of)
+            return dict(zip(trades["transaction_id"], trades["amount"].astype(str)))
+
+        assert known(datetime(2024, 1, 15)) == {}
+        assert known(datetime(2024, 1, 25)) == {"2": "$1,001-$15,000"}
+        assert known(datetime(2024, 2, 15)) == {"1": "$1,001-$15,000", "2": "$1,001-$15,000"}
+        assert known(None) == {"1": "$1,001-$15,000", "2": "$15,001-$50,000"}
+
+        # An amendment repeating its old disclosure date is still only known from its ingest date,
+        # and so is a trade without a disclosure date first seen after the initial backfill
+        store.merge(pd.DataFrame([
+            {**make_trade("1", "2024-01-05"), "amount": "$15,001-$50,000", "disclosure_date": "2024-02-01"},
+        ]), ingest_date=datetime(2024, 3, 10))
+        store.merge(pd.DataFrame([make_trade("3", "2024-01-12")]), ingest_date=datetime(2024, 3, 10))
+        assert known(datetime(2024, 3, 5)) == {"1": "$1,001-$15,000", "2": "$15,001-$50,000"}
+        assert known(datetime(2024, 3, 10)) == {"1": "$15,001-$50,000", "2": "$15,001-$50,000",
+                                                "3": "$1,001-$15,000"}
+
+        # An amendment that moves the trade into another month still closes the old version
+        store.merge(pd.DataFrame([{**make_trade("2", "2024-02-10"), "amount": "$50,001-$100,000"}]),
+                    ingest_date=datetime(2024, 4, 1))
+        assert known(None) == {"1": "$15,001-$50,000", "3": "$1,001-$15,000"}
+        assert store.get_trades(datetime(2024, 2, 1), datetime(2024, 2, 29))["transaction_id"].tolist() == ["2"]
+        assert sorted(pd.read_parquet(store.id_index_file)["partition"]) == ["month=2024-01", "month=2024-01",
+                                                                               "month=2024-01", "month=2024-02"]
+        print("✓ Point-in-time reads follow disclosure dates and amendments")
+
+
+def test_delta_sync_known_from_ingest():
+    """Test that only the initial backfill dates undisclosed trades by their trade date"""
+    today = pd.Timestamp.now().normalize()
+    day = lambda days_ago: (today - pd.Timedelta(days=days_ago)).strftime("%Y-%m-%d")
+    late_trade = {**make_trade("late", day(2)), "ticker": "AAPL", "company": "Apple Inc."}
+    start, end = (today - pd.Timedelta(days=30)).to_pydatetime(), datetime.now()
+
+    def visible_ids(store, as_of):
+        return set(store.get_trades(start, end, as_of=as_of)["transaction_id"])
+
+    with tempfile.TemporaryDirectory() as backfilled_dir, tempfile.TemporaryDirectory() as synced_dir:
+        # Backfilled with the rest of the history: known from its trade date
+        backfilled = TradeStore(backfilled_dir)
+        backfilled.sync(FakeUpstream([make_trade("1", day(10)), make_trade("2", day(2)), late_trade]).fetch_range,
+                        start, end)
+        assert "late" in visible_ids(backfilled, today - pd.Timedelta(days=1))
+
+        # The same trade first arriving in a delta sync: known from its ingest date
+        upstream = FakeUpstream([make_trade("1", day(10)), make_trade("2", day(2))])
+        synced = TradeStore(synced_dir)
+        synced.sync(upstream.fetch_range, start, end)
+        upstream.trades = pd.DataFrame([make_trade("1", day(10)), make_trade("2", day(2)), late_trade])
+        assert synced.sync(upstream.fetch_range, start, end) == 1
+        assert visible_ids(synced, today - pd.Timedelta(days=1)) == {"1", "2"}
+        assert "late" in visible_ids(synced, datetime.now())
+        print("✓ A trade first seen in a delta sync is known from its ingest date")
+
+
+def test_generate_index_from_store():
+    """Test the full pipeline reading its window from the store"""
+    today = pd.Timestamp.now().normalize()
+    upstream = FakeUpstream([
+        {**make_trade("1", (today - pd.Timedelta(days=5)).strftime("%Y-%m-%d")), "amount": "$15,001-$50,000"},
+        {**make_trade("2", (today - pd.Timedelta(days=3)).strftime("%Y-%m-%d")), "ticker": "AAPL",
+         "company": "Apple Inc."},
+        {**make_trade("3", (today - pd.Timedelta(days=2)).strftime("%Y-%m-%d")), "transaction_type": "sell"},
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = CongressBuysIndex()
+        index.set_api_key("test-key")
+        index.set_trade_store(TradeStore(tmp_dir))
+        index._fetch_trades_range = upstream.fetch_range
+
+        result_df = index.generate_index(days_back=30)
+        assert list(result_df["ticker"]) == ["NVDA", "AAPL"]
+        assert abs(result_df["weight"].sum() - 100.0) <= 0.1
+        print("✓ Index generated from the local store")
+
+
+def test_generate_index_as_of():
+    """Test that the pipeline only uses trades disclosed by the as_of date"""
+    upstream = FakeUpstream([
+        {**make_trade("1", "2024-01-05"), "disclosure_date": "2024-02-20"},
+        {**make_trade("2", "2024-01-10"), "ticker": "AAPL", "company": "Apple Inc.",
+         "disclosure_date": "2024-01-20"},
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = CongressBuysIndex()
+        index.set_api_key("test-key")
+        index.set_trade_store(TradeStore(tmp_dir))
+        index._fetch_trades_range = upstream.fetch_range
+
+        assert list(index.generate_index(days_back=60, as_of=datetime(2024, 2, 1))["ticker"]) == ["AAPL"]
+        assert len(index.generate_index(days_back=60, as_of=datetime(2024, 3, 1))) == 2
+        print("✓ Point-in-time index excludes trades disclosed after as_of")
+
+
+def test_holdings_store():
+    """Test quarter snapshots round-trip through the holdings store"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = HoldingsStore(tmp_dir)
+        holdings = pd.DataFrame([{"ticker": "NVDA", "company": "NVIDIA Corporation", "shares_held": 100,
+                                  "options_contracts": 0, "options_delta": 0, "chamber": "House"}])
+        store.save_quarter("2024-12-31", holdings)
+
+        assert store.has_quarter("2024-12-31")
+        assert os.path.isdir(os.path.join(tmp_dir, "quarter=2024Q4"))
+        assert store.get_holdings("2024-12-31", columns=["ticker", "shares_held"])["shares_held"].tolist() == [100.0]
+        print("✓ Holdings snapshot stored under quarter=2024Q4")
+
+
+def test_holdings_refresh_horizon():
+    """Test that a quarter fetched before late filings settled is refetched once it is stale"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = HoldingsStore(tmp_dir)
+        store.save_quarter("2024-12-31", pd.DataFrame([{"ticker": "NVDA", "shares_held": 100}]))
+        file_path = os.path.join(tmp_dir, "quarter=2024Q4", "part-0.parquet")
+
+        def fetched_on(date):
+            timestamp = pd.Timestamp(date).timestamp()
+            os.utime(file_path, (timestamp, timestamp))
+
+        fetched_on("2025-01-01")
+        assert store.is_current("2024-12-31", now=datetime(2025, 1, 1, 12))
+        assert not store.is_current("2024-12-31", now=datetime(2025, 3, 1))
+        fetched_on("2025-06-01")
+        assert store.is_current("2024-12-31", now=datetime(2026, 1, 1))
+        assert not store.is_current("2024-09-30")
+        print("✓ Early quarter snapshots refetched, settled ones kept")
+
+
+if __name__ == "__main__":
+    test_incremental_sync()
+    test_window_extended_backwards()
+    test_partitioned_reads()
+    test_point_in_time_reads()
+    test_delta_sync_known_from_ingest()
+    test_generate_index_from_store()
+    test_generate_index_as_of()
+    test_holdings_store()
+    test_holdings_refresh_horizon()
+    print("All trade store tests passed")
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Local Trade and Holdings Stores
+Persist normalized congressional trades and holdings between runs as
+date-partitioned Parquet files. The trade store also keeps a high-water mark,
+so each refresh only has to fetch newly disclosed trades.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+import config
+from amount_ranges import amount_midpoints
+
+logger = logging.getLogger("congress_indexes.trade_store")
+
+# Candidate date columns, in order of preference, across upstream sources
+DATE_COLUMNS = ["date", "transaction_date", "disclosure_date"]
+
+# Upstream columns saying when a trade was made public, in order of preference.
+# Trades without one count as known from their trade date; new versions of a
+# stored trade are known no earlier than the day they were ingested.
+DISCLOSURE_COLUMNS = ["disclosure_date", "report_date"]
+
+# Bitemporal bookkeeping: each stored version of a trade is visible to
+# knowledge dates in [known_date, superseded_date)
+KNOWN_COLUMN = "known_date"
+SUPERSEDED_COLUMN = "superseded_date"
+VERSION_COLUMNS = [KNOWN_COLUMN, SUPERSEDED_COLUMN]
+
+# Columns compared to tell an amended disclosure from an unchanged re-fetch
+CONTENT_COLUMNS = ["ticker", "company", "representative", "transaction_type", "amount", "dollar_amount"]
+
+# Column dtypes for the normalized schemas; columns not listed are kept as-is
+TRADE_SCHEMA = {
+    "transaction_id": "string",
+    "ticker": "category",
+    "company": "category",
+    "representative": "category",
+    "chamber": "category",
+    "transaction_type": "category",
+    "amount": "category",
+    "dollar_amount": "float64",
+}
+
+HOLDINGS_SCHEMA = {
+    "ticker": "category",
+    "company": "category",
+    "representative": "category",
+    "chamber": "category",
+    "options_type": "category",
+    "shares_held": "float64",
+    "options_contracts": "float64",
+    "options_delta": "float64",
+}
+
+PARTITION_FILE = "part-0.parquet"
+
+# (transaction_id, partition) of every stored trade version, so a merge only opens the partitions it touches
+ID_INDEX_FILE = "transaction_ids.parquet"
+
+
+def get_date_column(df: pd.DataFrame) -> Optional[str]:
+    """Return the name of the trade date column used by this frame"""
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            return column
+    return None
+
+
+def enable_copy_on_write():
+    """
+    Turn on pandas copy-on-write for the whole process, so pipeline steps share
+    column buffers between intermediate frames instead of copying them. The
+    option is process-global, so call this once at startup before any worker
+    threads start, never per request. Always on (and a no-op) from pandas 3.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+def copy_on_write_enabled() -> bool:
+    """True when pandas copies shared column buffers on write"""
+    return int(pd.__version__.split(".")[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """Cast the columns present in df to the dtypes given by schema"""
+    dtypes = {column: dtype for column, dtype in schema.items()
+              if column in df.columns and str(df[column].dtype) != dtype}
+    return df.astype(dtypes) if dtypes else df
+
+
+def normalize_trades(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize upstream trades to the store schema: typed columns, a datetime64
+    trade date and a float64 dollar_amount derived from the reported range
+    """
+    updates = {}
+    date_column = get_date_column(df)
+    for column in [date_column] + VERSION_COLUMNS:
+        if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            updates[column] = pd.to_datetime(df[column])
+    if "dollar_amount" not in df.columns and "amount" in df.columns:
+        updates["dollar_amount"] = amount_midpoints(df["amount"])
+    elif "dollar_amount" in df.columns and not pd.api.types.is_numeric_dtype(df["dollar_amount"]):
+        updates["dollar_amount"] = amount_midpoints(df["dollar_amount"])
+    # assign never mutates the caller's frame; unchanged columns are not copied under copy-on-write
+    return apply_schema(df.assign(**updates), TRADE_SCHEMA)
+
+
+def stamp_known_dates(df: pd.DataFrame, ingest_date: datetime, existing_ids: set = None,
+                      backfill: bool = False) -> pd.DataFrame:
+    """
+    Record when each trade became knowable: its disclosure date when upstream
+    reports one, otherwise ingest_date. Only a backfill (history loaded before
+    the store started syncing) falls back to the trade date instead; a trade
+    first seen by a later sync may have been disclosed at any point since it
+    was made, so dating it earlier than its ingest would leak it into past
+    as_of reads. A new version of one of existing_ids (an amendment) was not
+    visible before ingest_date, whatever disclosure date it repeats, so it is
+    known from the later of the two.
+    """
+    df = df.copy()
+    known = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    for column in DISCLOSURE_COLUMNS + (DATE_COLUMNS if backfill else []):
+        if column in df.columns:
+            known = known.fillna(pd.to_datetime(df[column]).dt.normalize())
+    ingest_date = pd.Timestamp(ingest_date).normalize()
+    known = known.fillna(ingest_date)
+    if existing_ids:
+        amended = df["transaction_id"].isin(existing_ids)
+        known = known.mask(amended, known.clip(lower=ingest_date))
+    df[KNOWN_COLUMN] = known
+    df[SUPERSEDED_COLUMN] = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    return df
+
+
+def late_filing_sweep_due(last_sweep: Optional[datetime]) -> bool:
+    """
+    Whether a sync should reach back config.LATE_FILING_SWEEP_DAYS for late
+    filings (never swept, or not within config.LATE_FILING_SWEEP_HOURS)
+    rather than just config.SYNC_OVERLAP_DAYS
+    """
+    return last_sweep is None or datetime.now() - last_sweep >= timedelta(hours=config.LATE_FILING_SWEEP_HOURS)
+
+
+def visible_versions(df: pd.DataFrame, as_of: datetime = None) -> pd.DataFrame:
+    """
+    Keep the trade versions visible at knowledge date as_of, or the current
+    versions when as_of is None. Stores written before versioning have no
+    version columns and every row counts as known from its trade date.
+    """
+    if as_of is None:
+        if SUPERSEDED_COLUMN in df.columns:
+            df = df[df[SUPERSEDED_COLUMN].isna()]
+        return df
+
+    as_of = pd.Timestamp(as_of)
+    mask = pd.Series(True, index=df.index)
+    if KNOWN_COLUMN in df.columns:
+        mask &= df[KNOWN_COLUMN] <= as_of
+    else:
+        date_column = get_date_column(df)
+        if date_column is not None:
+            mask &= df[date_column] <= as_of
+    if SUPERSEDED_COLUMN in df.columns:
+        mask &= df[SUPERSEDED_COLUMN].isna() | (df[SUPERSEDED_COLUMN] > as_of)
+    return df[mask]
+
+
+def known_as_of(df: pd.DataFrame, as_of: datetime) -> pd.DataFrame:
+    """Drop freshly fetched trades whose reported disclosure date is after as_of"""
+    for column in DISCLOSURE_COLUMNS:
+        if column in df.columns:
+            return df[pd.to_datetime(df[column]).dt.normalize() <= pd.Timestamp(as_of)]
+    logger.warning("Upstream trades carry no disclosure date; as_of cannot be applied without a trade store")
+    return df
+
+
+def month_partition(date: pd.Timestamp) -> str:
+    """Partition name for the month containing date"""
+    return f"month={date.strftime('%Y-%m')}"
+
+
+def quarter_partition(quarter_end_date: str) -> str:
+    """Partition name for the quarter ending on quarter_end_date"""
+    period = pd.Timestamp(quarter_end_date).to_period("Q")
+    return f"quarter={period}"
+
+
+def parquet_columns(file_path: str) -> List[str]:
+    """Column names of a Parquet file, read from its footer without loading data"""
+    import pyarrow.parquet as pq
+    return pq.read_schema(file_path).names
+
+
+def _write_partition(directory: str, df: pd.DataFrame):
+    """Write one partition atomically so a crash never leaves a partial file"""
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, PARTITION_FILE)
+    tmp_file = f"{target}.tmp"
+    df.to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, target)
+
+
+def _with_version_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add version columns to rows stored before versioning (known from their trade date)"""
+    if df.empty:
+        return df
+    df = df.copy()
+    if KNOWN_COLUMN not in df.columns:
+        df[KNOWN_COLUMN] = pd.to_datetime(df[get_date_column(df)]).dt.normalize()
+    if SUPERSEDED_COLUMN not in df.columns:
+        df[SUPERSEDED_COLUMN] = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    return df
+
+
+def _unchanged_ids(current: pd.DataFrame, incoming: pd.DataFrame) -> set:
+    """transaction_ids whose incoming copy matches the stored current version"""
+    columns = [column for column in CONTENT_COLUMNS + DATE_COLUMNS
+               if column in current.columns and column in incoming.columns]
+    stored = current.drop_duplicates("transaction_id").set_index("transaction_id")[columns].astype(str)
+    fetched = incoming.set_index("transaction_id")[columns].astype(str).reindex(stored.index)
+    same = (stored == fetched).all(axis=1)
+    return set(same[same].index)
+
+
+class TradeStore:
+    """
+    Month-partitioned Parquet copy of upstream trades keyed by transaction_id
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.TRADE_STORE_DIR
+        self.state_file = os.path.join(self.path, "state.json")
+        self.id_index_file = os.path.join(self.path, ID_INDEX_FILE)
+
+    def get_watermark(self) -> Dict:
+        """
+        Return the persisted sync state: the window already synced, the latest
+        trade date ingested, the transaction_ids seen on that date and when
+        the last late-filing sweep ran
+        """
+        state = {
+            "synced_start": None,
+            "synced_end": None,
+            "latest_date": None,
+            "latest_transaction_ids": [],
+            "last_sync": None,
+            "last_sweep": None,
+        }
+        if os.path.exists(self.state_file):
+            # States written before late-filing sweeps have no last_sweep
+            with open(self.state_file) as f:
+                state.update(json.load(f))
+        return state
+
+    def partitions(self) -> List[str]:
+        """Return the stored month partitions in chronological order"""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path)
+                      if name.startswith("month=") and
+                      os.path.exists(os.path.join(self.path, name, PARTITION_FILE)))
+
+    def _partition_ids(self, partition: str, ids: pd.Series = None) -> pd.DataFrame:
+        """id index rows for one partition (its transaction_id column is read when ids is not given)"""
+        if ids is None:
+            ids = pd.read_parquet(os.path.join(self.path, partition, PARTITION_FILE),
+                                  columns=["transaction_id"])["transaction_id"]
+        return pd.DataFrame({"transaction_id": pd.unique(ids.astype(str)), "partition": partition})
+
+    def _id_index(self) -> pd.DataFrame:
+        """Where each transaction_id is stored; built with one full scan for stores that predate it"""
+        if os.path.exists(self.id_index_file):
+            return pd.read_parquet(self.id_index_file)
+        frames = [self._partition_ids(partition) for partition in self.partitions()]
+        id_index = (pd.concat(frames, ignore_index=True) if frames
+                    else pd.DataFrame({"transaction_id": pd.Series(dtype=str), "partition": pd.Series(dtype=str)}))
+        self._save_id_index(id_index)
+        return id_index
+
+    def _save_id_index(self, id_index: pd.DataFrame):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_file = f"{self.id_index_file}.tmp"
+        id_index.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, self.id_index_file)
+
+    def _read_partitions(self, partitions: List[str], columns: List[str] = None,
+                         filters: List[Tuple] = None, as_of: datetime = None,
+                         all_versions: bool = False, known_since: datetime = None) -> pd.DataFrame:
+        """
+        Read the given partitions with column projection and row-group filters,
+        keeping the trade versions visible at as_of (default: current versions)
+        unless all_versions is set, and only those known since known_since
+        when given
+        """
+        frames = []
+        for partition in partitions:
+            file_path = os.path.join(self.path, partition, PARTITION_FILE)
+            read_columns = columns
+            partition_filters = list(filters or [])
+            if columns is not None or as_of is not None or known_since is not None:
+                # Only project columns this partition actually has
+                available = set(parquet_columns(file_path))
+                if columns is not None:
+                    read_columns = [column for column in list(columns) + VERSION_COLUMNS if column in available]
+                if as_of is not None and not all_versions and KNOWN_COLUMN in available:
+                    # Versions disclosed after as_of are skipped by the reader
+                    partition_filters.append((KNOWN_COLUMN, "<=", pd.Timestamp(as_of)))
+                if known_since is not None and KNOWN_COLUMN in available:
+                    # Stores that predate versioning have no known dates, so every row is returned
+                    partition_filters.append((KNOWN_COLUMN, ">=", pd.Timestamp(known_since)))
+            partition_filters = partition_filters or None
+            frame = pd.read_parquet(file_path, columns=read_columns, filters=partition_filters)
+            if not all_versions:
+                frame = visible_versions(normalize_trades(frame), as_of)
+                if columns is not None:
+                    frame = frame.drop(columns=[c for c in VERSION_COLUMNS if c in frame and c not in columns])
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame()
+        return normalize_trades(pd.concat(frames, ignore_index=True))
+
+    def load(self, columns: List[str] = None, as_of: datetime = None,
+             all_versions: bool = False) -> pd.DataFrame:
+        """Load every stored trade (current versions, those visible at as_of, or all versions)"""
+        return self._read_partitions(self.partitions(), columns=columns, as_of=as_of, all_versions=all_versions)
+
+    def merge(self, df: pd.DataFrame, ingest_date: datetime = None, backfill: bool = None) -> int:
+        """
+        Merge newly fetched trades into the store. An amended disclosure does
+        not overwrite the stored trade: the old version is closed on the day
+        the amendment became known and kept for point-in-time reads, even when
+        the amended trade date moves it into another partition. Unchanged
+        re-fetches are ignored. backfill (default: the store is still empty)
+        lets trades without a disclosure date be known from their trade date,
+        see stamp_known_dates. Returns the number of previously unseen
+        transaction_ids.
+        """
+        if df.empty:
+            return 0
+        if backfill is None:
+            backfill = not self.partitions()
+
+        df = normalize_trades(df)
+        date_column = get_date_column(df)
+        df = df.drop_duplicates(subset=["transaction_id"], keep="last")
+        df["_partition"] = df[date_column].map(month_partition)
+
+        # Locate existing copies of the incoming ids through the id index (amended
+        # trades may sit in another month than their new trade date)
+        incoming_ids = set(df["transaction_id"])
+        id_index = self._id_index()
+        located = id_index.loc[id_index["transaction_id"].isin(incoming_ids), "partition"]
+        existing = {partition: self._read_partitions([partition], all_versions=True)
+                    for partition in sorted(set(located))}
+
+        current = [visible_versions(frame) for frame in existing.values()]
+        current = pd.concat(current, ignore_index=True) if current else pd.DataFrame(columns=["transaction_id"])
+        current = current[current["transaction_id"].isin(incoming_ids)]
+        seen_ids = set(current["transaction_id"])
+        df = stamp_known_dates(df, ingest_date or datetime.now(), existing_ids=seen_ids, backfill=backfill)
+
+        touched = set()
+        if seen_ids:
+            df = df[~df["transaction_id"].isin(_unchanged_ids(current, df))]
+            known_dates = df.set_index("transaction_id")[KNOWN_COLUMN]
+            for partition, frame in existing.items():
+                frame = _with_version_columns(frame)
+                replaced = frame["transaction_id"].isin(known_dates.index) & frame[SUPERSEDED_COLUMN].isna()
+                if replaced.any():
+                    frame.loc[replaced, SUPERSEDED_COLUMN] = frame.loc[replaced, "transaction_id"].map(known_dates)
+                    touched.add(partition)
+                existing[partition] = frame
+        touched.update(df["_partition"])
+
+        stored = set(self.partitions())
+        written = []
+        for partition in sorted(touched):
+            if partition in existing:
+                frame = existing[partition]
+            elif partition in stored:
+                frame = self._read_partitions([partition], all_versions=True)
+            else:
+                frame = pd.DataFrame()
+            incoming = df[df["_partition"] == partition].drop(columns=["_partition"])
+            merged = pd.concat([_with_version_columns(frame), incoming], ignore_index=True)
+
+            directory = os.path.join(self.path, partition)
+            if merged.empty:
+                shutil.rmtree(directory, ignore_errors=True)
+                continue
+            merged = normalize_trades(merged).sort_values(date_column, kind="stable")
+            _write_partition(directory, merged.reset_index(drop=True))
+            written.append(self._partition_ids(partition, merged["transaction_id"]))
+
+        id_index = id_index[~id_index["partition"].isin(touched)]
+        self._save_id_index(pd.concat([id_index] + written, ignore_index=True))
+        return len(incoming_ids - seen_ids)
+
+    def get_trades(self, start_date: datetime = None, end_date: datetime = None,
+                   columns: List[str] = None, as_of: datetime = None,
+                   tickers: List[str] = None, known_since: datetime = None) -> pd.DataFrame:
+        """
+        Return stored trades whose trade date falls within [start_date, end_date]
+        (and, when given, whose ticker is one of tickers), as they were known on
+        as_of when given. known_since keeps only versions that became known on
+        or after that date, however old their trade date. Only partitions
+        overlapping the window are opened, only the requested columns are read
+        and the date, ticker and known-date predicates are pushed down to the
+        reader.
+        """
+        partitions, columns, filters = self._plan_read(start_date, end_date, columns, tickers)
+        if not partitions:
+            return pd.DataFrame()
+        return self._read_partitions(partitions, columns=columns, filters=filters, as_of=as_of,
+                                     known_since=known_since)
+
+    def iter_trades(self, start_date: datetime = None, end_date: datetime = None,
+                    columns: List[str] = None, as_of: datetime = None,
+                    tickers: List[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        get_trades one month partition at a time (possibly empty frames), so
+        exports of the full history only ever hold one month in memory
+        """
+        partitions, columns, filters = self._plan_read(start_date, end_date, columns, tickers)
+        for partition in partitions:
+            yield self._read_partitions([partition], columns=columns, filters=filters, as_of=as_of)
+
+    def _plan_read(self, start_date: datetime, end_date: datetime, columns: List[str],
+                   tickers: List[str]) -> Tuple[List[str], Optional[List[str]], Optional[List[Tuple]]]:
+        """The partitions overlapping [start_date, end_date], the columns to read and the pushed-down filters"""
+        partitions = self.partitions()
+        if not partitions:
+            return [], columns, None
+
+        date_column = self._date_column(partitions[-1])
+        start = pd.Timestamp(start_date).normalize() if start_date is not None else None
+        end = pd.Timestamp(end_date) if end_date is not None else None
+
+        if start is not None:
+            partitions = [p for p in partitions if p >= month_partition(start)]
+        if end is not None:
+            partitions = [p for p in partitions if p <= month_partition(end)]
+
+        filters = []
+        if start is not None:
+            filters.append((date_column, ">=", start))
+        if end is not None:
+            filters.append((date_column, "<=", end))
+        if tickers:
+            filters.append(("ticker", "in", list(tickers)))
+
+        if columns is not None:
+            columns = list(dict.fromkeys(list(columns) + [date_column]))
+
+        return partitions, columns, filters or None
+
+    def _date_column(self, partition: str) -> str:
+        """Read the trade date column name from a partition's Parquet schema"""
+        schema_columns = parquet_columns(os.path.join(self.path, partition, PARTITION_FILE))
+        return get_date_column(pd.DataFrame(columns=schema_columns)) or DATE_COLUMNS[0]
+
+    def get_delta_ranges(self, start_date: datetime, end_date: datetime,
+                         sweep: bool = False) -> List[Tuple[datetime, datetime]]:
+        """
+        Work out which date ranges still have to be fetched to cover
+        [start_date, end_date] given what has already been synced. A
+        late-filing sweep reaches back further before the high-water mark.
+        """
+        state = self.get_watermark()
+        if not state["synced_start"]:
+            return [(start_date, end_date)]
+
+        synced_start = datetime.fromisoformat(state["synced_start"])
+        high_water_mark = datetime.fromisoformat(state["latest_date"] or state["synced_end"])
+        overlap = timedelta(days=config.LATE_FILING_SWEEP_DAYS if sweep else config.SYNC_OVERLAP_DAYS)
+
+        ranges = []
+        if start_date < synced_start:
+            ranges.append((start_date, synced_start))
+
+        # The high-water mark is a trade date, but trades are disclosed weeks
+        # after they are made. Regular syncs only re-fetch a short overlap; the
+        # disclosure lag is covered by the less frequent sweep. Trades already
+        # stored are filtered out by transaction_id on merge.
+        delta_start = max(start_date, high_water_mark - overlap)
+        if delta_start <= end_date:
+            ranges.append((delta_start, end_date))
+        return ranges
+
+    def sync(self, fetch_range: Callable[[datetime, datetime], pd.DataFrame],
+             start_date: datetime, end_date: datetime) -> int:
+        """
+        Fetch only the missing ranges via fetch_range(start, end), merge them
+        in and advance the high-water mark. Once every
+        config.LATE_FILING_SWEEP_HOURS the delta reaches back
+        config.LATE_FILING_SWEEP_DAYS for late filings. Returns the number of
+        new trades.
+        """
+        state = self.get_watermark()
+        synced_from = datetime.fromisoformat(state["synced_start"]) if state["synced_start"] else None
+        last_sweep = datetime.fromisoformat(state["last_sweep"]) if state["last_sweep"] else None
+        sweep = late_filing_sweep_due(last_sweep)
+        new_count = 0
+        for range_start, range_end in self.get_delta_ranges(start_date, end_date, sweep=sweep):
+            # The first sync and ranges older than anything synced load history (a backfill)
+            backfill = synced_from is None or range_end <= synced_from
+            new_count += self.merge(fetch_range(range_start, range_end), backfill=backfill)
+
+        synced_start, synced_end = start_date, end_date
+        if state["synced_start"]:
+            # Historical range queries must not shrink the synced window
+            synced_start = min(start_date, datetime.fromisoformat(state["synced_start"]))
+            synced_end = max(end_date, datetime.fromisoformat(state["synced_end"]))
+        self._save_state(synced_start, synced_end, datetime.now() if sweep else last_sweep)
+        return new_count
+
+    def _save_state(self, synced_start: datetime, synced_end: datetime, last_sweep: datetime = None):
+        """
+        Persist the sync window, the high-water mark derived from the newest
+        partition and the time of the last late-filing sweep
+        """
+        latest_date = None
+        latest_ids = []
+        for partition in reversed(self.partitions()):
+            # A partition may hold nothing but superseded versions
+            df = self._read_partitions([partition])
+            if df.empty:
+                continue
+            date_column = get_date_column(df)
+            latest = df[date_column].max()
+            latest_date = latest.isoformat()
+            latest_ids = sorted(df.loc[df[date_column] == latest, "transaction_id"].astype(str).tolist())
+            break
+
+        state = {
+            "synced_start": synced_start.isoformat(),
+            "synced_end": synced_end.isoformat(),
+            "latest_date": latest_date,
+            "latest_transaction_ids": latest_ids,
+            "last_sync": datetime.now().isoformat(),
+            "last_sweep": last_sweep.isoformat() if last_sweep else None,
+        }
+
+        os.makedirs(self.path, exist_ok=True)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+
+class HoldingsStore:
+    """
+    Quarter-partitioned Parquet snapshots of congressional holdings
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.HOLDINGS_STORE_DIR
+
+    def has_quarter(self, quarter_end_date: str) -> bool:
+        """Whether a snapshot for this quarter has been stored"""
+        return os.path.exists(os.path.join(self.path, quarter_partition(quarter_end_date), PARTITION_FILE))
+
+    def save_quarter(self, quarter_end_date: str, df: pd.DataFrame):
+        """Replace the stored snapshot for a quarter"""
+        df = apply_schema(df.copy(), HOLDINGS_SCHEMA)
+        _write_partition(os.path.join(self.path, quarter_partition(quarter_end_date)), df)
+
+    def fetched_at(self, quarter_end_date: str) -> Optional[datetime]:
+        """When the stored snapshot for this quarter was written, or None"""
+        file_path = os.path.join(self.path, quarter_partition(quarter_end_date), PARTITION_FILE)
+        if not os.path.exists(file_path):
+            return None
+        return datetime.fromtimestamp(os.path.getmtime(file_path))
+
+    def is_current(self, quarter_end_date: str, now: datetime = None) -> bool:
+        """
+        Whether the stored snapshot can be served as is: it was fetched after
+        late filings for the quarter had settled, or within the refresh horizon
+        """
+        fetched_at = self.fetched_at(quarter_end_date)
+        if fetched_at is None:
+            return False
+        now = now or datetime.now()
+        settled = pd.Timestamp(quarter_end_date) + pd.Timedelta(days=config.HOLDINGS_SETTLE_DAYS)
+        return fetched_at >= settled or now - fetched_at < timedelta(hours=config.HOLDINGS_REFRESH_HOURS)
+
+    def get_holdings(self, quarter_end_date: str, columns: List[str] = None,
+                     tickers: List[str] = None) -> pd.DataFrame:
+        """Read one quarter's snapshot, projecting only the requested columns (and tickers)"""
+        if not self.has_quarter(quarter_end_date):
+            return pd.DataFrame()
+        file_path = os.path.join(self.path, quarter_partition(quarter_end_date), PARTITION_FILE)
+        filters = [("ticker", "in", list(tickers))] if tickers else None
+        return apply_schema(pd.read_parquet(file_path, columns=columns, filters=filters), HOLDINGS_SCHEMA)
+
+    def quarters(self) -> List[str]:
+        """Quarter end dates (YYYY-MM-DD) of the stored snapshots, oldest first"""
+        if not os.path.isdir(self.path):
+            return []
+        return [pd.Period(name[len("quarter="):], freq="Q").end_time.strftime("%Y-%m-%d")
+                for name in sorted(os.listdir(self.path))
+                if name.startswith("quarter=") and os.path.exists(os.path.join(self.path, name, PARTITION_FILE))]
+
+    def iter_holdings(self, start_date: datetime = None, end_date: datetime = None,
+                      columns: List[str] = None, tickers: List[str] = None) -> Iterator[pd.DataFrame]:
+        """Stored snapshots of the quarters ending within [start_date, end_date], one quarter at a time"""
+        for quarter_end_date in self.quarters():
+            if start_date is not None and pd.Timestamp(quarter_end_date) < pd.Timestamp(start_date).normalize():
+                continue
+            if end_date is not None and pd.Timestamp(quarter_end_date) > pd.Timestamp(end_date):
+                continue
+            df = self.get_holdings(quarter_end_date, columns=columns, tickers=tickers)
+            if "quarter_end_date" not in df.columns and columns is None:
+                # Rows from several quarters must say which snapshot they came from
+                df.insert(0, "quarter_end_date", quarter_end_date)
+            yield df